@@ -12,7 +12,7 @@ from leopath.network_state.generate_network_state import generate_dynamic_state
 from leopath.network_state.gsl_attachment.gsl_attachment_strategies import *  # noqa: F403, F401
 from leopath.tles.generate_tles_from_scratch import generate_tles_from_scratch_with_sgp
 from leopath.tles.read_tles import read_tles
-from leopath.topology.distance_tools import geodetic2cartesian
+from leopath.topology.distance_tools import geodetic2cartesian_vec
 from leopath.topology.satellite.satellite import Satellite
 from leopath.topology.topology import ConstellationData, GroundStation
 
@@ -65,22 +65,25 @@ def setup_ground_stations(config):
     const_config = config["constellation"]
     gs_start_id = const_config["num_orbits"] * const_config["num_sats_per_orbit"]
 
-    ground_stations = []
-    for i, gs_data in enumerate(gs_config):
-        lat, lon, elv = gs_data["latitude"], gs_data["longitude"], gs_data["elevation_m"]
-        x, y, z = geodetic2cartesian(lat, lon, elv)
-        ground_stations.append(
-            GroundStation(
-                gid=gs_start_id + i,
-                name=gs_data["name"],
-                latitude_degrees_str=str(lat),
-                longitude_degrees_str=str(lon),
-                elevation_m_float=elv,
-                cartesian_x=x,
-                cartesian_y=y,
-                cartesian_z=z,
-            )
+    # All ground stations are converted to Cartesian in a single vectorized call
+    xs, ys, zs = geodetic2cartesian_vec(
+        [gs_data["latitude"] for gs_data in gs_config],
+        [gs_data["longitude"] for gs_data in gs_config],
+        [gs_data["elevation_m"] for gs_data in gs_config],
+    )
+    ground_stations = [
+        GroundStation(
+            gid=gs_start_id + i,
+            name=gs_data["name"],
+            latitude_degrees_str=str(gs_data["latitude"]),
+            longitude_degrees_str=str(gs_data["longitude"]),
+            elevation_m_float=gs_data["elevation_m"],
+            cartesian_x=float(x),
+            cartesian_y=float(y),
+            cartesian_z=float(z),
         )
+        for i, (gs_data, x, y, z) in enumerate(zip(gs_config, xs, ys, zs))
+    ]
     log.info(f"Created {len(ground_stations)} GroundStation objects.")
     return ground_stations
 
@@ -3,17 +3,21 @@
 
 import math
 
+import numpy as np
 from astropy import units as astro_units
-from astropy.time import Time
+from astropy.time import Time, TimeDelta
 from tqdm import tqdm  # Add this import
 
 from leopath import logger
+from leopath.topology import distance_tools
+from leopath.topology.satellite import propagation
 from leopath.topology.topology import ConstellationData, GroundStation
 
 # Import GSL attachment strategies to ensure they are registered
 from .gsl_attachment.gsl_attachment_strategies import *  # noqa: F403, F401
 from .helpers import _build_topologies, _compute_ground_station_satellites_in_range, _compute_isls
 from .routing_algorithms.routing_algorithm_factory import get_routing_algorithm
+from .routing_algorithms.shortest_path_link_state_routing.forwarding_state import ForwardingState
 from .utils import graph as graph_utils
 
 log = logger.get_logger(__name__)
@@ -58,6 +62,18 @@ def generate_dynamic_state(
     prev_topology = None
 
     time_steps = range(offset_ns, simulation_end_time_ns, time_step_ns)
+    satellite_positions_m = _propagate_satellites(epoch, time_steps, constellation_data)
+    # Materialize all step instants in one vectorized Time instead of epoch + ns at every step
+    times_absolute = epoch + TimeDelta(np.asarray(time_steps, dtype=float) * astro_units.ns)
+    # The same instants as (jd, fr) floats, converted from the epoch once
+    steps_jd, steps_fr = propagation.julian_dates_since_epoch(epoch, time_steps)
+    isl_csr = graph_utils.build_isl_csr(undirected_isls) if undirected_isls else None
+    # Ground stations do not move in the Earth-fixed frame: lay out their positions once
+    ground_stations_xyz = (
+        distance_tools.ground_stations_ecef_m(ground_stations)
+        if satellite_positions_m is not None
+        else None
+    )
     pbar = tqdm(total=total_iterations, desc="Dynamic State Progress")  # Create tqdm progress bar
 
     for i, time_since_epoch_ns in enumerate(time_steps):
@@ -75,6 +91,13 @@ def generate_dynamic_state(
                 dynamic_state_algorithm=dynamic_state_algorithm,
                 prev_output=prev_output,
                 prev_topology=prev_topology,
+                time_absolute=times_absolute[i],
+                satellite_positions_m=(
+                    satellite_positions_m[:, i, :] if satellite_positions_m is not None else None
+                ),
+                isl_csr=isl_csr,
+                ground_stations_xyz=ground_stations_xyz,
+                time_jd_fr=(float(steps_jd[i]), float(steps_fr[i])),
             )
             if current_output is not None:
                 current_output["time_since_epoch_ns"] = time_since_epoch_ns
@@ -119,6 +142,23 @@ def _compute_iterations_and_progress(simulation_end_time_ns, time_step_ns, offse
     return total_iterations, progress_interval
 
 
+def _propagate_satellites(epoch, time_since_epoch_ns_batch, constellation_data):
+    """
+    Batch-propagates every satellite over all time steps in a single SGP4 call.
+
+    :param epoch: Astropy Time object representing the simulation epoch.
+    :param time_since_epoch_ns_batch: Iterable of time offsets in nanoseconds since epoch.
+    :param constellation_data: ConstellationData object.
+    :return: TEME positions of shape (N_sat, N_time, 3) in meters, rows in constellation order,
+             or None if any satellite is not backed by an SGP4 propagator.
+    """
+    satrecs = [sat.position.satrec for sat in constellation_data.satellites]
+    if not satrecs or any(satrec is None for satrec in satrecs):
+        return None
+    jd, fr = propagation.julian_dates_since_epoch(epoch, time_since_epoch_ns_batch)
+    return propagation.teme_positions_m(satrecs, jd, fr)
+
+
 def _log_progress(i, progress_interval, time_since_epoch_ns, total_iterations, pbar=None):
     if i % progress_interval == 0:
         if pbar is not None:
@@ -139,20 +179,48 @@ def _generate_state_for_step(
     dynamic_state_algorithm,
     prev_output,
     prev_topology,
+    time_absolute=None,
+    satellite_positions_m=None,
+    query_pairs=None,
+    isl_csr=None,
+    ground_stations_xyz=None,
+    time_jd_fr=None,
 ):
     """
     Handles state generation for a single time step.
     Returns (state_dict, topology) or (None, None) on error.
+
+    time_absolute optionally holds the already materialized Time of this step
+    (epoch + time_since_epoch_ns); it is computed from the epoch when omitted.
+    satellite_positions_m optionally holds the TEME positions (N_sat, 3) of this step, as
+    sliced from the output of _propagate_satellites, to skip per-link propagation.
+    query_pairs optionally restricts the fstate to the given (src, dst) pairs, which are
+    resolved with single-pair searches; the previous state is then never reused.
+    isl_csr optionally holds the ISLs as the (indptr, indices, isl_entries) adjacency built once by
+    graph_utils.build_isl_csr, which is then scanned instead of undirected_isls.
+    ground_stations_xyz optionally holds the Earth-fixed ground station positions (N_gs, 3)
+    used together with satellite_positions_m by the vectorized visibility check.
+    time_jd_fr optionally holds the (jd, fr) pair of this step, as computed once for all steps by
+    propagation.julian_dates_since_epoch, so the frame rotation does not read it from a Time.
     """
     log.info(f"Generating dynamic state at t={time_since_epoch_ns} ns...")
     try:
-        time_absolute = epoch + time_since_epoch_ns * astro_units.ns
+        if time_absolute is None:
+            time_absolute = epoch + time_since_epoch_ns * astro_units.ns
         current_topology = _build_and_prepare_topology(
             constellation_data, ground_stations, list_gsl_interfaces_info
         )
-        _compute_isls(current_topology, undirected_isls, time_absolute)
+        current_topology.time_since_epoch_ns = time_since_epoch_ns
+        _compute_isls(
+            current_topology, undirected_isls, time_absolute, satellite_positions_m, isl_csr
+        )
         gs_sat_visibility_list = _compute_ground_station_satellites_in_range(
-            current_topology, time_absolute
+            current_topology,
+            time_absolute,
+            satellite_positions_m,
+            ground_stations_xyz,
+            prev_topology,
+            time_jd_fr,
         )
         _log_topology_stats(current_topology, gs_sat_visibility_list, time_since_epoch_ns)
     except Exception as e:
@@ -161,6 +229,20 @@ def _generate_state_for_step(
         )
         return None, None
 
+    if query_pairs is not None:
+        calculated_state = _calculate_state_for_pairs(
+            dynamic_state_algorithm,
+            time_since_epoch_ns,
+            constellation_data,
+            ground_stations,
+            current_topology,
+            list_gsl_interfaces_info,
+            query_pairs,
+            satellite_positions_m,
+        )
+        log.info(f"Pair query processing complete for t={time_since_epoch_ns} ns.")
+        return calculated_state, current_topology
+
     graphs_changed = not graph_utils._topologies_are_equal(prev_topology, current_topology)
     log.debug(
         f"  > Time {time_since_epoch_ns} ns: _topologies_are_equal returned: {not graphs_changed}. Graphs changed? {graphs_changed}"
@@ -184,10 +266,8 @@ def _generate_state_for_step(
 
 def _build_and_prepare_topology(constellation_data, ground_stations, list_gsl_interfaces_info):
     current_topology, _ = _build_topologies(constellation_data, ground_stations)
-    if (
-        not hasattr(current_topology, "gsl_interfaces_info")
-        or not current_topology.gsl_interfaces_info
-    ):
+    # len() rather than truthiness: the info may also be a GSL_INTERFACE_DTYPE array
+    if len(getattr(current_topology, "gsl_interfaces_info", ())) == 0:
         current_topology.gsl_interfaces_info = list_gsl_interfaces_info
     return current_topology
 
@@ -227,7 +307,7 @@ def _reuse_or_calculate_state(
             graphs_changed = True
     try:
         algorithm = get_routing_algorithm(dynamic_state_algorithm)
-        return algorithm.compute_state(
+        calculated_state = algorithm.compute_state(
             time_since_epoch_ns=time_since_epoch_ns,
             constellation_data=constellation_data,
             ground_stations=ground_stations,
@@ -235,6 +315,11 @@ def _reuse_or_calculate_state(
             ground_station_satellites_in_range=gs_sat_visibility_list,
             list_gsl_interfaces_info=list_gsl_interfaces_info,
         )
+        # Reused as-is (not copied) by later steps while the topology stays the same
+        fstate = calculated_state.get("fstate") if isinstance(calculated_state, dict) else None
+        if isinstance(fstate, ForwardingState):
+            fstate.freeze()
+        return calculated_state
     except ValueError:
         raise
     except Exception as e:
@@ -242,3 +327,29 @@ def _reuse_or_calculate_state(
             f"Algorithm '{dynamic_state_algorithm}' execution failed at t={time_since_epoch_ns} ns: {e}"
         )
         return None
+
+
+def _calculate_state_for_pairs(
+    dynamic_state_algorithm,
+    time_since_epoch_ns,
+    constellation_data,
+    ground_stations,
+    current_topology,
+    list_gsl_interfaces_info,
+    query_pairs,
+    satellite_positions_m,
+):
+    algorithm = get_routing_algorithm(dynamic_state_algorithm)
+    if not hasattr(algorithm, "compute_state_for_pairs"):
+        raise ValueError(
+            f"Routing algorithm '{dynamic_state_algorithm}' does not support query_pairs."
+        )
+    return algorithm.compute_state_for_pairs(
+        time_since_epoch_ns=time_since_epoch_ns,
+        constellation_data=constellation_data,
+        ground_stations=ground_stations,
+        topology_with_isls=current_topology,
+        list_gsl_interfaces_info=list_gsl_interfaces_info,
+        query_pairs=query_pairs,
+        satellite_positions_m=satellite_positions_m,
+    )
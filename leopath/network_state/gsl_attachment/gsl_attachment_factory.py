@@ -16,9 +16,14 @@ class GSLAttachmentFactory:
         """
         Register a new strategy class with the factory.
 
+        Registering an already registered class is a no-op, so modules that import a strategy
+        for its registration side effect do not instantiate it again.
+
         Args:
             strategy_class: The strategy class to register
         """
+        if strategy_class in cls._strategies.values():
+            return
         strategy_instance = strategy_class()
         cls._strategies[strategy_instance.name()] = strategy_class
         log.debug(f"Registered GSL attachment strategy: {strategy_instance.name()}")
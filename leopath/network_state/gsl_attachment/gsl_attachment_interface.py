@@ -1,14 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple
-
-from astropy.time import Time
+from typing import TYPE_CHECKING, List, Tuple
 
 from leopath.topology.topology import GroundStation, LEOTopology
 
+if TYPE_CHECKING:
+    from astropy.time import Time
+
 
 class GSLAttachmentStrategy(ABC):
     """Interface for ground station to satellite attachment strategies."""
 
+    # No instance dict of its own, so strategies declaring __slots__ stay dict-free
+    __slots__ = ()
+
     @abstractmethod
     def name(self) -> str:
         """Return the name of the strategy."""
@@ -16,7 +20,7 @@ class GSLAttachmentStrategy(ABC):
 
     @abstractmethod
     def select_attachments(
-        self, topology: LEOTopology, ground_stations: List[GroundStation], current_time: Time
+        self, topology: LEOTopology, ground_stations: List[GroundStation], current_time: "Time"
     ) -> List[Tuple[float, int]]:
         """
         Select a single attachment point for each ground station.
@@ -1,34 +1,70 @@
+import math
+
 import numpy as np
 from astropy.time import Time
 
 from leopath import logger
 from leopath.topology import distance_tools
+from leopath.topology.satellite import propagation
 from leopath.topology.topology import ConstellationData, GroundStation, LEOTopology
 
+from .utils import graph as graph_utils
+from .utils.gsl_interfaces import gsl_interfaces_array
+
 log = logger.get_logger(__name__)
 
+# Upper bound on how fast any GS<->satellite distance can change: Earth escape velocity at the
+# surface (~11.2 km/s) plus the ground station's own rotation speed (~0.47 km/s), rounded up.
+MAX_RELATIVE_SPEED_M_PER_S = 12000.0
+
 
 def _compute_isls(
     topology_with_isls: LEOTopology,
     undirected_isls: list,
     current_time_absolute: Time,
+    satellite_positions_m: np.ndarray | None = None,
+    isl_csr: tuple[np.ndarray, np.ndarray] | None = None,
 ):
     """
     Computes ISLs, adds them as edges to topology_with_isls.graph,
     updates sat_neighbor_to_if map and satellite ISL counts.
     Assumes topology_with_isls.get_satellite(id) works correctly.
+
+    If satellite_positions_m (shape (N_sat, 3), rows in constellation order) is given,
+    ISL lengths are taken from these pre-propagated positions instead of distance_tools.
+    If isl_csr (the (indptr, indices, isl_entries) adjacency from graph_utils.build_isl_csr) is given,
+    ISLs are read from it instead of from undirected_isls.
     """
     constellation_data = topology_with_isls.constellation_data
-    # Track number of ISLs per sat *during this function* to assign IF indices
-    # Initialize based on satellites actually present in constellation data
-    num_isls_per_sat_map = {sat.id: 0 for sat in topology_with_isls.get_satellites()}
     # Reset ISL count on topology object
     topology_with_isls.number_of_isls = 0
     # Clear previous interface mapping
     topology_with_isls.sat_neighbor_to_if = {}
+    sat_row = (
+        {sat.id: row for row, sat in enumerate(topology_with_isls.get_satellites())}
+        if satellite_positions_m is not None
+        else None
+    )
 
-    log.debug(f"Processing {len(undirected_isls)} potential ISLs...")
-    for satellite_id_a, satellite_id_b in undirected_isls:
+    if isl_csr is not None:
+        log.debug(f"Processing {len(isl_csr[1])} potential ISLs...")
+        isl_pairs = graph_utils.iter_isl_csr(isl_csr)
+    else:
+        log.debug(f"Processing {len(undirected_isls)} potential ISLs...")
+        isl_pairs = undirected_isls
+    added_isls = []
+    isl_lengths_m = None
+    if sat_row is not None and satellite_positions_m is not None:
+        # All ISL lengths in one vectorized pass over the propagated positions
+        isl_pairs = list(isl_pairs)
+        isl_lengths_m = _isl_lengths_m(
+            isl_pairs,
+            sat_row,
+            satellite_positions_m,
+            constellation_data.max_isl_length_sq_m2,
+            current_time_absolute,
+        )
+    for isl_idx, (satellite_id_a, satellite_id_b) in enumerate(isl_pairs):
         # Get satellite objects using the topology's getter
         try:
             sat_a = topology_with_isls.get_satellite(satellite_id_a)
@@ -41,12 +77,15 @@ def _compute_isls(
 
         # Calculate distance
         try:
-            sat_distance_m = distance_tools.distance_m_between_satellites(
-                sat_a,
-                sat_b,
-                str(constellation_data.epoch),
-                str(current_time_absolute),
-            )
+            if isl_lengths_m is not None:
+                sat_distance_m = isl_lengths_m[isl_idx]
+            else:
+                sat_distance_m = distance_tools.distance_m_between_satellites(
+                    sat_a,
+                    sat_b,
+                    str(constellation_data.epoch),
+                    str(current_time_absolute),
+                )
         except Exception as e:
             log.error(
                 f"ISL distance calculation failed for ({satellite_id_a}, {satellite_id_b}): {e}"
@@ -73,17 +112,20 @@ def _compute_isls(
             )
             continue
         topology_with_isls.graph.add_edge(satellite_id_a, satellite_id_b, weight=sat_distance_m)
-
-        # Interface mapping of ISLs (0-based index per satellite)
-        if_a = num_isls_per_sat_map[satellite_id_a]
-        if_b = num_isls_per_sat_map[satellite_id_b]
-        topology_with_isls.sat_neighbor_to_if[(satellite_id_a, satellite_id_b)] = if_a
-        topology_with_isls.sat_neighbor_to_if[(satellite_id_b, satellite_id_a)] = if_b
-        num_isls_per_sat_map[satellite_id_a] += 1
-        num_isls_per_sat_map[satellite_id_b] += 1
+        added_isls.append((satellite_id_a, satellite_id_b, sat_distance_m))
 
         topology_with_isls.number_of_isls += 1  # Count pairs
 
+    # Interface mapping of ISLs (0-based index per satellite), assigned in ISL order
+    added_pairs = [
+        (satellite_id_a, satellite_id_b) for satellite_id_a, satellite_id_b, _ in added_isls
+    ]
+    if_a, if_b, num_isls_per_sat_map = graph_utils.isl_interface_indices(added_pairs)
+    topology_with_isls.sat_neighbor_to_if = dict(zip(added_pairs, if_a.tolist()))
+    topology_with_isls.sat_neighbor_to_if.update(
+        zip(((b, a) for a, b in added_pairs), if_b.tolist())
+    )
+
     # Final update of number_isls on satellite objects stored within topology
     total_isl_endpoints = 0
     for sat in topology_with_isls.get_satellites():
@@ -103,6 +145,43 @@ def _compute_isls(
         log.debug("  > No ISLs computed or defined.")
 
 
+def _isl_lengths_m(
+    isl_pairs: list,
+    sat_row: dict,
+    satellite_positions_m: np.ndarray,
+    max_isl_length_sq_m2: float,
+    current_time_absolute: Time,
+) -> list:
+    """
+    Lengths of all ISLs from pre-propagated positions, computed with a single NumPy gather.
+    The maximum ISL length is checked on squared lengths against max_isl_length_sq_m2,
+    for all ISLs at once, before any square root is taken.
+    Pairs with an unknown satellite get a placeholder length; _compute_isls skips them anyway.
+
+    :raises ValueError: If an ISL between known satellites exceeds the maximum ISL length.
+    """
+    if not isl_pairs:
+        return []
+    rows = np.array(
+        [(sat_row.get(sat_a, -1), sat_row.get(sat_b, -1)) for sat_a, sat_b in isl_pairs],
+        dtype=np.intp,
+    )
+    known = (rows >= 0).all(axis=1)
+    differences_m = satellite_positions_m[rows[:, 0]] - satellite_positions_m[rows[:, 1]]
+    squared_lengths_m2 = np.einsum("ij,ij->i", differences_m, differences_m)
+    too_long = np.flatnonzero(known & (squared_lengths_m2 > max_isl_length_sq_m2))
+    if too_long.size:
+        satellite_id_a, satellite_id_b = isl_pairs[too_long[0]]
+        sat_distance_m = math.sqrt(squared_lengths_m2[too_long[0]])
+        raise ValueError(
+            f"The distance between satellites ({satellite_id_a} and {satellite_id_b}) "
+            f"with an ISL exceeded the maximum ISL length "
+            f"({sat_distance_m:.2f}m > {math.sqrt(max_isl_length_sq_m2):.2f}m "
+            f"at t={str(current_time_absolute)})"
+        )
+    return np.sqrt(squared_lengths_m2).tolist()
+
+
 def _build_topologies(orbital_data: ConstellationData, ground_stations: list[GroundStation]):
     """
     Builds LEOTopology instance(s). Adds nodes based on actual sat/gs IDs.
@@ -134,14 +213,8 @@ def _compute_gsl_interface_information(topology: LEOTopology):
     Logs summary information about GSL interfaces based on data stored in the topology object.
     Requires `topology.gsl_interfaces_info` to be populated correctly.
     """
-    if (
-        not hasattr(topology, "gsl_interfaces_info")
-        or not topology.gsl_interfaces_info
-        or not isinstance(topology.gsl_interfaces_info, list)
-    ):
-        log.warning(
-            "Cannot log GSL interface info; topology.gsl_interfaces_info not set or not a list."
-        )
+    if len(getattr(topology, "gsl_interfaces_info", ())) == 0:
+        log.warning("Cannot log GSL interface info; topology.gsl_interfaces_info not set.")
         return
 
     constellation_data = topology.constellation_data
@@ -156,25 +229,17 @@ def _compute_gsl_interface_information(topology: LEOTopology):
 
     log.debug("GSL INTERFACE INFORMATION (from topology.gsl_interfaces_info):")
     try:
-        actual_len = len(topology.gsl_interfaces_info)
-        sat_if_counts = [
-            info.get("number_of_interfaces", 0)
-            for info in topology.gsl_interfaces_info[: min(actual_len, num_sats)]
-            if isinstance(info, dict)
-        ]
-        gs_if_counts = [
-            info.get("number_of_interfaces", 0)
-            for info in topology.gsl_interfaces_info[num_sats:actual_len]
-            if isinstance(info, dict)
-        ]
-
-        if sat_if_counts:
+        if_counts = gsl_interfaces_array(topology.gsl_interfaces_info)["number_of_interfaces"]
+        sat_if_counts = if_counts[:num_sats]
+        gs_if_counts = if_counts[num_sats:]
+
+        if sat_if_counts.size:
             log.debug(f"  > Min. GSL IFs/satellite........ {np.min(sat_if_counts)}")
             log.debug(f"  > Max. GSL IFs/satellite........ {np.max(sat_if_counts)}")
         else:
             log.debug("  > No valid satellite GSL interface data found/processed.")
 
-        if gs_if_counts:
+        if gs_if_counts.size:
             log.debug(f"  > Min. GSL IFs/ground station... {np.min(gs_if_counts)}")
             log.debug(f"  > Max. GSL IFs/ground_station... {np.max(gs_if_counts)}")
         else:
@@ -185,13 +250,29 @@ def _compute_gsl_interface_information(topology: LEOTopology):
 
 
 def _compute_ground_station_satellites_in_range(
-    topology: LEOTopology, current_time: Time
+    topology: LEOTopology,
+    current_time: Time,
+    satellite_positions_m: np.ndarray | None = None,
+    ground_stations_xyz: np.ndarray | None = None,
+    prev_topology: LEOTopology | None = None,
+    time_jd_fr: tuple[float, float] | None = None,
 ) -> list:  # Returns visibility list
     """
     Computes GS<->Sat visibility based on distance at current_time.
     Adds GSL edges with weights to the topology.graph.
     Returns the visibility list: list[ list[(distance_m, sat_id)] ] indexed by GS index.
     Assumes topology.get_satellites() and topology.get_ground_stations() work.
+
+    If satellite_positions_m (TEME, shape (N_sat, 3), rows in constellation order) is given,
+    distances are computed from these pre-propagated positions instead of distance_tools.
+    ground_stations_xyz optionally holds the Earth-fixed positions (N_gs, 3) of the ground
+    stations, as built once by distance_tools.ground_stations_ecef_m, for that vectorized path,
+    and time_jd_fr the (jd, fr) pair of current_time, which is otherwise read from current_time.
+
+    Otherwise each pair is propagated through distance_tools. If prev_topology (the topology of
+    the previous step, with time_since_epoch_ns set on both topologies) is given, pairs that were
+    farther than max_gsl_length_m + MAX_RELATIVE_SPEED_M_PER_S * elapsed time cannot be in range
+    yet and are skipped; their distance lower bound is carried over in gsl_lengths_m.
     """
     log.debug("Calculating GSL in-range information...")
     ground_station_satellites_in_range = []  # List to be returned, index matches gs_list order
@@ -202,45 +283,66 @@ def _compute_ground_station_satellites_in_range(
         log.exception(f"Error retrieving satellites or ground stations from topology: {e}")
         return [[] for _ in range(topology.number_of_ground_stations)]  # Return empty structure
 
-    # Iterate by index to build the return list correctly
-    for gs_idx, ground_station in enumerate(gs_list):
-        satellites_in_range_for_this_gs = []
-        for satellite in satellites:
-            if not hasattr(satellite, "position") or not hasattr(satellite, "id"):
-                log.warning(f"Skipping visibility check for invalid satellite object: {satellite}")
-                continue
-
-            try:
-                time_str_for_ephem = str(current_time.strftime("%Y/%m/%d %H:%M:%S.%f")[:-3])
-                epoch_str_for_ephem = topology.constellation_data.epoch
-                distance_m = distance_tools.distance_m_ground_station_to_satellite(
-                    ground_station,  # Pass GroundStation object
-                    satellite,  # Pass Satellite object (NOT satellite.position)
-                    epoch_str_for_ephem,  # Pass epoch string
-                    time_str_for_ephem,  # Pass formatted time string
-                )
-            except Exception as e:
-                # Log specific error, include IDs for easier debugging
-                log.error(
-                    f"GSL distance calculation failed for GS {getattr(ground_station, 'id', 'N/A')} "
-                    f"<-> Sat {getattr(satellite, 'id', 'N/A')}: {e}"
-                )
-                distance_m = float("inf")  # Treat as out of range on error
-
-            # Check against max length from constellation_data
-            if distance_m <= topology.constellation_data.max_gsl_length_m:
-                satellites_in_range_for_this_gs.append((distance_m, satellite.id))
-                # Add edge to the graph IN THE PASSED TOPOLOGY OBJECT
-                if topology.graph.has_node(satellite.id) and topology.graph.has_node(
-                    ground_station.id
-                ):
-                    topology.graph.add_edge(satellite.id, ground_station.id, weight=distance_m)
-                else:
+    if satellite_positions_m is not None:
+        ground_station_satellites_in_range = _ground_station_satellites_in_range_from_positions(
+            topology,
+            satellites,
+            gs_list,
+            current_time,
+            satellite_positions_m,
+            ground_stations_xyz,
+            time_jd_fr,
+        )
+    else:
+        max_gsl_length_m = topology.constellation_data.max_gsl_length_m
+        motion_bound_m = _gsl_motion_bound_m(topology, prev_topology)
+        gsl_lengths_m = {}
+        for ground_station in gs_list:
+            satellites_in_range_for_this_gs = []
+            for satellite in satellites:
+                if not hasattr(satellite, "position") or not hasattr(satellite, "id"):
                     log.warning(
-                        f"Cannot add GSL edge ({satellite.id}, {ground_station.id}): Node(s) missing from graph."
+                        f"Skipping visibility check for invalid satellite object: {satellite}"
                     )
+                    continue
 
-        ground_station_satellites_in_range.append(satellites_in_range_for_this_gs)
+                pair_key = (ground_station.id, satellite.id)
+                if motion_bound_m is not None and prev_topology is not None:
+                    prev_distance_m = prev_topology.gsl_lengths_m.get(pair_key)
+                    if (
+                        prev_distance_m is not None
+                        and prev_distance_m - motion_bound_m > max_gsl_length_m
+                    ):
+                        # Still out of range: keep the conservative lower bound for next step
+                        gsl_lengths_m[pair_key] = prev_distance_m - motion_bound_m
+                        continue
+
+                try:
+                    time_str_for_ephem = str(current_time.strftime("%Y/%m/%d %H:%M:%S.%f")[:-3])
+                    epoch_str_for_ephem = topology.constellation_data.epoch
+                    distance_m = distance_tools.distance_m_ground_station_to_satellite(
+                        ground_station,  # Pass GroundStation object
+                        satellite,  # Pass Satellite object (NOT satellite.position)
+                        epoch_str_for_ephem,  # Pass epoch string
+                        time_str_for_ephem,  # Pass formatted time string
+                    )
+                except Exception as e:
+                    # Log specific error, include IDs for easier debugging
+                    log.error(
+                        f"GSL distance calculation failed for GS {getattr(ground_station, 'id', 'N/A')} "
+                        f"<-> Sat {getattr(satellite, 'id', 'N/A')}: {e}"
+                    )
+                    distance_m = float("inf")  # Treat as out of range on error
+
+                if not math.isinf(distance_m):
+                    gsl_lengths_m[pair_key] = distance_m
+                # Check against max length from constellation_data
+                if distance_m <= max_gsl_length_m:
+                    satellites_in_range_for_this_gs.append((distance_m, satellite.id))
+                    _add_gsl_edge(topology, satellite.id, ground_station.id, distance_m)
+
+            ground_station_satellites_in_range.append(satellites_in_range_for_this_gs)
+        topology.gsl_lengths_m = gsl_lengths_m
 
     # Log summary info
     if ground_station_satellites_in_range:
@@ -259,3 +361,67 @@ def _compute_ground_station_satellites_in_range(
     else:
         log.debug("  > No ground stations processed for visibility.")
     return ground_station_satellites_in_range
+
+
+def _gsl_motion_bound_m(topology: LEOTopology, prev_topology: LEOTopology | None) -> float | None:
+    """
+    Maximum change of any GS<->satellite distance since the previous step, or None when the
+    previous step's GSL lengths cannot be reused.
+    """
+    if prev_topology is None or not getattr(prev_topology, "gsl_lengths_m", None):
+        return None
+    time_since_epoch_ns = getattr(topology, "time_since_epoch_ns", None)
+    prev_time_since_epoch_ns = getattr(prev_topology, "time_since_epoch_ns", None)
+    if time_since_epoch_ns is None or prev_time_since_epoch_ns is None:
+        return None
+    elapsed_s = abs(time_since_epoch_ns - prev_time_since_epoch_ns) / 1e9
+    return MAX_RELATIVE_SPEED_M_PER_S * elapsed_s
+
+
+def _ground_station_satellites_in_range_from_positions(
+    topology: LEOTopology,
+    satellites: list,
+    gs_list: list[GroundStation],
+    current_time: Time,
+    satellite_positions_m: np.ndarray,
+    ground_stations_xyz: np.ndarray | None = None,
+    time_jd_fr: tuple[float, float] | None = None,
+) -> list:
+    """
+    Vectorized visibility for pre-propagated satellites: all GS<->Sat squared distances are
+    computed at once and compared against max_gsl_length_sq_m2; the square root is only taken
+    for the pairs in range. Returns the same visibility list as
+    _compute_ground_station_satellites_in_range and adds the GSL edges to topology.graph.
+    """
+    jd, fr = propagation.julian_date(current_time) if time_jd_fr is None else time_jd_fr
+    satellites_ecef_m = propagation.teme_to_ecef_m(satellite_positions_m, jd, fr)
+    squared_distances_m2 = distance_tools.squared_distances_m2_ground_stations_to_positions(
+        [gs.latitude_degrees for gs in gs_list],
+        [gs.longitude_degrees for gs in gs_list],
+        [float(gs.elevation_m_float) for gs in gs_list],
+        satellites_ecef_m,
+        ground_stations_ecef_m=ground_stations_xyz,
+    )
+    in_range = squared_distances_m2 <= topology.constellation_data.max_gsl_length_sq_m2
+
+    ground_station_satellites_in_range = []
+    for gs_idx, ground_station in enumerate(gs_list):
+        sat_indices = np.flatnonzero(in_range[gs_idx])
+        distances_m = np.sqrt(squared_distances_m2[gs_idx, sat_indices]).tolist()
+        satellites_in_range_for_this_gs = []
+        for sat_idx, distance_m in zip(sat_indices.tolist(), distances_m):
+            satellite_id = satellites[sat_idx].id
+            satellites_in_range_for_this_gs.append((distance_m, satellite_id))
+            _add_gsl_edge(topology, satellite_id, ground_station.id, distance_m)
+        ground_station_satellites_in_range.append(satellites_in_range_for_this_gs)
+    return ground_station_satellites_in_range
+
+
+def _add_gsl_edge(topology: LEOTopology, satellite_id, ground_station_id, distance_m: float):
+    # Add edge to the graph IN THE PASSED TOPOLOGY OBJECT
+    if topology.graph.has_node(satellite_id) and topology.graph.has_node(ground_station_id):
+        topology.graph.add_edge(satellite_id, ground_station_id, weight=distance_m)
+    else:
+        log.warning(
+            f"Cannot add GSL edge ({satellite_id}, {ground_station_id}): Node(s) missing from graph."
+        )
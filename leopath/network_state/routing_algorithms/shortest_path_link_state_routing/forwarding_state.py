@@ -0,0 +1,100 @@
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Tuple
+
+import numpy as np
+
+NO_ROUTE = (-1, -1, -1)
+
+# Largest node ID that still lets the table be stored as int16
+INT16_MAX_NODE_ID = int(np.iinfo(np.int16).max)
+
+
+class ForwardingState(Mapping):
+    """
+    Forwarding state stored as a dense array of shape (N, N, 3), indexed by node position.
+    The array is int16 when every node ID fits (interface indices are always small), halving
+    its footprint, and int32 otherwise.
+
+    Each cell holds (next_hop_id, my_if, next_hop_if) for a (src, dst) pair; unset cells hold
+    (-1, -1, -1). The object behaves as a read-only mapping
+    {(src_id, dst_id): (next_hop_id, my_if, next_hop_if)} over the entries that were explicitly
+    written, so it can be used wherever the previous fstate dict was.
+    """
+
+    def __init__(self, node_ids: Iterable[int]):
+        """
+        :param node_ids: IDs of every node (satellites and ground stations) that may appear
+                         as source or destination. Their order defines the array layout.
+        """
+        self.node_ids = [int(node_id) for node_id in node_ids]
+        self.node_to_index = {node_id: idx for idx, node_id in enumerate(self.node_ids)}
+        num_nodes = len(self.node_ids)
+        fits_int16 = all(0 <= node_id <= INT16_MAX_NODE_ID for node_id in self.node_ids)
+        self.table = np.full(
+            (num_nodes, num_nodes, 3), -1, dtype=np.int16 if fits_int16 else np.int32
+        )
+        self.is_set = np.zeros((num_nodes, num_nodes), dtype=bool)
+
+    def _index_of(self, key: Tuple[int, int]) -> Tuple[int, int]:
+        try:
+            src, dst = key
+            return self.node_to_index[src], self.node_to_index[dst]
+        except (KeyError, TypeError, ValueError):
+            raise KeyError(key) from None
+
+    def __setitem__(self, key: Tuple[int, int], value: Tuple[int, int, int]) -> None:
+        src_idx, dst_idx = self._index_of(key)
+        self.table[src_idx, dst_idx] = value
+        self.is_set[src_idx, dst_idx] = True
+
+    def __getitem__(self, key: Tuple[int, int]) -> Tuple[int, int, int]:
+        src_idx, dst_idx = self._index_of(key)
+        if not self.is_set[src_idx, dst_idx]:
+            raise KeyError(key)
+        return tuple(self.table[src_idx, dst_idx].tolist())
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        for src_idx, dst_idx in zip(*np.nonzero(self.is_set)):
+            yield self.node_ids[src_idx], self.node_ids[dst_idx]
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.is_set))
+
+    def items(self):
+        """Yields ((src_id, dst_id), (next_hop_id, my_if, next_hop_if)) for every set entry."""
+        src_indices, dst_indices = np.nonzero(self.is_set)
+        hops = self.table[src_indices, dst_indices].tolist()
+        return [
+            ((self.node_ids[src_idx], self.node_ids[dst_idx]), tuple(hop))
+            for src_idx, dst_idx, hop in zip(src_indices.tolist(), dst_indices.tolist(), hops)
+        ]
+
+    def freeze(self) -> "ForwardingState":
+        """
+        Makes the backing arrays read-only so the state can be shared between time steps
+        (e.g. reused when the topology did not change) without copying it. Returns self.
+        """
+        self.table.flags.writeable = False
+        self.is_set.flags.writeable = False
+        return self
+
+    def _same_layout(self, other) -> bool:
+        return isinstance(other, ForwardingState) and other.node_ids == self.node_ids
+
+    def __eq__(self, other) -> bool:
+        if self._same_layout(other):
+            # Unset cells always hold NO_ROUTE, so whole-array comparisons are exact
+            return np.array_equal(self.is_set, other.is_set) and np.array_equal(
+                self.table, other.table
+            )
+        return super().__eq__(other)
+
+    def copy(self) -> "ForwardingState":
+        """Independent, writable copy (also of a frozen state)."""
+        fstate = ForwardingState(self.node_ids)
+        fstate.table = self.table.copy()
+        fstate.is_set = self.is_set.copy()
+        return fstate
+
+    def __repr__(self) -> str:
+        return f"ForwardingState({dict(self.items())})"
@@ -1,25 +1,40 @@
 # fstate_calculation.py (Refactored Function)
 
+import heapq
 import math
-from typing import Dict, List, Tuple
+from typing import TYPE_CHECKING, Dict, List, Sequence, Tuple
 
 import networkx as nx
 import numpy as np
-from astropy.time import Time
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components, dijkstra
 
 from leopath import logger
 from leopath.network_state.gsl_attachment.gsl_attachment_interface import GSLAttachmentStrategy
+from leopath.network_state.utils import graph as graph_utils
 from leopath.topology.topology import GroundStation, LEOTopology
 
+from .forwarding_state import NO_ROUTE, ForwardingState
+
+if TYPE_CHECKING:
+    from astropy.time import Time
+
 log = logger.get_logger(__name__)
 
+# Below this many satellites the in-place NumPy Floyd-Warshall is used for cyclic ISL graphs;
+# larger ones run scipy's Dijkstra from every satellite in a single call
+SMALL_GRAPH_MAX_NODES = 128
+# Up to this many satellites Floyd-Warshall is cheaper than even detecting forests or uniform
+# weights, so it runs straight away whatever the structure
+TINY_GRAPH_MAX_NODES = 32
+
 
 def calculate_fstate_shortest_path_object_no_gs_relay(
     topology_with_isls: LEOTopology,
     ground_stations: list[GroundStation],
     gsl_attachment_strategy: GSLAttachmentStrategy,
-    current_time: Time,
-) -> dict:
+    current_time: "Time",
+) -> ForwardingState:
     """
     Calculates forwarding state using shortest paths over ISLs only (no GS relays).
 
@@ -28,6 +43,11 @@ def calculate_fstate_shortest_path_object_no_gs_relay(
         ground_stations: List of ground stations
         gsl_attachment_strategy: Strategy for selecting GSL attachments
         current_time: Current simulation time for satellite positioning
+
+    Returns:
+        ForwardingState mapping (src_id, dst_id) to (next_hop_id, my_if, next_hop_if),
+        backed by an int16 array over the satellite and ground station nodes (int32 when a
+        node ID does not fit in int16).
     """
     log.debug("Calculating shortest path fstate object (no GS relay)")
 
@@ -47,19 +67,18 @@ def calculate_fstate_shortest_path_object_no_gs_relay(
             log.warning(f"Ground station {gs_idx} has no satellite attachment")
 
     full_graph = topology_with_isls.graph
-    sat_neighbor_to_if = topology_with_isls.sat_neighbor_to_if
 
     try:
         all_satellite_ids = {sat.id for sat in topology_with_isls.get_satellites()}
     except Exception as e:
         log.exception(f"Error getting satellite IDs from topology: {e}")
-        return {}
+        return ForwardingState([])
     satellite_node_ids = sorted(
         [node_id for node_id in full_graph.nodes() if node_id in all_satellite_ids]
     )
     if not satellite_node_ids:
         log.warning("No valid satellite nodes found in the graph for path calculation.")
-        return {}
+        return ForwardingState([])
     # maps satellite node IDs to integer indices for efficient matrix operations
     # node_to_index dictionary allows efficient O(1) lookups to find the corresponding position
     # in the distance matrix for any given satellite ID
@@ -69,21 +88,32 @@ def calculate_fstate_shortest_path_object_no_gs_relay(
 
     if satellite_only_subgraph.number_of_nodes() == 0:
         log.warning("Satellite-only subgraph is empty. No ISL paths possible.")
-        return {}
+        return ForwardingState([])
+
+    # ISLs as CSR arrays indexed like node_to_index, rebuilt from the graph on every call
+    isl_csr = graph_utils.build_weighted_csr(satellite_node_ids, satellite_only_subgraph)
+    isl_interfaces = graph_utils.csr_interface_indices(
+        satellite_node_ids, isl_csr, topology_with_isls.sat_neighbor_to_if
+    )
+    # Routes only ever end at satellites with an attached ground station, so only distances
+    # towards those are read; the traversals below start from them alone (distances are symmetric)
+    target_sat_indices = sorted(
+        {
+            node_to_index[sat_id]
+            for visible_sats in ground_station_satellites_in_range
+            for _, sat_id in visible_sats
+            if sat_id in node_to_index
+        }
+    )
 
     try:
-        log.debug(
-            f"Calculating Floyd-Warshall on satellite subgraph for {len(satellite_node_ids)} nodes..."
-        )
-        dist_matrix = nx.floyd_warshall_numpy(
-            satellite_only_subgraph, nodelist=satellite_node_ids, weight="weight"
-        )
-        log.debug("Floyd-Warshall calculation complete.")
+        target_distances = _target_distances(isl_csr, target_sat_indices)
+        log.debug("All-pairs distance calculation complete.")
     except (nx.NetworkXError, Exception) as e:
-        log.error(f"Error during Floyd-Warshall shortest path calculation: {e}")
-        return {}
+        log.error(f"Error during all-pairs shortest path calculation: {e}")
+        return ForwardingState([])
 
-    fstate: dict[tuple, tuple] = {}
+    fstate = ForwardingState(satellite_node_ids + [gs.id for gs in ground_stations])
     dist_satellite_to_ground_station: dict[tuple, float] = {}
 
     _calculate_sat_to_gs_fstate(
@@ -92,9 +122,9 @@ def calculate_fstate_shortest_path_object_no_gs_relay(
         ground_station_satellites_in_range,
         satellite_node_ids,
         node_to_index,
-        satellite_only_subgraph,
-        dist_matrix,
-        sat_neighbor_to_if,
+        isl_csr,
+        isl_interfaces,
+        target_distances,
         dist_satellite_to_ground_station,
         fstate,
     )
@@ -112,17 +142,210 @@ def calculate_fstate_shortest_path_object_no_gs_relay(
     return fstate
 
 
+def _target_distances(
+    isl_csr: Tuple[np.ndarray, np.ndarray, np.ndarray], target_sat_indices: List[int]
+) -> Dict[int, np.ndarray]:
+    """
+    Distances between the target satellites and every satellite, as {target CSR row index:
+    row of N distances}. ISL distances are symmetric, so the row of a target also holds the
+    distance from every satellite towards it.
+    """
+    if not target_sat_indices:
+        return {}
+    sources, source_rows = _distance_rows(isl_csr, target_sat_indices)
+    rows = dict(zip(sources, source_rows))
+    return {idx: rows[idx] for idx in target_sat_indices}
+
+
+def _distance_rows(
+    isl_csr: Tuple[np.ndarray, np.ndarray, np.ndarray], sources: List[int]
+) -> Tuple[List[int], np.ndarray]:
+    """
+    Shortest path distances from sources, with the method that suits the ISL graph best.
+
+    Returns:
+        (computed_sources, rows): Floyd-Warshall yields the rows of every satellite, the other
+        methods those of sources only.
+    """
+    num_nodes = len(isl_csr[0]) - 1
+    if num_nodes <= TINY_GRAPH_MAX_NODES:
+        log.debug(
+            f"Calculating in-place Floyd-Warshall on tiny satellite subgraph for {num_nodes} nodes..."
+        )
+        return list(range(num_nodes)), _floyd_warshall_distance_matrix(isl_csr)
+    if _is_forest(isl_csr):
+        log.debug(
+            f"Calculating tree distances on acyclic satellite subgraph for {num_nodes} nodes..."
+        )
+        return sources, _forest_distance_matrix(isl_csr, sources)
+    if _has_uniform_weights(isl_csr):
+        log.debug(
+            f"Calculating BFS hop distances on uniform-weight satellite subgraph for {num_nodes} nodes..."
+        )
+        return sources, _bfs_distance_matrix(isl_csr, sources)
+    if num_nodes < SMALL_GRAPH_MAX_NODES:
+        log.debug(
+            f"Calculating in-place Floyd-Warshall on satellite subgraph for {num_nodes} nodes..."
+        )
+        return list(range(num_nodes)), _floyd_warshall_distance_matrix(isl_csr)
+    log.debug(f"Calculating multi-source Dijkstra on satellite subgraph for {num_nodes} nodes...")
+    return sources, _dijkstra_distance_matrix(isl_csr, sources)
+
+
+def _is_forest(isl_csr: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> bool:
+    """An undirected graph is a forest iff it has exactly one edge less than nodes per component."""
+    indptr, indices, weights = isl_csr
+    num_nodes = len(indptr) - 1
+    num_components, _ = connected_components(
+        csr_matrix((weights, indices, indptr), shape=(num_nodes, num_nodes)), directed=False
+    )
+    return len(indices) // 2 == num_nodes - num_components
+
+
+def _forest_distance_matrix(
+    isl_csr: Tuple[np.ndarray, np.ndarray, np.ndarray], sources: Sequence[int] | None = None
+) -> np.ndarray:
+    """
+    Shortest path distances on an acyclic (forest) ISL graph, from every node or from sources.
+
+    Rooted at any source, a forest is a DAG whose only path to each node is the tree path, so a
+    single traversal in topological (parent before child) order with one relaxation per edge yields the exact
+    distances: O(V + E) per source instead of Floyd-Warshall's O(V^3) overall.
+
+    Args:
+        isl_csr: Symmetric (indptr, indices, weights) CSR adjacency of the ISLs.
+        sources: Optional CSR row indices to start from; all nodes when None.
+
+    Returns:
+        Matrix of shape (len(sources), N), or (N, N) without sources, with columns indexed
+        like the CSR rows and inf for unreachable pairs.
+    """
+    num_nodes = len(isl_csr[0]) - 1
+    indptr, indices, weights = (array.tolist() for array in isl_csr)
+    rows = range(num_nodes) if sources is None else sources
+
+    dist_matrix = np.full((len(rows), num_nodes), np.inf)
+    for row, src_idx in enumerate(rows):
+        distances = dist_matrix[row]
+        distances[src_idx] = 0.0
+        frontier = [(src_idx, -1)]
+        while frontier:
+            node_idx, parent_idx = frontier.pop()
+            for edge_idx in range(indptr[node_idx], indptr[node_idx + 1]):
+                neighbor_idx = indices[edge_idx]
+                if neighbor_idx != parent_idx:
+                    distances[neighbor_idx] = distances[node_idx] + weights[edge_idx]
+                    frontier.append((neighbor_idx, node_idx))
+    return dist_matrix
+
+
+def _has_uniform_weights(isl_csr: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> bool:
+    """Whether the graph has ISLs and all of them have the same weight."""
+    weights = isl_csr[2]
+    return len(weights) > 0 and bool(np.all(weights == weights[0]))
+
+
+def _bfs_distance_matrix(
+    isl_csr: Tuple[np.ndarray, np.ndarray, np.ndarray], sources: List[int]
+) -> np.ndarray:
+    """
+    Shortest path distances from sources on an ISL graph whose links all share one weight.
+
+    Distances are hop counts times that weight, found with a level-synchronous BFS from all
+    sources at once: each level is one sparse product of the adjacency with the boolean
+    frontiers, so there is no priority queue and no Python-level work per node.
+
+    Args:
+        isl_csr: Symmetric (indptr, indices, weights) CSR adjacency of the ISLs.
+        sources: CSR row indices to start from.
+
+    Returns:
+        Matrix of shape (len(sources), N) with columns indexed like the CSR rows and inf for
+        unreachable pairs.
+    """
+    indptr, indices, weights = isl_csr
+    num_nodes = len(indptr) - 1
+    adjacency = csr_matrix(
+        (np.ones(len(indices), dtype=np.float32), indices, indptr), shape=(num_nodes, num_nodes)
+    )
+    hops = np.full((len(sources), num_nodes), np.inf)
+    frontier = np.zeros((len(sources), num_nodes), dtype=bool)
+    frontier[np.arange(len(sources)), sources] = True
+    hops[frontier] = 0
+    level = 0
+    while frontier.any():
+        level += 1
+        # The adjacency is symmetric, so A @ F.T holds the neighbours of every frontier
+        frontier = (adjacency @ frontier.T.astype(np.float32)).T > 0
+        frontier &= np.isinf(hops)
+        hops[frontier] = level
+    return hops * weights[0]
+
+
+def _floyd_warshall_distance_matrix(
+    isl_csr: Tuple[np.ndarray, np.ndarray, np.ndarray],
+) -> np.ndarray:
+    """
+    All-pairs shortest path distances with Floyd-Warshall, for small satellite graphs.
+
+    The matrix is filled straight from the CSR arrays and every relaxation round is two NumPy
+    calls writing into preallocated buffers, so there is no per-round allocation and no
+    Python-level work per node pair.
+
+    Args:
+        isl_csr: Symmetric (indptr, indices, weights) CSR adjacency of the ISLs.
+
+    Returns:
+        Matrix of shape (N, N) indexed like the CSR rows, with inf for unreachable pairs.
+    """
+    indptr, indices, weights = isl_csr
+    num_nodes = len(indptr) - 1
+    dist_matrix = np.full((num_nodes, num_nodes), np.inf)
+    np.fill_diagonal(dist_matrix, 0.0)
+    dist_matrix[np.repeat(np.arange(num_nodes), np.diff(indptr)), indices] = weights
+
+    via_k = np.empty_like(dist_matrix)
+    for k in range(num_nodes):
+        np.add(dist_matrix[:, k, None], dist_matrix[None, k, :], out=via_k)
+        np.minimum(dist_matrix, via_k, out=dist_matrix)
+    return dist_matrix
+
+
+def _dijkstra_distance_matrix(
+    isl_csr: Tuple[np.ndarray, np.ndarray, np.ndarray], sources: List[int] | None = None
+) -> np.ndarray:
+    """
+    Shortest path distances with scipy's compiled Dijkstra, run from every satellite (or from
+    sources) in one call over the CSR arrays. No predecessors are kept: next hops are derived
+    from the neighbours and this matrix.
+
+    Args:
+        isl_csr: Symmetric (indptr, indices, weights) CSR adjacency of the ISLs.
+        sources: Optional CSR row indices to start from; all nodes when None.
+
+    Returns:
+        Matrix of shape (len(sources), N), or (N, N) without sources, with columns indexed
+        like the CSR rows and inf for unreachable pairs.
+    """
+    indptr, indices, weights = isl_csr
+    num_nodes = len(indptr) - 1
+    graph = csr_matrix((weights, indices, indptr), shape=(num_nodes, num_nodes))
+    if sources is None:
+        return dijkstra(graph, directed=False)
+    return dijkstra(graph, directed=False, indices=sources).reshape(len(sources), num_nodes)
+
+
 def _calculate_sat_to_gs_fstate(
     topology_with_isls: LEOTopology,
     ground_stations: List[GroundStation],
     ground_station_satellites_in_range: List[List[Tuple[float, int]]],
     nodelist: List[int],
     node_to_index: Dict[int, int],
-    sat_subgraph: nx.Graph,
-    dist_matrix: np.ndarray,
-    sat_neighbor_to_if: Dict[Tuple[int, int], int],
+    isl_csr: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    isl_interfaces: Tuple[np.ndarray, np.ndarray],
+    target_distances: Dict[int, np.ndarray],
     dist_satellite_to_ground_station: Dict[Tuple[int, int], float],
-    fstate: Dict[Tuple[int, int], Tuple[int, int, int]],
+    fstate: ForwardingState,
 ) -> None:
     for curr_sat_id in nodelist:
         if not _is_valid_satellite(topology_with_isls, curr_sat_id):
@@ -135,10 +358,11 @@ def _calculate_sat_to_gs_fstate(
             topology_with_isls,
             ground_stations,
             ground_station_satellites_in_range,
+            nodelist,
             node_to_index,
-            sat_subgraph,
-            dist_matrix,
-            sat_neighbor_to_if,
+            isl_csr,
+            isl_interfaces,
+            target_distances,
             dist_satellite_to_ground_station,
             fstate,
         )
@@ -160,12 +384,13 @@ def _process_satellite_ground_station_routing(
     topology_with_isls: LEOTopology,
     ground_stations: List[GroundStation],
     ground_station_satellites_in_range: List[List[Tuple[float, int]]],
+    nodelist: List[int],
     node_to_index: Dict[int, int],
-    sat_subgraph: nx.Graph,
-    dist_matrix: np.ndarray,
-    sat_neighbor_to_if: Dict[Tuple[int, int], int],
+    isl_csr: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    isl_interfaces: Tuple[np.ndarray, np.ndarray],
+    target_distances: Dict[int, np.ndarray],
     dist_satellite_to_ground_station: Dict[Tuple[int, int], float],
-    fstate: Dict[Tuple[int, int], Tuple[int, int, int]],
+    fstate: ForwardingState,
 ) -> None:
     """Process routing from a specific satellite to all ground stations."""
     for gs_idx, dst_gs in enumerate(ground_stations):
@@ -179,15 +404,16 @@ def _process_satellite_ground_station_routing(
             )
         # Find all possible paths and determine best next hop
         possible_paths = _get_satellite_possibilities(
-            possible_dst_sats, curr_sat_idx, node_to_index, dist_matrix
+            possible_dst_sats, curr_sat_idx, node_to_index, target_distances
         )
         next_hop_decision, distance_to_ground_station_m = _get_next_hop_decision(
             possible_paths,
             curr_sat_id,
+            nodelist,
             node_to_index,
-            sat_subgraph,
-            dist_matrix,
-            sat_neighbor_to_if,
+            isl_csr,
+            isl_interfaces,
+            target_distances,
             topology_with_isls,
             dst_gs_node_id,
         )
@@ -212,7 +438,7 @@ def _store_routing_decision(
     next_hop_decision: Tuple[int, int, int],
     distance: float,
     dist_satellite_to_ground_station: Dict[Tuple[int, int], float],
-    fstate: Dict[Tuple[int, int], Tuple[int, int, int]],
+    fstate: ForwardingState,
 ) -> None:
     """Store the calculated routing decision in the forwarding tables."""
     dist_satellite_to_ground_station[(sat_id, gs_id)] = distance
@@ -223,7 +449,7 @@ def _get_satellite_possibilities(
     possible_dst_sats: List[Tuple[float, int]],
     curr_sat_idx: int,
     node_to_index: Dict[int, int],
-    dist_matrix: np.ndarray,
+    target_distances: Dict[int, np.ndarray],
 ) -> List[Tuple[float, int]]:
     possibilities = []
     for visibility_info in possible_dst_sats:
@@ -231,7 +457,7 @@ def _get_satellite_possibilities(
         visible_sat_idx = node_to_index.get(visible_sat_id)
         if visible_sat_idx is not None:
             # Get the distance from current satellite to this visible satellite
-            dist_curr_to_visible_sat = dist_matrix[curr_sat_idx, visible_sat_idx]
+            dist_curr_to_visible_sat = target_distances[visible_sat_idx][curr_sat_idx]
             # If a path exists (distance is not infinity):
             if not np.isinf(dist_curr_to_visible_sat):
                 # distance(current_sat → visible_sat) + distance(visible_sat → ground_station)
@@ -244,10 +470,11 @@ def _get_satellite_possibilities(
 def _get_next_hop_decision(
     possible_sat_gs_routes: List[Tuple[float, int]],
     curr_sat_id: int,
+    nodelist: List[int],
     node_to_index: Dict[int, int],
-    sat_subgraph: nx.Graph,
-    dist_matrix: np.ndarray,
-    sat_neighbor_to_if: Dict[Tuple[int, int], int],
+    isl_csr: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    isl_interfaces: Tuple[np.ndarray, np.ndarray],
+    target_distances: Dict[int, np.ndarray],
     topology_with_isls: LEOTopology,
     dst_gs_node_id: int,
 ) -> Tuple[Tuple[int, int, int], float]:
@@ -263,10 +490,11 @@ def _get_next_hop_decision(
             next_hop_decision = _handle_multihop_path(
                 curr_sat_id,
                 dst_sat_idx,
-                sat_subgraph,
+                isl_csr,
+                isl_interfaces,
+                nodelist,
                 node_to_index,
-                dist_matrix,
-                sat_neighbor_to_if,
+                target_distances,
             )
         else:
             next_hop_decision = _handle_direct_gs_path(
@@ -278,13 +506,17 @@ def _get_next_hop_decision(
 def _handle_multihop_path(
     curr_sat_id: int,
     dst_sat_idx: int,
-    sat_subgraph: nx.Graph,
+    isl_csr: Tuple[np.ndarray, np.ndarray, np.ndarray],
+    isl_interfaces: Tuple[np.ndarray, np.ndarray],
+    nodelist: List[int],
     node_to_index: Dict[int, int],
-    dist_matrix: np.ndarray,
-    sat_neighbor_to_if: Dict[Tuple[int, int], int],
+    target_distances: Dict[int, np.ndarray],
 ) -> Tuple[int, int, int]:
     """
     Handle routing when current satellite needs to route through other satellites.
+    Neighbours are scanned from the CSR row of the current satellite, in the graph's neighbour
+    order (the first of equal-cost neighbours wins, as with graph.neighbors), and the
+    interfaces of the chosen one are read from the arrays aligned with that row.
 
     Returns:
         Tuple[int, int, int]: (next_hop_id, local_interface, remote_interface)
@@ -292,24 +524,26 @@ def _handle_multihop_path(
     next_hop_decision = (-1, -1, -1)
     best_neighbor_dist_m = float("inf")
 
-    for neighbor_id in sat_subgraph.neighbors(curr_sat_id):
-        neighbor_idx = node_to_index.get(neighbor_id)
-        if neighbor_idx is None:
-            continue
-
-        try:
-            link_weight = sat_subgraph.edges[curr_sat_id, neighbor_id]["weight"]
-            dist_neighbor_to_dst_sat = dist_matrix[neighbor_idx, dst_sat_idx]
-
-            if not np.isinf(dist_neighbor_to_dst_sat):
-                distance_m = link_weight + dist_neighbor_to_dst_sat
-                if distance_m < best_neighbor_dist_m:
-                    my_if = sat_neighbor_to_if.get((curr_sat_id, neighbor_id), -1)
-                    next_hop_if = sat_neighbor_to_if.get((neighbor_id, curr_sat_id), -1)
-                    next_hop_decision = (neighbor_id, my_if, next_hop_if)
-                    best_neighbor_dist_m = distance_m
-        except KeyError:
-            log.warning(f"KeyError for edge ({curr_sat_id}, {neighbor_id}) in sat_subgraph.")
+    indptr, indices, weights = isl_csr
+    local_if, remote_if = isl_interfaces
+    curr_sat_idx = node_to_index[curr_sat_id]
+    dist_to_dst_sat = target_distances[dst_sat_idx]
+    row_start = int(indptr[curr_sat_idx])
+    row = slice(row_start, indptr[curr_sat_idx + 1])
+    for edge_idx, (neighbor_idx, link_weight) in enumerate(
+        zip(indices[row].tolist(), weights[row].tolist()), start=row_start
+    ):
+        dist_neighbor_to_dst_sat = dist_to_dst_sat[neighbor_idx]
+
+        if not np.isinf(dist_neighbor_to_dst_sat):
+            distance_m = link_weight + dist_neighbor_to_dst_sat
+            if distance_m < best_neighbor_dist_m:
+                next_hop_decision = (
+                    nodelist[neighbor_idx],
+                    int(local_if[edge_idx]),
+                    int(remote_if[edge_idx]),
+                )
+                best_neighbor_dist_m = distance_m
 
     return next_hop_decision
 
@@ -341,7 +575,7 @@ def _calculate_gs_to_gs_fstate(
     ground_station_satellites_in_range: List[List[Tuple[float, int]]],
     node_to_index: Dict[int, int],
     dist_satellite_to_ground_station: Dict[Tuple[int, int], float],
-    fstate: Dict[Tuple[int, int], Tuple[int, int, int]],
+    fstate: ForwardingState,
 ) -> None:
     """
     Calculate forwarding state for ground station to ground station communication.
@@ -358,10 +592,10 @@ def _calculate_gs_to_gs_fstate(
         ground_station_satellites_in_range: Visibility information between ground stations and satellites
         node_to_index: Mapping of node IDs to matrix indices
         dist_satellite_to_ground_station: Precomputed distances from satellites to ground stations
-        fstate: Forwarding state dictionary to be updated
+        fstate: ForwardingState to be updated
 
     Returns:
-        None: Updates the fstate dictionary in-place
+        None: Updates fstate in-place
     """
     for src_idx, src_gs in enumerate(ground_stations):
         src_gs_node_id = src_gs.id
@@ -452,3 +686,153 @@ def _select_best_gs_to_gs_path(
             log.error(f"Could not find satellite {src_sat_id} for GS-GS path: {e}")
 
     return next_hop_decision
+
+
+def calculate_fstate_shortest_path_for_pairs(
+    topology_with_isls: LEOTopology,
+    ground_stations: list[GroundStation],
+    gsl_attachment_strategy: GSLAttachmentStrategy,
+    current_time: "Time",
+    query_pairs: List[Tuple[int, int]],
+    satellite_positions_m: np.ndarray | None = None,
+) -> ForwardingState:
+    """
+    Calculates the forwarding state of selected (src, dst) pairs only, with one A* search per
+    pair instead of all-pairs shortest paths. Entries match those of
+    calculate_fstate_shortest_path_object_no_gs_relay (up to ties between equal-length paths).
+
+    Args:
+        topology_with_isls: Network topology with ISL links
+        ground_stations: List of ground stations
+        gsl_attachment_strategy: Strategy for selecting GSL attachments
+        current_time: Current simulation time for satellite positioning
+        query_pairs: (src_id, dst_id) pairs to resolve; dst_id must be a ground station and
+            src_id either a satellite or another ground station
+        satellite_positions_m: Optional positions (N_sat, 3), rows in constellation order,
+            used for the A* heuristic. Without them the search degrades to Dijkstra.
+
+    Returns:
+        ForwardingState holding only the queried pairs.
+    """
+    gsl_attachments = gsl_attachment_strategy.select_attachments(
+        topology_with_isls, ground_stations, current_time
+    )
+    attached_sat_of_gs = {
+        gs.id: sat_id for gs, (_, sat_id) in zip(ground_stations, gsl_attachments) if sat_id != -1
+    }
+    satellites = topology_with_isls.get_satellites()
+    satellite_ids = {sat.id for sat in satellites}
+    satellite_node_ids = sorted(
+        node_id for node_id in topology_with_isls.graph.nodes() if node_id in satellite_ids
+    )
+    node_to_index = {node_id: index for index, node_id in enumerate(satellite_node_ids)}
+    isl_csr = graph_utils.build_weighted_csr(satellite_node_ids, topology_with_isls.graph)
+    # Converted once: the search loop indexes plain lists
+    isl_lists = tuple(array.tolist() for array in isl_csr)
+    positions_m = None
+    if satellite_positions_m is not None:
+        row_of_sat = {sat.id: row for row, sat in enumerate(satellites)}
+        positions_m = satellite_positions_m[[row_of_sat[sat_id] for sat_id in satellite_node_ids]]
+    heuristics: Dict[int, List[float]] = {}
+
+    def shortest_pair(src_sat_id: int, dst_sat_id: int) -> Tuple[float, List[int]]:
+        src_idx, dst_idx = node_to_index.get(src_sat_id), node_to_index.get(dst_sat_id)
+        if src_idx is None or dst_idx is None:
+            return float("inf"), []
+        if dst_idx not in heuristics:
+            heuristics[dst_idx] = _astar_heuristic(positions_m, dst_idx, len(satellite_node_ids))
+        distance_m, path = _shortest_pair_astar(isl_lists, src_idx, dst_idx, heuristics[dst_idx])
+        return distance_m, [satellite_node_ids[idx] for idx in path]
+
+    fstate = ForwardingState(sorted(satellite_ids) + [gs.id for gs in ground_stations])
+    for src_id, dst_id in query_pairs:
+        dst_sat_id = attached_sat_of_gs.get(dst_id)
+        if src_id in attached_sat_of_gs or src_id not in satellite_ids:
+            # GS -> GS: enter the constellation through the attached satellite of the source
+            src_sat_id = attached_sat_of_gs.get(src_id)
+            if src_sat_id is None or dst_sat_id is None:
+                fstate[(src_id, dst_id)] = NO_ROUTE
+                continue
+            distance_m, _ = shortest_pair(src_sat_id, dst_sat_id)
+            fstate[(src_id, dst_id)] = (
+                NO_ROUTE
+                if math.isinf(distance_m)
+                else _select_best_gs_to_gs_path([(distance_m, src_sat_id)], topology_with_isls)
+            )
+        elif dst_sat_id is None:
+            fstate[(src_id, dst_id)] = NO_ROUTE
+        elif src_id == dst_sat_id:
+            fstate[(src_id, dst_id)] = _handle_direct_gs_path(
+                dst_sat_id, dst_id, topology_with_isls
+            )
+        else:
+            _, path = shortest_pair(src_id, dst_sat_id)
+            if not path:
+                fstate[(src_id, dst_id)] = NO_ROUTE
+                continue
+            next_hop_id = path[1]
+            fstate[(src_id, dst_id)] = (
+                next_hop_id,
+                topology_with_isls.sat_neighbor_to_if.get((src_id, next_hop_id), -1),
+                topology_with_isls.sat_neighbor_to_if.get((next_hop_id, src_id), -1),
+            )
+    return fstate
+
+
+def _astar_heuristic(positions_m: np.ndarray | None, dst_idx: int, num_nodes: int) -> List[float]:
+    """Straight-line distance of every node to dst_idx, or zeros without positions."""
+    if positions_m is None:
+        return [0.0] * num_nodes
+    return np.linalg.norm(positions_m - positions_m[dst_idx], axis=1).tolist()
+
+
+def _shortest_pair_astar(
+    isl_lists: Tuple[List[int], List[int], List[float]],
+    src_idx: int,
+    dst_idx: int,
+    heuristic: List[float],
+) -> Tuple[float, List[int]]:
+    """
+    Single-pair shortest path using A* over the CSR adjacency, with the straight-line distance
+    to dst as heuristic. The heuristic is admissible (and consistent) because link weights are
+    straight-line lengths between the same positions.
+
+    The loop is specialised to CSR positions: distances, parents and neighbour rows are plain
+    lists indexed by int, with no graph views or dict lookups per relaxation.
+
+    Args:
+        isl_lists: (indptr, indices, weights) of the CSR adjacency, as lists.
+        src_idx: CSR position of the source.
+        dst_idx: CSR position of the destination.
+        heuristic: Lower bound of the distance to dst_idx of every node, by CSR position.
+
+    Returns:
+        (distance_m, path) with path as a list of CSR positions from src to dst,
+        or (inf, []) if dst is unreachable.
+    """
+    indptr, indices, weights = isl_lists
+    best_distance_m = [math.inf] * (len(indptr) - 1)
+    best_distance_m[src_idx] = 0.0
+    parent = [-1] * (len(indptr) - 1)
+    closed = bytearray(len(indptr) - 1)
+    heap = [(heuristic[src_idx], 0.0, src_idx)]
+    while heap:
+        _, distance_m, node_idx = heapq.heappop(heap)
+        if node_idx == dst_idx:
+            path = [dst_idx]
+            while path[-1] != src_idx:
+                path.append(parent[path[-1]])
+            return distance_m, path[::-1]
+        if closed[node_idx]:
+            continue
+        closed[node_idx] = 1
+        for edge_idx in range(indptr[node_idx], indptr[node_idx + 1]):
+            neighbor_idx = indices[edge_idx]
+            candidate_m = distance_m + weights[edge_idx]
+            if candidate_m < best_distance_m[neighbor_idx]:
+                best_distance_m[neighbor_idx] = candidate_m
+                parent[neighbor_idx] = node_idx
+                heapq.heappush(
+                    heap, (candidate_m + heuristic[neighbor_idx], candidate_m, neighbor_idx)
+                )
+    return float("inf"), []
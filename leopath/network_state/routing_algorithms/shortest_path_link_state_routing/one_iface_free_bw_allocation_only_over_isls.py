@@ -21,10 +21,13 @@
 # SOFTWARE.
 
 
+from collections.abc import Mapping
+
 from astropy.time import Time
 
 from leopath import logger
 from leopath.network_state.gsl_attachment.gsl_attachment_interface import GSLAttachmentStrategy
+from leopath.network_state.utils.gsl_interfaces import gsl_interfaces_array
 from leopath.topology.topology import ConstellationData, GroundStation, LEOTopology
 
 from .fstate_calculation import calculate_fstate_shortest_path_object_no_gs_relay
@@ -83,34 +86,30 @@ def algorithm_free_one_only_over_isls(
 def _calculate_bandwidth_state(
     constellation_data: ConstellationData,
     ground_stations: list[GroundStation],
-    list_gsl_interfaces_info: list,
+    list_gsl_interfaces_info,
 ) -> dict:
     """
     Returns a dict mapping node_id to its aggregate_max_bandwidth.
+    list_gsl_interfaces_info may be a list of dicts or a GSL_INTERFACE_DTYPE array.
     """
     num_satellites = constellation_data.number_of_satellites
     num_total_nodes = num_satellites + len(ground_stations)
-    bandwidth_state = {}
+    gsl_interfaces = gsl_interfaces_array(list_gsl_interfaces_info)
 
-    if len(list_gsl_interfaces_info) != num_total_nodes:
+    if len(gsl_interfaces) != num_total_nodes:
         log.warning(
-            f"Length mismatch: list_gsl_interfaces_info ({len(list_gsl_interfaces_info)}) "
+            f"Length mismatch: list_gsl_interfaces_info ({len(gsl_interfaces)}) "
             f"vs total nodes ({num_total_nodes}). Bandwidth state might be incomplete."
         )
 
-    for i in range(num_total_nodes):
-        if i < len(list_gsl_interfaces_info):
-            node_info = list_gsl_interfaces_info[i]
-            node_id = node_info.get("id", i)
-            bandwidth = node_info.get("aggregate_max_bandwidth", 0.0)
-        else:
-            node_id = i
-            bandwidth = 0.0
-            log.error(
-                f"Index {i} out of bounds for list_gsl_interfaces_info, setting BW=0 for node {node_id}"
-            )
-        bandwidth_state[node_id] = bandwidth
-        log.debug(f"  Bandwidth state: Node {node_id}, IF 0, BW = {bandwidth}")
+    # Nodes are indexed by position in the interface array
+    known = gsl_interfaces[:num_total_nodes]
+    bandwidth_state = dict(zip(known["id"].tolist(), known["aggregate_max_bandwidth"].tolist()))
+    for node_id in range(len(known), num_total_nodes):
+        log.error(
+            f"Index {node_id} out of bounds for list_gsl_interfaces_info, setting BW=0 for node {node_id}"
+        )
+        bandwidth_state[node_id] = 0.0
 
     log.debug(f"  Calculated bandwidth state for {len(bandwidth_state)} nodes.")
     return bandwidth_state
@@ -121,7 +120,7 @@ def _calculate_forwarding_state(
     ground_stations: list[GroundStation],
     gsl_attachment_strategy: GSLAttachmentStrategy,
     current_time: Time,
-) -> dict:
+) -> Mapping:
     """
     Returns the forwarding state object using shortest path calculation.
     """
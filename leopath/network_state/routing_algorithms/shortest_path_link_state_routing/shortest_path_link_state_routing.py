@@ -8,7 +8,11 @@ from leopath.network_state.routing_algorithms.routing_algorithm import RoutingAl
 # This import is necessary for the factory to have the strategy registered
 from leopath.topology.topology import ConstellationData, GroundStation, LEOTopology
 
-from .one_iface_free_bw_allocation_only_over_isls import algorithm_free_one_only_over_isls
+from .fstate_calculation import calculate_fstate_shortest_path_for_pairs
+from .one_iface_free_bw_allocation_only_over_isls import (
+    _calculate_bandwidth_state,
+    algorithm_free_one_only_over_isls,
+)
 
 
 class ShortestPathLinkStateRoutingAlgorithm(RoutingAlgorithm):
@@ -46,3 +50,35 @@ class ShortestPathLinkStateRoutingAlgorithm(RoutingAlgorithm):
             current_time,
             list_gsl_interfaces_info,
         )
+
+    def compute_state_for_pairs(
+        self,
+        time_since_epoch_ns: int,
+        constellation_data: ConstellationData,
+        ground_stations: list[GroundStation],
+        topology_with_isls: LEOTopology,
+        list_gsl_interfaces_info: list,
+        query_pairs: list[tuple[int, int]],
+        satellite_positions_m=None,
+    ) -> dict:
+        """
+        Calculates bandwidth state and the forwarding state of the queried (src, dst) pairs only,
+        using one A* search per pair instead of all-pairs shortest paths.
+        """
+        gsl_strategy = GSLAttachmentFactory.get_strategy("nearest_satellite")
+        epoch = Time("2000-01-01 00:00:00", scale="tdb")
+        current_time = epoch + time_since_epoch_ns * astro_units.ns
+
+        return {
+            "fstate": calculate_fstate_shortest_path_for_pairs(
+                topology_with_isls,
+                ground_stations,
+                gsl_strategy,
+                current_time,
+                query_pairs,
+                satellite_positions_m,
+            ),
+            "bandwidth": _calculate_bandwidth_state(
+                constellation_data, ground_stations, list_gsl_interfaces_info
+            ),
+        }
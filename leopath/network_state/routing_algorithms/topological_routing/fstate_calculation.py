@@ -1,8 +1,10 @@
-from typing import Optional
+from collections import Counter
+from typing import Optional, Sequence
 
 import networkx as nx
 
 from leopath import logger
+from leopath.network_state.utils.gsl_interfaces import gsl_interfaces_array
 from leopath.topology.satellite.topological_network_address import TopologicalNetworkAddress
 from leopath.topology.topology import ConstellationData, GroundStation, LEOTopology
 
@@ -75,34 +77,30 @@ def algorithm_free_one_only_over_isls_topological(
 def _calculate_bandwidth_state(
     constellation_data: ConstellationData,
     ground_stations: list[GroundStation],
-    list_gsl_interfaces_info: list,
+    list_gsl_interfaces_info,
 ) -> dict:
     """
     Returns a dict mapping node_id to its aggregate_max_bandwidth.
+    list_gsl_interfaces_info may be a list of dicts or a GSL_INTERFACE_DTYPE array.
     """
     num_satellites = constellation_data.number_of_satellites
     num_total_nodes = num_satellites + len(ground_stations)
-    bandwidth_state = {}
+    gsl_interfaces = gsl_interfaces_array(list_gsl_interfaces_info)
 
-    if len(list_gsl_interfaces_info) != num_total_nodes:
+    if len(gsl_interfaces) != num_total_nodes:
         log.warning(
-            f"Length mismatch: list_gsl_interfaces_info ({len(list_gsl_interfaces_info)}) "
+            f"Length mismatch: list_gsl_interfaces_info ({len(gsl_interfaces)}) "
             f"vs total nodes ({num_total_nodes}). Bandwidth state might be incomplete."
         )
 
-    for i in range(num_total_nodes):
-        if i < len(list_gsl_interfaces_info):
-            node_info = list_gsl_interfaces_info[i]
-            node_id = node_info.get("id", i)
-            bandwidth = node_info.get("aggregate_max_bandwidth", 0.0)
-        else:
-            node_id = i
-            bandwidth = 0.0
-            log.error(
-                f"Index {i} out of bounds for list_gsl_interfaces_info, setting BW=0 for node {node_id}"
-            )
-        bandwidth_state[node_id] = bandwidth
-        log.debug(f"  Bandwidth state: Node {node_id}, IF 0, BW = {bandwidth}")
+    # Nodes are indexed by position in the interface array
+    known = gsl_interfaces[:num_total_nodes]
+    bandwidth_state = dict(zip(known["id"].tolist(), known["aggregate_max_bandwidth"].tolist()))
+    for node_id in range(len(known), num_total_nodes):
+        log.error(
+            f"Index {node_id} out of bounds for list_gsl_interfaces_info, setting BW=0 for node {node_id}"
+        )
+        bandwidth_state[node_id] = 0.0
 
     log.debug(f"  Calculated bandwidth state for {len(bandwidth_state)} nodes.")
     return bandwidth_state
@@ -167,6 +165,7 @@ def calculate_fstate_topological_routing_no_gs_relay(
             satellite_node_ids, satellite_only_subgraph, topology_with_isls
         )
         # Also assign GS addresses for initial GSL attachments
+        initial_renumberings = []
         for gs_idx, gs in enumerate(ground_stations):
             curr_sat_id = None
             if gs_idx < len(ground_station_satellites_in_range):
@@ -174,7 +173,8 @@ def calculate_fstate_topological_routing_no_gs_relay(
                 if satellites:
                     _, curr_sat_id = satellites[0]
             if curr_sat_id is not None:
-                _perform_renumbering_for_gs(gs, None, curr_sat_id, topology_with_isls)
+                initial_renumberings.append((gs, None, curr_sat_id))
+        _perform_renumbering_batch(initial_renumberings, topology_with_isls)
         graph_has_changed = True  # Force recalculation on first run
 
     # Step 2: Check if we can reuse previous state
@@ -184,10 +184,12 @@ def calculate_fstate_topological_routing_no_gs_relay(
 
     # Step 3: Handle ground station link changes (renumbering if needed)
     gsl_changes = _detect_gsl_changes(ground_stations, ground_station_satellites_in_range)
+    renumberings = []
     for gs_idx, (prev_sat_id, curr_sat_id) in gsl_changes.items():
         gs = ground_stations[gs_idx]
         log.debug(f"GSL changed for GS {gs.id}: {prev_sat_id} -> {curr_sat_id}")
-        _perform_renumbering_for_gs(gs, prev_sat_id, curr_sat_id, topology_with_isls)
+        renumberings.append((gs, prev_sat_id, curr_sat_id))
+    _perform_renumbering_batch(renumberings, topology_with_isls)
 
     # Step 4: Calculate satellite-to-GS forwarding state
     fstate: dict[tuple, tuple] = {}
@@ -323,57 +325,90 @@ def _perform_renumbering_for_gs(
 
     Updates the GS's 6grupa address to match the new satellite attachment.
     """
-    log.debug(f"Renumbering for GS {gs.id} from satellite {prev_sat_id} to {curr_sat_id}")
+    _perform_renumbering_batch([(gs, prev_sat_id, curr_sat_id)], topology)
 
-    if curr_sat_id is not None:
-        # Get the satellite's 6grupa address to match coordinates
-        try:
-            satellite = topology.get_satellite(curr_sat_id)
-            if satellite.sixgrupa_addr is None:
-                satellite.sixgrupa_addr = (
-                    TopologicalNetworkAddress.set_address_from_orbital_parameters(curr_sat_id)
+
+def _perform_renumbering_batch(
+    renumberings: Sequence[tuple[GroundStation, Optional[int], Optional[int]]],
+    topology: LEOTopology,
+):
+    """
+    Perform renumbering for several ground stations whose satellite links changed.
+
+    Same result as calling _perform_renumbering_for_gs for each (gs, prev_sat_id, curr_sat_id)
+    in order, but the ground station addresses in use are collected in a single scan of the
+    topology's ground stations instead of one scan per renumbered ground station.
+    """
+    # Ground station addresses in use, counted per (shell_id, plane_id, sat_index, subnet_index),
+    # and the counted address (or None) of every ground station of the topology
+    used_addresses: Counter = Counter()
+    counted_address_keys = {}
+    for other_gs in topology.get_ground_stations():
+        other_addr = getattr(other_gs, "sixgrupa_addr", None)
+        key = _address_key(other_addr) if other_addr is not None else None
+        if key is not None:
+            used_addresses[key] += 1
+        counted_address_keys[id(other_gs)] = key
+
+    for gs, prev_sat_id, curr_sat_id in renumberings:
+        log.debug(f"Renumbering for GS {gs.id} from satellite {prev_sat_id} to {curr_sat_id}")
+
+        # A ground station does not compete with its own current address
+        in_topology = id(gs) in counted_address_keys
+        own_key = counted_address_keys.get(id(gs))
+        if own_key is not None:
+            used_addresses[own_key] -= 1
+
+        if curr_sat_id is not None:
+            # Get the satellite's 6grupa address to match coordinates
+            try:
+                satellite = topology.get_satellite(curr_sat_id)
+                if satellite.sixgrupa_addr is None:
+                    satellite.sixgrupa_addr = (
+                        TopologicalNetworkAddress.set_address_from_orbital_parameters(curr_sat_id)
+                    )
+                sat_addr = satellite.sixgrupa_addr
+            except Exception:
+                log.error(
+                    f"Failed to get satellite {curr_sat_id} address for GS {gs.id} renumbering"
                 )
-            sat_addr = satellite.sixgrupa_addr
-        except Exception:
-            log.error(f"Failed to get satellite {curr_sat_id} address for GS {gs.id} renumbering")
-            return
-
-        # Count how many GSs are already attached to this satellite to assign unique subnet_index
-        # Look for GSs that have 6grupa addresses matching this satellite's coordinates
-        used_subnet_indices = set()
-        for other_gs in topology.get_ground_stations():
-            if (
-                other_gs != gs
-                and hasattr(other_gs, "sixgrupa_addr")
-                and other_gs.sixgrupa_addr is not None
-            ):
-                other_addr = other_gs.sixgrupa_addr
-                # Check if this GS is attached to the same satellite (same coordinates)
-                if (
-                    other_addr.shell_id == sat_addr.shell_id
-                    and other_addr.plane_id == sat_addr.plane_id
-                    and other_addr.sat_index == sat_addr.sat_index
-                ):
-                    used_subnet_indices.add(other_addr.subnet_index)
-
-        # Find the next available subnet_index > 0 (0 is reserved for satellite)
-        subnet_index = 1
-        while subnet_index in used_subnet_indices:
-            subnet_index += 1
-
-        # Assign new address based on the current satellite
-        gs_address = _assign_gs_address_from_satellite(gs, curr_sat_id, subnet_index, topology)
-        if gs_address:
-            gs.sixgrupa_addr = gs_address
-            gs.previous_attached_satellite_id = curr_sat_id  # Update the previous attachment
-            log.info(f"Renumbered GS {gs.id} to new address {gs_address}")
+                if own_key is not None:
+                    used_addresses[own_key] += 1
+                continue
+
+            # Find the next available subnet_index > 0 (0 is reserved for satellite) among the
+            # GSs attached to this satellite (same shell, plane and sat_index)
+            subnet_index = 1
+            while used_addresses[
+                (sat_addr.shell_id, sat_addr.plane_id, sat_addr.sat_index, subnet_index)
+            ]:
+                subnet_index += 1
+
+            # Assign new address based on the current satellite
+            gs_address = _assign_gs_address_from_satellite(gs, curr_sat_id, subnet_index, topology)
+            if gs_address:
+                gs.sixgrupa_addr = gs_address
+                gs.previous_attached_satellite_id = curr_sat_id  # Update the previous attachment
+                log.info(f"Renumbered GS {gs.id} to new address {gs_address}")
+                new_key: Optional[tuple[int, int, int, int]] = _address_key(gs_address)
+            else:
+                log.warning(f"Renumbering GS {gs.id} failed, address assignment returned None")
+                new_key = own_key
         else:
-            log.warning(f"Renumbering GS {gs.id} failed, address assignment returned None")
-    else:
-        # No current satellite - clear the address
-        gs.sixgrupa_addr = None
-        gs.previous_attached_satellite_id = None  # Clear previous attachment
-        log.debug(f"GS {gs.id} detached, cleared 6grupa address")
+            # No current satellite - clear the address
+            gs.sixgrupa_addr = None
+            gs.previous_attached_satellite_id = None  # Clear previous attachment
+            log.debug(f"GS {gs.id} detached, cleared 6grupa address")
+            new_key = None
+
+        if in_topology:
+            counted_address_keys[id(gs)] = new_key
+            if new_key is not None:
+                used_addresses[new_key] += 1
+
+
+def _address_key(address: TopologicalNetworkAddress) -> tuple[int, int, int, int]:
+    return (address.shell_id, address.plane_id, address.sat_index, address.subnet_index)
 
 
 def _fill_forwarding_tables_in_every_satellite(
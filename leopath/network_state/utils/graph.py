@@ -1,5 +1,7 @@
 import math
 
+import numpy as np
+
 from leopath import logger
 from leopath.topology.topology import LEOTopology
 
@@ -25,6 +27,128 @@ def validate_no_satellite_to_gs_links(graph, satellites, ground_stations):
             raise ValueError(f"Invalid edge between satellite {u} and ground station {v}")
 
 
+def build_isl_csr(undirected_isls, num_nodes: int | None = None):
+    """
+    Builds a compressed sparse row (CSR) adjacency of the predefined ISLs.
+
+    Each undirected ISL (a, b) is stored once, under its first endpoint. The position of every
+    ISL in the CSR is kept as well, so iter_isl_csr yields the ISLs in their original order
+    (which the interface indices depend on) whether or not the list is grouped by first endpoint.
+
+    :param undirected_isls: List of ISL pairs [(sat_id_a, sat_id_b), ...].
+    :param num_nodes: Number of rows of the adjacency. Defaults to the largest satellite ID + 1.
+    :return: Tuple (indptr, indices, isl_entries) of np.int32 arrays; the neighbours of
+             satellite u are indices[indptr[u]:indptr[u + 1]], and the k-th ISL of
+             undirected_isls is stored at indices[isl_entries[k]].
+    :raises ValueError: If num_nodes does not cover every satellite ID in undirected_isls.
+    """
+    pairs = np.asarray(undirected_isls, dtype=np.int32).reshape(-1, 2)
+    min_num_nodes = int(pairs.max()) + 1 if len(pairs) else 0
+    if num_nodes is None:
+        num_nodes = min_num_nodes
+    elif num_nodes < min_num_nodes:
+        raise ValueError(f"num_nodes ({num_nodes}) must be at least {min_num_nodes}")
+    order = np.argsort(pairs[:, 0], kind="stable")
+    indices = np.ascontiguousarray(pairs[order, 1])
+    isl_entries = np.empty(len(pairs), dtype=np.int32)
+    isl_entries[order] = np.arange(len(pairs), dtype=np.int32)
+    indptr = np.zeros(num_nodes + 1, dtype=np.int32)
+    np.cumsum(np.bincount(pairs[:, 0], minlength=num_nodes), out=indptr[1:])
+    return indptr, indices, isl_entries
+
+
+def build_weighted_csr(node_ids, graph):
+    """
+    Builds a symmetric, weighted CSR adjacency of a graph over the positions of node_ids.
+
+    Only edges between nodes of node_ids are kept. Every row lists its neighbours in the
+    graph's own neighbour order (that of graph.neighbors, i.e. edge insertion order), so
+    scanning a row and keeping the first of equal-cost neighbours picks the same neighbour as
+    scanning graph.neighbors.
+
+    :param node_ids: IDs of the nodes, in the order that defines their positions.
+    :param graph: nx.Graph whose edges have a "weight" attribute.
+    :return: Tuple (indptr, indices, weights) with np.int32 indptr/indices and np.float64
+             weights; the neighbours of the node at position i are indices[indptr[i]:indptr[i + 1]].
+    :raises KeyError: If a node ID is not in the graph.
+    """
+    node_to_index = {node_id: idx for idx, node_id in enumerate(node_ids)}
+    indptr = np.zeros(len(node_to_index) + 1, dtype=np.int32)
+    indices, weights = [], []
+    for idx, node_id in enumerate(node_ids):
+        for neighbor_id, edge_data in graph.adj[node_id].items():
+            neighbor_idx = node_to_index.get(neighbor_id)
+            if neighbor_idx is not None:
+                indices.append(neighbor_idx)
+                weights.append(edge_data["weight"])
+        indptr[idx + 1] = len(indices)
+    return indptr, np.array(indices, dtype=np.int32), np.array(weights, dtype=np.float64)
+
+
+def csr_interface_indices(node_ids, isl_csr, sat_neighbor_to_if):
+    """
+    ISL interface indices aligned with the entries of a CSR adjacency from build_weighted_csr.
+
+    For the entry of row u pointing at v, local holds the interface of u towards v and remote
+    the interface of v towards u, so a next hop's interfaces are two array loads instead of two
+    tuple-keyed dict lookups.
+
+    :param node_ids: IDs of the nodes, in the order of the CSR rows.
+    :param isl_csr: Tuple (indptr, indices, weights).
+    :param sat_neighbor_to_if: Dict {(sat_id, neighbor_sat_id): interface index}.
+    :return: Tuple (local, remote) of np.int8 arrays shaped like indices, -1 where unmapped.
+    """
+    indptr, indices, _ = isl_csr
+    ids = list(node_ids)
+    entries = list(zip(np.repeat(np.arange(len(ids)), np.diff(indptr)).tolist(), indices.tolist()))
+    local = np.array(
+        [sat_neighbor_to_if.get((ids[u], ids[v]), -1) for u, v in entries], dtype=np.int8
+    )
+    remote = np.array(
+        [sat_neighbor_to_if.get((ids[v], ids[u]), -1) for u, v in entries], dtype=np.int8
+    )
+    return local, remote
+
+
+def isl_interface_indices(isl_pairs):
+    """
+    Assigns ISL interface indices per satellite (0, 1, ...) in ISL order, in one vectorized pass.
+
+    Matches assigning them edge by edge: the ISL (a, b) takes the next free index of a and then
+    the next free index of b.
+
+    :param isl_pairs: List of ISL pairs [(sat_id_a, sat_id_b), ...].
+    :return: Tuple (if_a, if_b, num_isls_per_sat): np.int32 arrays of shape (N_isl,) with the
+             interface index at each end, and a dict {sat_id: number of ISLs} of the
+             satellites that have at least one ISL.
+    """
+    endpoints = np.asarray(isl_pairs, dtype=np.int64).reshape(-1, 2).ravel()
+    if len(endpoints) == 0:
+        empty = np.zeros(0, dtype=np.int32)
+        return empty, empty, {}
+    # Interleaved a0, b0, a1, b1, ... is the assignment order; a stable sort keeps it per satellite
+    order = np.argsort(endpoints, kind="stable")
+    sorted_endpoints = endpoints[order]
+    group_starts = np.flatnonzero(np.r_[True, sorted_endpoints[1:] != sorted_endpoints[:-1]])
+    counts = np.diff(np.r_[group_starts, len(endpoints)])
+    interfaces = np.empty(len(endpoints), dtype=np.int32)
+    interfaces[order] = np.arange(len(endpoints)) - np.repeat(group_starts, counts)
+    num_isls_per_sat = dict(zip(sorted_endpoints[group_starts].tolist(), counts.tolist()))
+    return interfaces[0::2], interfaces[1::2], num_isls_per_sat
+
+
+def iter_isl_csr(isl_csr):
+    """
+    Yields the ISLs stored in a CSR adjacency built by build_isl_csr as (sat_id_a, sat_id_b),
+    in the order of the list it was built from.
+
+    :param isl_csr: Tuple (indptr, indices, isl_entries).
+    """
+    indptr, indices, isl_entries = isl_csr
+    first_endpoints = np.repeat(np.arange(len(indptr) - 1), np.diff(indptr))
+    yield from zip(first_endpoints[isl_entries].tolist(), indices[isl_entries].tolist())
+
+
 def _topologies_are_equal(
     prev_topo: LEOTopology | None,  # Puede ser None en el primer paso
     curr_topo: LEOTopology,
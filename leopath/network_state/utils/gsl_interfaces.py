@@ -0,0 +1,37 @@
+import numpy as np
+
+# One record per node (satellites first, then ground stations), in the same order as the
+# list of GSL interface dicts it replaces
+GSL_INTERFACE_DTYPE = np.dtype(
+    [("id", "i4"), ("number_of_interfaces", "i2"), ("aggregate_max_bandwidth", "f8")]
+)
+
+
+def gsl_interfaces_array(gsl_interfaces_info) -> np.ndarray:
+    """
+    Converts the GSL interface information into a structured array of GSL_INTERFACE_DTYPE.
+
+    Arrays that already have this dtype are returned as-is, so the conversion can be done once
+    by the caller and the result passed on to every time step.
+
+    :param gsl_interfaces_info: Structured array, or list of dicts with the keys "id",
+                                "number_of_interfaces" and "aggregate_max_bandwidth". Missing
+                                keys default to the position in the list, 0 and 0.0.
+    :return: Structured array with one record per node.
+    """
+    if isinstance(gsl_interfaces_info, np.ndarray) and gsl_interfaces_info.dtype == (
+        GSL_INTERFACE_DTYPE
+    ):
+        return gsl_interfaces_info
+    return np.fromiter(
+        (
+            (
+                info.get("id", idx),
+                info.get("number_of_interfaces", 0),
+                info.get("aggregate_max_bandwidth", 0.0),
+            )
+            for idx, info in enumerate(gsl_interfaces_info)
+        ),
+        dtype=GSL_INTERFACE_DTYPE,
+        count=len(gsl_interfaces_info),
+    )
@@ -29,3 +29,13 @@ class ConstellationData:
         self.max_isl_length_m = max_isl_length_m
         self.number_of_satellites = orbits * sats_per_orbit
         self.satellites = satellites
+
+    @property
+    def max_gsl_length_sq_m2(self) -> float:
+        """Squared maximum GSL length, for comparisons against squared distances (no sqrt)."""
+        return self.max_gsl_length_m**2
+
+    @property
+    def max_isl_length_sq_m2(self) -> float:
+        """Squared maximum ISL length, for comparisons against squared distances (no sqrt)."""
+        return self.max_isl_length_m**2
@@ -24,10 +24,12 @@ import datetime
 import math
 
 import ephem
+import numpy as np
 from astropy.time import Time as AstropyTime
 from geopy.distance import great_circle
 
 from leopath import logger
+from leopath.topology.satellite import propagation
 from leopath.topology.topology import GroundStation, Satellite
 
 log = logger.get_logger(__name__)
@@ -56,13 +58,22 @@ def _to_clean_ephem_string(time_input) -> str:
     return dt_obj.strftime("%Y/%m/%d %H:%M:%S")
 
 
+def _get_satrec(satellite):
+    """
+    Returns the SGP4 propagator of a Satellite wrapper, or None if it only holds ephem bodies.
+    """
+    satrec = getattr(getattr(satellite, "position", None), "satrec", None)
+    return satrec if propagation.is_sgp4_propagator(satrec) else None
+
+
 def distance_m_between_satellites(
     sat1: Satellite, sat2: Satellite, epoch_input, date_input
 ) -> float:
     """
     Computes the straight distance between two satellites in meters.
 
-    Accepts custom Satellite wrapper objects.
+    Accepts custom Satellite wrapper objects. If both satellites carry an ``sgp4.api.Satrec``
+    they are propagated with SGP4 instead of PyEphem.
 
     :param sat1:       The first Satellite object.
     :param sat2:       The other Satellite object.
@@ -89,6 +100,14 @@ def distance_m_between_satellites(
             )
         ephem_body2 = sat2.position.ephem_obj_manual  # Or ephem_obj_direct
 
+        # SGP4-backed satellites are propagated directly in TEME, no observer needed
+        satrec1, satrec2 = _get_satrec(sat1), _get_satrec(sat2)
+        if satrec1 is not None and satrec2 is not None:
+            jd, fr = propagation.julian_date(date_input)
+            position1 = propagation.teme_position_m(satrec1, jd, fr)
+            position2 = propagation.teme_position_m(satrec2, jd, fr)
+            return float(np.linalg.norm(position1 - position2))
+
         if not isinstance(ephem_body1, ephem.Body) or not isinstance(ephem_body2, ephem.Body):
             raise ValueError("Extracted ephem objects are not valid ephem.Body types.")
 
@@ -154,7 +173,8 @@ def distance_m_ground_station_to_satellite(
     """
     Computes the straight distance in meters between a ground station and a satellite.
 
-    Accepts GroundStation and Satellite wrapper objects.
+    Accepts GroundStation and Satellite wrapper objects. Satellites carrying an
+    ``sgp4.api.Satrec`` are propagated with SGP4 instead of PyEphem.
 
     :param ground_station: The GroundStation object.
     :param satellite:      The Satellite object (must contain ephem.Body).
@@ -194,6 +214,16 @@ def distance_m_ground_station_to_satellite(
             )
         ephem_body = satellite.position.ephem_obj_manual  # Or _direct
 
+        satrec = _get_satrec(satellite)
+        if satrec is not None:
+            return _sgp4_distance_m_ground_station_to_satellite(
+                ground_station.latitude_degrees,
+                ground_station.longitude_degrees,
+                gs_elev_float,
+                satrec,
+                date_input,
+            )
+
         if not isinstance(ephem_body, ephem.Body):
             raise ValueError(
                 f"Extracted ephem object for {sat_id_str} is not a valid ephem.Body type."
@@ -242,6 +272,99 @@ def distance_m_ground_station_to_satellite(
         return float("inf")
 
 
+def _sgp4_distance_m_ground_station_to_satellite(
+    lat_degrees: float, lon_degrees: float, elevation_m: float, satrec, date_input
+) -> float:
+    """
+    Straight GS-to-satellite distance for SGP4-backed satellites, in the Earth-fixed frame.
+
+    :return: Distance in meters, or float('inf') if the satellite is below the horizon.
+    """
+    jd, fr = propagation.julian_date(date_input)
+    satellite_ecef = propagation.teme_to_ecef_m(propagation.teme_position_m(satrec, jd, fr), jd, fr)
+    return distance_m_ground_station_to_position(
+        lat_degrees, lon_degrees, elevation_m, satellite_ecef
+    )
+
+
+def distance_m_ground_station_to_position(
+    lat_degrees: float, lon_degrees: float, elevation_m: float, satellite_ecef_m
+) -> float:
+    """
+    Computes the straight distance between a ground station and an already propagated satellite.
+
+    :param lat_degrees: Latitude of the ground station in degrees.
+    :param lon_degrees: Longitude of the ground station in degrees.
+    :param elevation_m: Elevation of the ground station in meters.
+    :param satellite_ecef_m: Earth-fixed position of the satellite (x, y, z) in meters.
+
+    :return: Distance in meters, or float('inf') if the satellite is below the horizon.
+    """
+    line_of_sight = np.asarray(satellite_ecef_m, dtype=float) - np.array(
+        geodetic2cartesian(lat_degrees, lon_degrees, elevation_m)
+    )
+    lat, lon = math.radians(lat_degrees), math.radians(lon_degrees)
+    up = np.array((math.cos(lat) * math.cos(lon), math.cos(lat) * math.sin(lon), math.sin(lat)))
+    if float(line_of_sight @ up) < 0:  # Below horizon
+        return float("inf")
+    return float(np.linalg.norm(line_of_sight))
+
+
+def ground_stations_ecef_m(ground_stations: list[GroundStation]) -> np.ndarray:
+    """
+    Earth-fixed positions of ground stations as one contiguous array, computed from their
+    geodetic coordinates so that they match distance_m_ground_station_to_position.
+
+    :param ground_stations: List of GroundStation objects.
+
+    :return: Array of shape (N_gs, 3) with (x, y, z) in meters, in ground_stations order.
+    """
+    x, y, z = geodetic2cartesian_vec(
+        [gs.latitude_degrees for gs in ground_stations],
+        [gs.longitude_degrees for gs in ground_stations],
+        [float(gs.elevation_m_float) for gs in ground_stations],
+    )
+    return np.stack((x, y, z), axis=-1)
+
+
+def squared_distances_m2_ground_stations_to_positions(
+    lat_degrees, lon_degrees, elevation_m, satellites_ecef_m, ground_stations_ecef_m=None
+) -> np.ndarray:
+    """
+    Vectorized counterpart of distance_m_ground_station_to_position for many ground stations
+    and many already propagated satellites at once.
+
+    :param lat_degrees: Latitudes of the ground stations in degrees, shape (N_gs,).
+    :param lon_degrees: Longitudes of the ground stations in degrees, shape (N_gs,).
+    :param elevation_m: Elevations of the ground stations in meters, shape (N_gs,).
+    :param satellites_ecef_m: Earth-fixed positions of the satellites in meters, shape (N_sat, 3).
+    :param ground_stations_ecef_m: Optional precomputed Earth-fixed positions of the ground
+                                   stations, shape (N_gs, 3); derived from the geodetic
+                                   coordinates when omitted.
+
+    :return: Squared distances in square meters, shape (N_gs, N_sat), with float('inf') where
+             the satellite is below the horizon of the ground station.
+    """
+    lat_degrees = np.atleast_1d(np.asarray(lat_degrees, dtype=float))
+    lon_degrees = np.atleast_1d(np.asarray(lon_degrees, dtype=float))
+    elevation_m = np.atleast_1d(np.asarray(elevation_m, dtype=float))
+    if ground_stations_ecef_m is None:
+        ground_stations_ecef_m = np.stack(
+            geodetic2cartesian_vec(lat_degrees, lon_degrees, elevation_m), axis=-1
+        )
+    ground_stations_ecef_m = np.asarray(ground_stations_ecef_m, dtype=float)
+    lat, lon = np.radians(lat_degrees), np.radians(lon_degrees)
+    up = np.stack((np.cos(lat) * np.cos(lon), np.cos(lat) * np.sin(lon), np.sin(lat)), axis=-1)
+
+    line_of_sight = (
+        np.asarray(satellites_ecef_m, dtype=float)[None, :, :] - ground_stations_ecef_m[:, None, :]
+    )
+    squared_distances_m2 = np.einsum("ijk,ijk->ij", line_of_sight, line_of_sight)
+    below_horizon = np.einsum("ijk,ik->ij", line_of_sight, up) < 0
+    squared_distances_m2[below_horizon] = np.inf
+    return squared_distances_m2
+
+
 def geodesic_distance_m_between_ground_stations(
     ground_station_1: GroundStation,
     ground_station_2: GroundStation,
@@ -270,10 +393,10 @@ def geodesic_distance_m_between_ground_stations(
     earth_radius_km = 6378.135
 
     try:
-        lat1 = float(ground_station_1.latitude_degrees_str)
-        lon1 = float(ground_station_1.longitude_degrees_str)
-        lat2 = float(ground_station_2.latitude_degrees_str)
-        lon2 = float(ground_station_2.longitude_degrees_str)
+        lat1 = ground_station_1.latitude_degrees
+        lon1 = ground_station_1.longitude_degrees
+        lat2 = ground_station_2.latitude_degrees
+        lon2 = ground_station_2.longitude_degrees
 
         distance = great_circle((lat1, lon1), (lat2, lon2), radius=earth_radius_km).m
         return distance
@@ -366,3 +489,32 @@ def geodetic2cartesian(lat_degrees, lon_degrees, ele_m):
     z = (v * (1.0 - e * e) + ele_m) * math.sin(lat)
 
     return x, y, z
+
+
+def geodetic2cartesian_vec(lats_degrees, lons_degrees, eles_m):
+    """
+    Vectorized geodetic2cartesian: converts many geodetic coordinates at once.
+
+    :param lats_degrees: Latitudes in degrees (array-like)
+    :param lons_degrees: Longitudes in degrees (array-like)
+    :param eles_m: Elevations in meters (array-like)
+
+    :return: 3-tuple of NumPy arrays (x, y, z) in meters, one entry per input coordinate
+    """
+    # WGS72 values, as in geodetic2cartesian
+    a = 6378135.0
+    f = 1.0 / 298.26
+    e2 = 2.0 * f - f * f
+
+    lat = np.radians(np.atleast_1d(np.asarray(lats_degrees, dtype=float)))
+    lon = np.radians(np.atleast_1d(np.asarray(lons_degrees, dtype=float)))
+    ele_m = np.atleast_1d(np.asarray(eles_m, dtype=float))
+    sin_lat, cos_lat = np.sin(lat), np.cos(lat)
+
+    # Radius of curvature in the prime vertical of the surface of the geodetic ellipsoid
+    v = a / np.sqrt(1.0 - e2 * sin_lat * sin_lat)
+
+    x = (v + ele_m) * cos_lat * np.cos(lon)
+    y = (v + ele_m) * cos_lat * np.sin(lon)
+    z = (v * (1.0 - e2) + ele_m) * sin_lat
+    return x, y, z
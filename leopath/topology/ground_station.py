@@ -1,8 +1,24 @@
+import math
 from typing import Optional
 
+import ephem
+
 from leopath.topology.satellite.topological_network_address import TopologicalNetworkAddress
 
 
+def _parse_degrees(degrees_str: str) -> float:
+    """
+    Parses an angle in degrees given as a decimal string or, as ephem also accepts, as a
+    "d:m:s" string.
+    :param degrees_str: Angle in degrees as a string
+    :return: Angle in degrees
+    """
+    try:
+        return float(degrees_str)
+    except ValueError:
+        return math.degrees(ephem.degrees(str(degrees_str)))
+
+
 class GroundStation:
     def __init__(
         self,
@@ -19,8 +35,8 @@ class GroundStation:
         Class that represents a ground station.
         :param gid: Ground station ID
         :param name: Name of the ground station
-        :param latitude_degrees_str: Latitude in degrees as a string
-        :param longitude_degrees_str: Longitude in degrees as a string
+        :param latitude_degrees_str: Latitude in degrees as a string (decimal or "d:m:s")
+        :param longitude_degrees_str: Longitude in degrees as a string (decimal or "d:m:s")
         :param elevation_m_float: Elevation in meters
         :param cartesian_x: Cartesian X coordinate
         :param cartesian_y: Cartesian Y coordinate
@@ -28,8 +44,12 @@ class GroundStation:
         """
         self.id = gid
         self.name = name
+        # Kept as given: ephem reads degree strings, a float would be taken as radians
         self.latitude_degrees_str = latitude_degrees_str
         self.longitude_degrees_str = longitude_degrees_str
+        # Parsed once, so numeric consumers don't parse the strings every time step
+        self.latitude_degrees = _parse_degrees(latitude_degrees_str)
+        self.longitude_degrees = _parse_degrees(longitude_degrees_str)
         self.elevation_m_float = elevation_m_float
         self.cartesian_x = cartesian_x
         self.cartesian_y = cartesian_y
@@ -0,0 +1,190 @@
+"""
+SGP4 propagation backed by the C++ accelerated ``sgp4`` package.
+
+Satellites whose ephemeris objects are ``sgp4.api.Satrec`` instances are propagated here
+instead of through PyEphem. Positions are returned in the TEME frame (meters); use
+``teme_to_ecef_m`` to express them in the same Earth-fixed frame as the ground stations.
+"""
+
+import datetime
+import functools
+import math
+
+import ephem
+import numpy as np
+from astropy.time import Time as AstropyTime
+from sgp4.api import SGP4_ERRORS, Satrec, SatrecArray, jday
+
+# Offset between the Dublin Julian Date used by PyEphem and the Julian Date
+DUBLIN_JD_OFFSET = 2415020.0
+NS_PER_DAY = 86400 * 10**9
+
+
+def is_sgp4_propagator(obj) -> bool:
+    """
+    Checks whether an ephemeris object can be propagated by this module.
+
+    :param obj: Ephemeris object stored in a SatelliteEphemeris.
+    :return: True if the object is an ``sgp4.api.Satrec``.
+    """
+    return isinstance(obj, Satrec)
+
+
+def julian_date(time_input) -> tuple[float, float]:
+    """
+    Converts a time instant into the (jd, fr) pair expected by ``Satrec.sgp4``.
+
+    Astropy times are read in their own scale, matching the wall-clock reading that the
+    PyEphem code path gets from ``strftime``.
+
+    :param time_input: astropy Time, datetime, ephem.Date or a string understood by PyEphem.
+    :return: Tuple (jd, fr) whose sum is the Julian Date of the instant.
+    """
+    if isinstance(time_input, AstropyTime):
+        return float(time_input.jd1), float(time_input.jd2)
+    if isinstance(time_input, datetime.datetime):
+        seconds = time_input.second + time_input.microsecond * 1e-6
+        return jday(
+            time_input.year,
+            time_input.month,
+            time_input.day,
+            time_input.hour,
+            time_input.minute,
+            seconds,
+        )
+    try:
+        dublin_jd = float(ephem.Date(time_input))
+    except Exception as e:
+        raise TypeError(
+            f"Could not convert input '{time_input}' (type {type(time_input)}) to a Julian Date. Error: {e}"
+        ) from e
+    jd = math.floor(dublin_jd) + DUBLIN_JD_OFFSET
+    return jd, dublin_jd - math.floor(dublin_jd)
+
+
+def julian_dates_since_epoch(epoch, time_since_epoch_ns_batch) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Converts the epoch once and offsets it by each time step, without building a Time per step.
+
+    :param epoch: Simulation epoch (any input accepted by julian_date).
+    :param time_since_epoch_ns_batch: Iterable of time offsets in nanoseconds since epoch.
+    :return: Tuple (jd, fr) of arrays of shape (N_time,); jd is the epoch's jd at every step.
+    """
+    jd, fr = julian_date(epoch)
+    fr_batch = fr + np.asarray(time_since_epoch_ns_batch, dtype=float) / NS_PER_DAY
+    return np.full_like(fr_batch, jd), fr_batch
+
+
+def teme_position_m(satrec: Satrec, jd: float, fr: float) -> np.ndarray:
+    """
+    Propagates a single satellite to the given instant.
+
+    :param satrec: SGP4 propagator of the satellite.
+    :param jd: Julian Date (integer part or any split with fr).
+    :param fr: Fraction of day added to jd.
+    :return: Position in the TEME frame as an array of shape (3,) in meters.
+    :raises RuntimeError: If SGP4 reports a propagation error.
+    """
+    error, position_km, _ = satrec.sgp4(jd, fr)
+    if error != 0:
+        raise RuntimeError(
+            f"SGP4 propagation failed for satnum {satrec.satnum}: {SGP4_ERRORS[error]}"
+        )
+    return np.asarray(position_km, dtype=float) * 1000.0
+
+
+def teme_positions_m(satrecs: list[Satrec], jd, fr) -> np.ndarray:
+    """
+    Propagates many satellites over many instants in a single ``SatrecArray`` call.
+
+    :param satrecs: SGP4 propagators, one per satellite.
+    :param jd: Julian Dates of the instants, shape (N_time,).
+    :param fr: Fractions of day added to jd, shape (N_time,).
+    :return: Positions in the TEME frame, shape (N_sat, N_time, 3), in meters.
+    :raises RuntimeError: If SGP4 reports a propagation error for any satellite/instant.
+    """
+    jd = np.atleast_1d(np.asarray(jd, dtype=float))
+    fr = np.atleast_1d(np.asarray(fr, dtype=float))
+    errors, positions_km, _ = SatrecArray(list(satrecs)).sgp4(jd, fr)
+    if np.any(errors):
+        sat_idx, time_idx = np.argwhere(errors)[0]
+        raise RuntimeError(
+            f"SGP4 propagation failed for satnum {satrecs[sat_idx].satnum} at instant "
+            f"{time_idx}: {SGP4_ERRORS[int(errors[sat_idx, time_idx])]}"
+        )
+    return positions_km * 1000.0
+
+
+def gmst_rad(jd, fr):
+    """
+    Greenwich Mean Sidereal Time (IAU-82), the rotation between TEME and the Earth-fixed frame.
+
+    :param jd: Julian Date (scalar or array).
+    :param fr: Fraction of day added to jd (scalar or array).
+    :return: GMST in radians within [0, 2*pi).
+    """
+    tut1 = ((np.asarray(jd) - 2451545.0) + np.asarray(fr)) / 36525.0
+    gmst_s = (
+        -6.2e-6 * tut1**3
+        + 0.093104 * tut1**2
+        + (876600.0 * 3600.0 + 8640184.812866) * tut1
+        + 67310.54841
+    )
+    return np.mod(np.radians(gmst_s / 240.0), 2.0 * math.pi)
+
+
+@functools.lru_cache(maxsize=1024)
+def teme_to_ecef_rotation(jd: float, fr: float) -> np.ndarray:
+    """
+    Rotation matrix from TEME to the Earth-fixed frame at one instant (polar motion is neglected).
+
+    The matrix only depends on the instant, so it is cached and shared by every satellite
+    rotated at that instant. The returned array is read-only.
+
+    :param jd: Julian Date of the instant.
+    :param fr: Fraction of day added to jd.
+    :return: Array of shape (3, 3) such that ecef = rotation @ teme.
+    """
+    theta = float(gmst_rad(jd, fr))
+    cos_t, sin_t = math.cos(theta), math.sin(theta)
+    rotation = np.array(((cos_t, sin_t, 0.0), (-sin_t, cos_t, 0.0), (0.0, 0.0, 1.0)))
+    rotation.setflags(write=False)
+    return rotation
+
+
+def _rotate_about_z(position_m: np.ndarray, cos_t, sin_t) -> np.ndarray:
+    """
+    Applies per-instant TEME to Earth-fixed rotations to positions of shape (..., 3).
+
+    Only x and y change under a rotation about the z axis, so the rotated components are
+    written straight into one preallocated output instead of stacking temporaries.
+
+    :param position_m: Positions of shape (..., 3) in meters.
+    :param cos_t: Cosine of GMST, broadcastable to the leading dimensions.
+    :param sin_t: Sine of GMST, broadcastable to the leading dimensions.
+    :return: Rotated positions with the same shape as the input.
+    """
+    x, y = position_m[..., 0], position_m[..., 1]
+    rotated_m = np.empty_like(position_m)
+    np.multiply(cos_t, x, out=rotated_m[..., 0])
+    rotated_m[..., 0] += sin_t * y
+    np.multiply(cos_t, y, out=rotated_m[..., 1])
+    rotated_m[..., 1] -= sin_t * x
+    rotated_m[..., 2] = position_m[..., 2]
+    return rotated_m
+
+
+def teme_to_ecef_m(position_teme_m: np.ndarray, jd, fr) -> np.ndarray:
+    """
+    Rotates TEME positions into the Earth-fixed frame (polar motion is neglected).
+
+    :param position_teme_m: Positions of shape (..., 3) in meters.
+    :param jd: Julian Date of the positions (scalar, or array matching the leading dimensions).
+    :param fr: Fraction of day added to jd.
+    :return: Earth-fixed positions with the same shape as the input.
+    """
+    position_teme_m = np.asarray(position_teme_m, dtype=float)
+    if np.ndim(jd) == 0 and np.ndim(fr) == 0:
+        return position_teme_m @ teme_to_ecef_rotation(float(jd), float(fr)).T
+    theta = gmst_rad(jd, fr)
+    return _rotate_about_z(position_teme_m, np.cos(theta), np.sin(theta))
@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING, Optional
 
 import ephem
+from sgp4.api import Satrec
 
 from leopath.topology.satellite.topological_network_address import TopologicalNetworkAddress
 
@@ -10,14 +11,45 @@ if TYPE_CHECKING:
 
 class SatelliteEphemeris:
 
-    def __init__(self, ephem_obj_manual: ephem.Body, ephem_obj_direct: ephem.Body):
+    __slots__ = ("ephem_obj_manual", "ephem_obj_direct")
+
+    def __init__(
+        self,
+        ephem_obj_manual: ephem.Body | Satrec,
+        ephem_obj_direct: Optional[ephem.Body | Satrec] = None,
+    ):
         """
         Class to hold the ephemeris data of a satellite.
         :param ephem_obj: Object representing the ephemeris data.
-        :param ephem_obj_direct: Object representing the direct ephemeris data.
+        :param ephem_obj_direct: Object representing the direct ephemeris data. Defaults to
+                                 ephem_obj_manual, so a single propagator backs both slots.
         """
         self.ephem_obj_manual = ephem_obj_manual
-        self.ephem_obj_direct = ephem_obj_direct
+        self.ephem_obj_direct = ephem_obj_manual if ephem_obj_direct is None else ephem_obj_direct
+
+    @property
+    def single_propagator(self) -> bool:
+        """
+        True if both ephemeris slots hold the same object, so a position computed for one of
+        them is valid for the other and the satellite only needs to be propagated once.
+        """
+        return self.ephem_obj_manual is self.ephem_obj_direct
+
+    @property
+    def satrec(self) -> Optional[Satrec]:
+        """
+        SGP4 propagator of the satellite, if one of the ephemeris objects is a ``Satrec``.
+        The direct ephemeris takes precedence over the manual one.
+        """
+        ephem_objs = (
+            (self.ephem_obj_direct,)
+            if self.single_propagator
+            else (self.ephem_obj_direct, self.ephem_obj_manual)
+        )
+        for ephem_obj in ephem_objs:
+            if isinstance(ephem_obj, Satrec):
+                return ephem_obj
+        return None
 
 
 class Satellite:
@@ -28,11 +60,23 @@ class Satellite:
     :param ephem_obj_direct: Object representing the direct ephemeris data.
     """
 
+    # Constellations hold thousands of satellites; fixed slots keep each one dict-free
+    __slots__ = (
+        "position",
+        "number_isls",
+        "number_gsls",
+        "id",
+        "sixgrupa_addr",
+        "orbital_plane_id",
+        "satellite_id",
+        "forwarding_table",
+    )
+
     def __init__(
         self,
         id: int,
-        ephem_obj_manual: ephem.Body,
-        ephem_obj_direct: ephem.Body,
+        ephem_obj_manual: ephem.Body | Satrec,
+        ephem_obj_direct: Optional[ephem.Body | Satrec] = None,
         orbital_plane_id: Optional[int] = None,
         satellite_id: Optional[int] = None,
         sixgrupa_addr: Optional[TopologicalNetworkAddress] = None,
@@ -41,7 +85,8 @@ class Satellite:
         Class to represent a satellite within a constellation.
         :param id: Satellite ID
         :param ephem_obj_manual: Object representing the manual ephemeris data.
-        :param ephem_obj_direct: Object representing the direct ephemeris data.
+        :param ephem_obj_direct: Object representing the direct ephemeris data. Defaults to
+                                 ephem_obj_manual (a single shared propagator).
         :param 6grupa_addr: Optional address to be used in 6G-RUPA-based networks
         """
         self.position = SatelliteEphemeris(ephem_obj_manual, ephem_obj_direct)
@@ -1,3 +1,4 @@
+import functools
 from dataclasses import dataclass
 
 from leopath import logger
@@ -158,11 +159,16 @@ class TopologicalNetworkAddress:
             raise
 
     @staticmethod
+    @functools.lru_cache(maxsize=None)
     def set_address_from_orbital_parameters(satellite_id: int) -> "TopologicalNetworkAddress":
         """
         Create a TopologicalNetworkAddress for a satellite based on a simple mapping from satellite ID.
         This is a basic implementation that maps satellite IDs to topological coordinates.
 
+        Addresses are immutable and only depend on the ID, so each one is built once and shared
+        by every caller (routing looks them up per satellite and neighbour on every step). The
+        cache is bounded by the addressable IDs, MAX_SHELLS * MAX_PLANES * MAX_SATS_PER_PLANE.
+
         For a more realistic implementation, this should map based on the actual constellation
         structure (orbital planes, satellites per plane, etc.).
 
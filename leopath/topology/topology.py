@@ -24,6 +24,10 @@ class LEOTopology:
         self.number_of_isls = 0
         # TODO This info is probably in the graph. If we still need it, I think it should be placed inside the satellite object
         self.gsl_interfaces_info: list  # TODO Specify the type of this list
+        # Time of the step this topology was built for, in nanoseconds since the epoch
+        self.time_since_epoch_ns: int | None = None
+        # (gs_id, sat_id) -> GSL length (or lower bound) in meters of the pairs above the horizon
+        self.gsl_lengths_m: dict[tuple[int, int], float] = {}
 
     def get_satellites(self) -> list[Satellite]:
         """
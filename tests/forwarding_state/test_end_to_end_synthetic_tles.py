@@ -1,5 +1,9 @@
 import math
+import os
+import pprint
+import tempfile
 import unittest
+from collections.abc import Mapping
 
 from leopath import logger
 from leopath.network_state.generate_network_state import _generate_state_for_step
@@ -30,7 +34,10 @@ class TestEndToEndWithSyntheticTLEs(unittest.TestCase):
         eccentricity = 0.0000001
         arg_of_perigee_degree = 0.0
         mean_motion_rev_per_day = 14.80
-        tle_output_filename = "tles_single_orbit_sgp.txt.tmp"
+        # Written to a per-test temporary directory, removed after the test
+        tle_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tle_dir.cleanup)
+        tle_output_filename = os.path.join(tle_dir.name, "tles_single_orbit_sgp.txt.tmp")
 
         generate_tles_from_scratch_with_sgp(
             tle_output_filename,
@@ -146,8 +153,8 @@ class TestEndToEndWithSyntheticTLEs(unittest.TestCase):
         )
         self.assertIn("fstate", result_state_t0)
         fstate_t0 = result_state_t0["fstate"]
-        print("Generated fstate at t=0 for single orbit:")
-        log.info(fstate_t0)
+        if os.environ.get("LRSIM_DUMP_FSTATE"):
+            pprint.pprint(fstate_t0)
 
         # --- Define Expected State for t=0 ---
         # This section requires careful determination based on the new GS locations
@@ -162,12 +169,8 @@ class TestEndToEndWithSyntheticTLEs(unittest.TestCase):
         # self.assertDictEqual(fstate_t0, expected_fstate_t0_single_orbit, "fstate mismatch for single orbit at t=0")
 
         # For now, a very basic check:
-        self.assertTrue(isinstance(fstate_t0, dict), "fstate_t0 is not a dictionary.")
+        self.assertTrue(isinstance(fstate_t0, Mapping), "fstate_t0 is not a mapping.")
         # Add more specific assertions once you observe the output and determine expected behavior.
         # For example, check if any satellite is connected to London if expected:
         # london_connected_to_any_sat = any(GS_LONDON_ID == key_tuple[0] or GS_LONDON_ID == key_tuple[1] for key_tuple in fstate_t0.keys())
         # self.assertTrue(london_connected_to_any_sat, "London is not connected to any satellite at t=0 as per fstate")
-
-        # --- Cleanup ---
-        # if os.path.exists(tle_output_filename):
-        #     os.remove(tle_output_filename)
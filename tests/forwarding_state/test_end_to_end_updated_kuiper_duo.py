@@ -1,37 +1,93 @@
 # In tests/forwarding_state/test_end_to_end_updated_kuiper_duo.py (or similar file)
 
+import functools
 import math
+import os
 import unittest
+from collections.abc import Mapping
 
-import ephem
-from astropy.time import Time
+import numpy as np
+from astropy import units as u
+from astropy.time import Time, TimeDelta
+from sgp4.api import Satrec
 
-from leopath.network_state.generate_network_state import _generate_state_for_step
+from leopath import logger
+from leopath.network_state.generate_network_state import (
+    _generate_state_for_step,
+    _propagate_satellites,
+)
+from leopath.network_state.utils.graph import build_isl_csr
 from leopath.topology.distance_tools import geodetic2cartesian
 from leopath.topology.topology import ConstellationData, GroundStation, Satellite
 
+log = logger.get_logger(__name__)
+
+GS_MANILA_ID = 12
+GS_DALIAN_ID = 13
+
+# Max lengths (630 km shell, 30 deg cone, 80 km minimum ISL altitude)
+_ALTITUDE_M = 630000
+_EARTH_RADIUS_M = 6378135.0
+_MAX_GSL_LEN_M = math.hypot(_ALTITUDE_M / math.tan(math.radians(30.0)), _ALTITUDE_M)
+_MAX_ISL_LEN_M = 2 * math.sqrt(
+    (_EARTH_RADIUS_M + _ALTITUDE_M) ** 2 - (_EARTH_RADIUS_M + 80000) ** 2
+)
+
+# One GSL interface per node (satellites 0-11, then the two ground stations); read-only
+_GSL_IFACES_INFO = tuple(
+    {"id": node_id, "number_of_interfaces": 1, "aggregate_max_bandwidth": 1.0}
+    for node_id in (*range(12), GS_MANILA_ID, GS_DALIAN_ID)
+)
+
+# Full fstate at t=0: Dalian is served by the first plane group, Manila by the second
+_EXPECTED_FSTATE_T0 = frozenset(
+    {
+        (0, 12): (-1, -1, -1),
+        (0, 13): (3, 1, 0),
+        (1, 12): (-1, -1, -1),
+        (1, 13): (0, 0, 0),
+        (2, 12): (-1, -1, -1),
+        (2, 13): (5, 1, 0),
+        (3, 12): (-1, -1, -1),
+        (3, 13): (2, 1, 0),
+        (4, 12): (-1, -1, -1),
+        (4, 13): (3, 0, 2),
+        (5, 12): (-1, -1, -1),
+        (5, 13): (13, 1, 0),
+        (6, 12): (10, 0, 0),
+        (6, 13): (-1, -1, -1),
+        (7, 12): (11, 0, 0),
+        (7, 13): (-1, -1, -1),
+        (8, 12): (9, 0, 0),
+        (8, 13): (-1, -1, -1),
+        (9, 12): (12, 2, 0),
+        (9, 13): (-1, -1, -1),
+        (10, 12): (9, 1, 1),
+        (10, 13): (-1, -1, -1),
+        (11, 12): (10, 1, 2),
+        (11, 13): (-1, -1, -1),
+        (12, 13): (-1, -1, -1),
+        (13, 12): (-1, -1, -1),
+    }.items()
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _cached_twoline2rv(line1, line2):
+    # Parsed once per process; Satrec.sgp4 does not change the parsed elements
+    return Satrec.twoline2rv(line1, line2)
+
 
 class TestEndToEndRefactored(unittest.TestCase):
 
-    def test_kuiper_path_evolution(self):
+    def setUp(self):
         """
-        Integration test checking state at t=0 and first hop for Manila->Dalian
-        at later time steps, based on the old end-to-end test traces.
+        Builds the Kuiper scenario based on the old end-to-end test traces.
         Uses sequential IDs matching the old test's analysis (Sats 0-11, GS 12=Manila, 13=Dalian).
         """
         # --- Inputs ---
-        epoch = Time("2000-01-01 00:00:00", scale="tdb")  # Match TLE epoch
-        dynamic_state_algorithm = "shortest_path_link_state"
-        prev_output = None  # Check each step independently
-
-        # Max lengths
-        altitude_m = 630000
-        earth_radius = 6378135.0
-        satellite_cone_radius_m = altitude_m / math.tan(math.radians(30.0))
-        max_gsl_length_m = math.sqrt(math.pow(satellite_cone_radius_m, 2) + math.pow(altitude_m, 2))
-        max_isl_length_m = 2 * math.sqrt(
-            math.pow(earth_radius + altitude_m, 2) - math.pow(earth_radius + 80000, 2)
-        )
+        self.epoch = Time("2000-01-01 00:00:00", scale="tdb")  # Match TLE epoch
+        self.dynamic_state_algorithm = "shortest_path_link_state"
 
         # --- Setup Common Data ---
         # TLE Data (12 satellites, IDs 0-11)
@@ -100,9 +156,9 @@ class TestEndToEndRefactored(unittest.TestCase):
         satellites = []
         for sat_id, tle_lines in tle_data.items():
             try:
-                ephem_obj = ephem.readtle(tle_lines[0], tle_lines[1], tle_lines[2])
+                satrec = _cached_twoline2rv(tle_lines[1], tle_lines[2])
                 satellites.append(
-                    Satellite(id=sat_id, ephem_obj_manual=ephem_obj, ephem_obj_direct=ephem_obj)
+                    Satellite(id=sat_id, ephem_obj_manual=satrec, ephem_obj_direct=satrec)
                 )
             except ValueError as e:
                 self.fail(f"Failed to read TLE for sat_id {sat_id}: {e}")
@@ -112,10 +168,8 @@ class TestEndToEndRefactored(unittest.TestCase):
         manila_x, manila_y, manila_z = geodetic2cartesian(manila_lat, manila_lon, manila_elv)
         dalian_lat, dalian_lon, dalian_elv = 38.913811, 121.602322, 0.0
         dalian_x, dalian_y, dalian_z = geodetic2cartesian(dalian_lat, dalian_lon, dalian_elv)
-        GS_MANILA_ID = 12
-        GS_DALIAN_ID = 13
 
-        ground_stations = [
+        self.ground_stations = [
             GroundStation(
                 gid=GS_MANILA_ID,
                 name="Manila",
@@ -137,15 +191,15 @@ class TestEndToEndRefactored(unittest.TestCase):
                 cartesian_z=dalian_z,
             ),
         ]
-        constellation_data = ConstellationData(
+        self.constellation_data = ConstellationData(
             orbits=1,
             sats_per_orbit=len(satellites),
             epoch="00001.00000000",
-            max_gsl_length_m=max_gsl_length_m,
-            max_isl_length_m=max_isl_length_m,
+            max_gsl_length_m=_MAX_GSL_LEN_M,
+            max_isl_length_m=_MAX_ISL_LEN_M,
             satellites=satellites,
         )
-        undirected_isls = [
+        self.undirected_isls = [
             (0, 1),
             (0, 3),
             (2, 3),
@@ -157,85 +211,145 @@ class TestEndToEndRefactored(unittest.TestCase):
             (9, 10),
             (10, 11),
         ]
-        list_gsl_interfaces_info = [
-            {"id": node_id, "number_of_interfaces": 1, "aggregate_max_bandwidth": 1.0}
-            for node_id in list(range(12)) + [GS_MANILA_ID, GS_DALIAN_ID]
-        ]
+        self.isl_csr = build_isl_csr(self.undirected_isls, num_nodes=12)
+        # The topology expects a list; the shared interface dicts are never mutated
+        self.list_gsl_interfaces_info = list(_GSL_IFACES_INFO)
 
-        # --- Execute and Assert for t=0 ---
-        print("\n--- Checking Full State at t=0 ns ---")
-        result_state_t0, _ = _generate_state_for_step(
-            epoch=epoch,
-            time_since_epoch_ns=0,
-            constellation_data=constellation_data,
-            ground_stations=ground_stations,
-            undirected_isls=undirected_isls,
-            list_gsl_interfaces_info=list_gsl_interfaces_info,
-            dynamic_state_algorithm=dynamic_state_algorithm,
-            prev_output=None,
-            prev_topology=None,  # Added missing argument
+    def _propagate(self, step_times_ns):
+        """Propagates all satellites at once for every step; returns (times, positions)."""
+        satellite_positions_m = _propagate_satellites(
+            self.epoch, step_times_ns, self.constellation_data
+        )
+        times_absolute = self.epoch + TimeDelta(np.array(step_times_ns, dtype=float) * u.ns)
+        return times_absolute, satellite_positions_m
+
+    def _generate_state_at(
+        self,
+        step_idx,
+        time_since_epoch_ns,
+        times_absolute,
+        satellite_positions_m,
+        prev_output,
+        query_pairs=None,
+    ):
+        return _generate_state_for_step(
+            epoch=self.epoch,
+            time_since_epoch_ns=time_since_epoch_ns,
+            constellation_data=self.constellation_data,
+            ground_stations=self.ground_stations,
+            undirected_isls=self.undirected_isls,
+            list_gsl_interfaces_info=self.list_gsl_interfaces_info,
+            dynamic_state_algorithm=self.dynamic_state_algorithm,
+            prev_output=prev_output,
+            prev_topology=None,
+            time_absolute=times_absolute[step_idx],
+            satellite_positions_m=satellite_positions_m[:, step_idx, :],
+            query_pairs=query_pairs,
+            isl_csr=self.isl_csr,
+        )
+
+    def test_kuiper_path_evolution_smoke(self):
+        """
+        Smoke check for fast CI runs: only t=0 is generated and the fstate must not be empty.
+        """
+        times_absolute, satellite_positions_m = self._propagate([0])
+        result_state_t0, _ = self._generate_state_at(
+            0, 0, times_absolute, satellite_positions_m, prev_output=None
+        )
+
+        self.assertIsNotNone(result_state_t0, "_generate_state_for_step returned None at t=0")
+        self.assertIn("fstate", result_state_t0)
+        self.assertGreater(len(result_state_t0["fstate"]), 0, "Empty fstate at t=0")
+
+    @unittest.skipUnless(os.environ.get("LRSIM_FAST_TESTS") != "1", "strict mode")
+    def test_kuiper_path_evolution_strict(self):
+        """
+        Integration test checking state at t=0 and first hop for Manila->Dalian
+        at later time steps, based on the old end-to-end test traces.
+        Skipped when LRSIM_FAST_TESTS=1 (the smoke test covers t=0 only).
+        """
+        prev_output = None  # Check each step independently
+
+        # Later time steps checked after t=0, with the expected Manila->Dalian first hop at each
+        # (no route at 74.3 s); all satellites are propagated at once for every step
+        test_times = [18 * 10**9, 27.6 * 10**9, 74.3 * 10**9]
+        expected_manila_dalian = [(1, 0, 1), (1, 0, 1), (-1, -1, -1)]
+        step_times_ns = [0] + [int(time_ns) for time_ns in test_times]
+        times_absolute, satellite_positions_m = self._propagate(step_times_ns)
+        self.assertEqual(
+            satellite_positions_m.shape,
+            (self.constellation_data.number_of_satellites, len(test_times) + 1, 3),
         )
 
+        # --- Execute and Assert for t=0 ---
+        log.debug("--- Checking Full State at t=0 ns ---")
+        result_state_t0, _ = self._generate_state_at(
+            0, 0, times_absolute, satellite_positions_m, prev_output=None
+        )
         self.assertIsNotNone(result_state_t0, "_generate_state_for_step returned None at t=0")
         self.assertIn("fstate", result_state_t0)
         self.assertIn("bandwidth", result_state_t0)
         fstate_t0 = result_state_t0["fstate"]
 
-        # For the new single-attachment GSL system, we focus on basic functionality
-        # rather than specific route expectations which have changed.
-        # The key test is that the system generates a valid state without errors.
+        # Routes differ from the old end-to-end traces under the single-attachment GSL system;
+        # the t=0 state is pinned against the snapshot produced by the current system.
 
-        print(f"Valid routes at t=0: {len([v for v in fstate_t0.values() if v != (-1, -1, -1)])}")
-        print(
-            f"Routes that found paths: {[(k, v) for k, v in fstate_t0.items() if v != (-1, -1, -1)]}"
-        )
+        valid_routes_t0 = {k: v for k, v in fstate_t0.items() if v != (-1, -1, -1)}
+        self.assertGreater(len(valid_routes_t0), 0, "No valid routes found at t=0")
+        # Single hash-based pass instead of assertDictEqual's sorted diff
+        self.assertEqual(frozenset(fstate_t0.items()), _EXPECTED_FSTATE_T0)
+        log.debug("Valid routes at t=0: %d", len(valid_routes_t0))
+        log.debug("Routes that found paths: %s", valid_routes_t0)
 
         # --- Simplified tests for later time steps ---
-        # Focus on system stability rather than specific routing outcomes
-        test_times = [18 * 10**9, 27.6 * 10**9, 74.3 * 10**9]
-
-        for time_ns in test_times:
-            time_since_epoch_ns_int = int(time_ns)
-            print(f"\n--- Testing system stability at t={time_since_epoch_ns_int} ns ---")
-
-            result_state, _ = _generate_state_for_step(
-                epoch=epoch,
-                time_since_epoch_ns=time_since_epoch_ns_int,
-                constellation_data=constellation_data,
-                ground_stations=ground_stations,
-                undirected_isls=undirected_isls,
-                list_gsl_interfaces_info=list_gsl_interfaces_info,
-                dynamic_state_algorithm=dynamic_state_algorithm,
+        # Only the Manila->Dalian first hop is checked, so only that pair is queried (A*)
+        later_results = [
+            self._generate_state_at(
+                step_idx,
+                int(time_ns),
+                times_absolute,
+                satellite_positions_m,
                 prev_output=prev_output,
-                prev_topology=None,
+                query_pairs=[(GS_MANILA_ID, GS_DALIAN_ID)],
             )
+            for step_idx, time_ns in enumerate(test_times, start=1)
+        ]
+
+        for time_ns, expected_route, (result_state, _) in zip(
+            test_times, expected_manila_dalian, later_results
+        ):
+            log.debug("--- Testing system stability at t=%d ns ---", int(time_ns))
 
             # Test basic functionality: state generation should succeed
             self.assertIsNotNone(result_state, f"State generation failed at t={time_ns}")
             self.assertIn("fstate", result_state)
             self.assertIn("bandwidth", result_state)
-            self.assertIsInstance(result_state["fstate"], dict)
+            self.assertIsInstance(result_state["fstate"], Mapping)
             self.assertIsInstance(result_state["bandwidth"], dict)
 
-            # Test that some routes are computed (system is functional)
+            # Only the queried pair is resolved, to the expected first hop
             fstate = result_state["fstate"]
-            valid_routes = {k: v for k, v in fstate.items() if v != (-1, -1, -1)}
-            self.assertGreater(len(valid_routes), 0, f"No valid routes found at t={time_ns}")
-
-            print(f"  Valid routes: {len(valid_routes)}")
-            print(f"  Total routes: {len(fstate)}")
-
-            # Check that the Manila-Dalian route exists (if it should)
-            manila_dalian_route = fstate.get((GS_MANILA_ID, GS_DALIAN_ID))
-            if manila_dalian_route and manila_dalian_route != (-1, -1, -1):
-                print(f"  Manila->Dalian route: {manila_dalian_route}")
-            else:
-                print(
-                    "  Manila->Dalian route: No path found (expected in single-attachment system)"
-                )
+            self.assertEqual(set(fstate.keys()), {(GS_MANILA_ID, GS_DALIAN_ID)})
+            self.assertEqual(
+                fstate[(GS_MANILA_ID, GS_DALIAN_ID)],
+                expected_route,
+                f"Unexpected Manila->Dalian first hop at t={time_ns}",
+            )
+
+        # The full state at the last step still routes, and agrees with the pair query there
+        last_step = len(test_times)
+        result_state_last, _ = self._generate_state_at(
+            last_step, int(test_times[-1]), times_absolute, satellite_positions_m, prev_output=None
+        )
+        fstate_last = result_state_last["fstate"]
+        valid_routes = {k: v for k, v in fstate_last.items() if v != (-1, -1, -1)}
+        self.assertGreater(len(valid_routes), 0, f"No valid routes found at t={test_times[-1]}")
+        self.assertEqual(
+            fstate_last[(GS_MANILA_ID, GS_DALIAN_ID)],
+            later_results[-1][0]["fstate"][(GS_MANILA_ID, GS_DALIAN_ID)],
+        )
 
-        print("\n=== End-to-end test completed successfully ===")
-        print("The new single-attachment GSL system is working correctly.")
+        log.debug("=== End-to-end test completed successfully ===")
 
 
 # Add main block if running directly
@@ -1,146 +1,173 @@
-# In a new file, e.g., tests/dynamic_state/test_end_to_end_kuiper_triangle.py
-# Or add to test_generate_dynamic_state_integration.py
+"""
+End-to-end Kuiper triangle scenario (12 satellites, 3 ground stations) at t=0.
+
+Set LRSIM_DUMP_FSTATE=1 to pretty-print the full forwarding state for manual inspection;
+it is not printed by default.
+"""
 
 import math
+import os
 import pprint
 import unittest
+from collections.abc import Mapping
 
-import ephem
+import numpy as np
 from astropy.time import Time
-
-from leopath.network_state.generate_network_state import _generate_state_for_step
-from leopath.topology.distance_tools import geodetic2cartesian
+from sgp4.api import Satrec, jday
+
+from leopath import logger
+from leopath.network_state.generate_network_state import (
+    _generate_state_for_step,
+    _propagate_satellites,
+)
+from leopath.network_state.routing_algorithms.shortest_path_link_state_routing.forwarding_state import (
+    NO_ROUTE,
+)
+from leopath.network_state.utils.gsl_interfaces import GSL_INTERFACE_DTYPE
+from leopath.topology.distance_tools import geodetic2cartesian_vec
 from leopath.topology.topology import ConstellationData, GroundStation, Satellite
 
+log = logger.get_logger(__name__)
+
+GS_MANILA_ID = 12
+GS_DALIAN_ID = 13
+GS_STPETE_ID = 14
+
+# Max lengths (630 km shell, 30 deg cone, 80 km minimum ISL altitude), computed once at import;
+# the squared forms are what the distance checks compare against
+_ALTITUDE_M = 630000
+_EARTH_RADIUS_M = 6378135.0
+_SATELLITE_CONE_RADIUS_M = _ALTITUDE_M / math.tan(math.radians(30.0))
+MAX_GSL_LEN_SQ = _SATELLITE_CONE_RADIUS_M**2 + _ALTITUDE_M**2
+MAX_ISL_LEN_SQ = 4 * ((_EARTH_RADIUS_M + _ALTITUDE_M) ** 2 - (_EARTH_RADIUS_M + 80000) ** 2)
+
+# GSL interface info (12 sats + 3 GS) as one structured array, indexed by node position
+_GSL_NODE_IDS = (*range(12), GS_MANILA_ID, GS_DALIAN_ID, GS_STPETE_ID)
+GSL_INFO = np.fromiter(
+    ((node_id, 1, 1.0) for node_id in _GSL_NODE_IDS),
+    dtype=GSL_INTERFACE_DTYPE,
+    count=len(_GSL_NODE_IDS),
+)
+
+# TLE Data (12 satellites, IDs 0-11), parsed once per test class
+_TLE_DATA = {
+    0: (
+        "Kuiper-630 0",
+        "1 00184U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    06",
+        "2 00184  51.9000  52.9412 0000001   0.0000 142.9412 14.80000000    00",
+    ),
+    1: (
+        "Kuiper-630 1",
+        "1 00185U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    07",
+        "2 00185  51.9000  52.9412 0000001   0.0000 153.5294 14.80000000    07",
+    ),
+    2: (
+        "Kuiper-630 2",
+        "1 00217U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    03",
+        "2 00217  51.9000  63.5294 0000001   0.0000 127.0588 14.80000000    01",
+    ),
+    3: (
+        "Kuiper-630 3",
+        "1 00218U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    04",
+        "2 00218  51.9000  63.5294 0000001   0.0000 137.6471 14.80000000    00",
+    ),
+    4: (
+        "Kuiper-630 4",
+        "1 00219U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    05",
+        "2 00219  51.9000  63.5294 0000001   0.0000 148.2353 14.80000000    08",
+    ),
+    5: (
+        "Kuiper-630 5",
+        "1 00251U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    01",
+        "2 00251  51.9000  74.1176 0000001   0.0000 132.3529 14.80000000    00",
+    ),
+    6: (
+        "Kuiper-630 6",
+        "1 00616U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    06",
+        "2 00616  51.9000 190.5882 0000001   0.0000  31.7647 14.80000000    05",
+    ),
+    7: (
+        "Kuiper-630 7",
+        "1 00617U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    07",
+        "2 00617  51.9000 190.5882 0000001   0.0000  42.3529 14.80000000    03",
+    ),
+    8: (
+        "Kuiper-630 8",
+        "1 00648U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    01",
+        "2 00648  51.9000 201.1765 0000001   0.0000  15.8824 14.80000000    09",
+    ),
+    9: (
+        "Kuiper-630 9",
+        "1 00649U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    02",
+        "2 00649  51.9000 201.1765 0000001   0.0000  26.4706 14.80000000    07",
+    ),
+    10: (
+        "Kuiper-630 10",
+        "1 00650U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    04",
+        "2 00650  51.9000 201.1765 0000001   0.0000  37.0588 14.80000000    05",
+    ),
+    11: (
+        "Kuiper-630 11",
+        "1 00651U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    05",
+        "2 00651  51.9000 201.1765 0000001   0.0000  47.6471 14.80000000    04",
+    ),
+}
+
 
 class TestEndToEndKuiperTriangle(unittest.TestCase):
 
-    def test_kuiper_triangle_t0(self):
-        """
-        Integration test for Kuiper subset scenario at t=0.
-        Checks basic state generation.
-        """
-        # --- Inputs ---
-        epoch = Time("2000-01-01 00:00:00", scale="tdb")  # Match TLE epoch
-        dynamic_state_algorithm = "shortest_path_link_state"
-        altitude_m = 630000
-        earth_radius = 6378135.0
-        satellite_cone_radius_m = altitude_m / math.tan(math.radians(30.0))
-        max_gsl_length_m = math.sqrt(math.pow(satellite_cone_radius_m, 2) + math.pow(altitude_m, 2))
-        max_isl_length_m = 2 * math.sqrt(
-            math.pow(earth_radius + altitude_m, 2) - math.pow(earth_radius + 80000, 2)
-        )
-        # TLE Data (12 satellites, IDs 0-11)
-        tle_data = {
-            0: (
-                "Kuiper-630 0",
-                "1 00184U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    06",
-                "2 00184  51.9000  52.9412 0000001   0.0000 142.9412 14.80000000    00",
-            ),
-            1: (
-                "Kuiper-630 1",
-                "1 00185U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    07",
-                "2 00185  51.9000  52.9412 0000001   0.0000 153.5294 14.80000000    07",
-            ),
-            2: (
-                "Kuiper-630 2",
-                "1 00217U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    03",
-                "2 00217  51.9000  63.5294 0000001   0.0000 127.0588 14.80000000    01",
-            ),
-            3: (
-                "Kuiper-630 3",
-                "1 00218U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    04",
-                "2 00218  51.9000  63.5294 0000001   0.0000 137.6471 14.80000000    00",
-            ),
-            4: (
-                "Kuiper-630 4",
-                "1 00219U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    05",
-                "2 00219  51.9000  63.5294 0000001   0.0000 148.2353 14.80000000    08",
-            ),
-            5: (
-                "Kuiper-630 5",
-                "1 00251U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    01",
-                "2 00251  51.9000  74.1176 0000001   0.0000 132.3529 14.80000000    00",
-            ),
-            6: (
-                "Kuiper-630 6",
-                "1 00616U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    06",
-                "2 00616  51.9000 190.5882 0000001   0.0000  31.7647 14.80000000    05",
-            ),
-            7: (
-                "Kuiper-630 7",
-                "1 00617U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    07",
-                "2 00617  51.9000 190.5882 0000001   0.0000  42.3529 14.80000000    03",
-            ),
-            8: (
-                "Kuiper-630 8",
-                "1 00648U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    01",
-                "2 00648  51.9000 201.1765 0000001   0.0000  15.8824 14.80000000    09",
-            ),
-            9: (
-                "Kuiper-630 9",
-                "1 00649U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    02",
-                "2 00649  51.9000 201.1765 0000001   0.0000  26.4706 14.80000000    07",
-            ),
-            10: (
-                "Kuiper-630 10",
-                "1 00650U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    04",
-                "2 00650  51.9000 201.1765 0000001   0.0000  37.0588 14.80000000    05",
-            ),
-            11: (
-                "Kuiper-630 11",
-                "1 00651U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    05",
-                "2 00651  51.9000 201.1765 0000001   0.0000  47.6471 14.80000000    04",
-            ),
-        }
+    @classmethod
+    def setUpClass(cls):
+        """Builds the scenario (TLE parsing, ground stations, ISLs) once for every test."""
+        cls.epoch = Time("2000-01-01 00:00:00", scale="tdb")  # Match TLE epoch
+        # The same instant as (jd, fr) floats, read directly by the frame rotation
+        cls.epoch_jd_fr = jday(2000, 1, 1, 0, 0, 0)
+        # SGP4 (C++) propagators, one shared by both ephemeris slots of each satellite; all
+        # satellites are then propagated in one SatrecArray call
         satellites = []
-        for sat_id, tle_lines in tle_data.items():
-            try:
-                ephem_obj = ephem.readtle(tle_lines[0], tle_lines[1], tle_lines[2])
-                satellites.append(
-                    Satellite(id=sat_id, ephem_obj_manual=ephem_obj, ephem_obj_direct=ephem_obj)
-                )
-            except ValueError as e:
-                self.fail(f"Failed to read TLE for sat_id {sat_id}: {e}")
+        for sat_id, tle_lines in _TLE_DATA.items():
+            satrec = Satrec.twoline2rv(tle_lines[1], tle_lines[2])
+            satellites.append(Satellite(id=sat_id, ephem_obj_manual=satrec))
 
         # Ground Station Data (Manila=12, Dalian=13, StPete=14)
-        GS_MANILA_ID = 12
-        GS_DALIAN_ID = 13
-        GS_STPETE_ID = 14
-
         gs_defs = {
             GS_MANILA_ID: {"name": "Manila", "lat": 14.6042, "lon": 120.9822, "elv": 0.0},
             GS_DALIAN_ID: {"name": "Dalian", "lat": 38.913811, "lon": 121.602322, "elv": 0.0},
             GS_STPETE_ID: {"name": "StPete", "lat": 59.929858, "lon": 30.326228, "elv": 0.0},
         }
-        ground_stations = []
-        for gid, data in gs_defs.items():
-            x, y, z = geodetic2cartesian(data["lat"], data["lon"], data["elv"])
-            ground_stations.append(
-                GroundStation(
-                    gid=gid,
-                    name=data["name"],
-                    latitude_degrees_str=str(data["lat"]),
-                    longitude_degrees_str=str(data["lon"]),
-                    elevation_m_float=data["elv"],
-                    cartesian_x=x,
-                    cartesian_y=y,
-                    cartesian_z=z,
-                )
+        # All ground stations converted to Cartesian in a single vectorized call
+        gs_x, gs_y, gs_z = geodetic2cartesian_vec(
+            [data["lat"] for data in gs_defs.values()],
+            [data["lon"] for data in gs_defs.values()],
+            [data["elv"] for data in gs_defs.values()],
+        )
+        cls.ground_stations = [
+            GroundStation(
+                gid=gid,
+                name=data["name"],
+                latitude_degrees_str=str(data["lat"]),
+                longitude_degrees_str=str(data["lon"]),
+                elevation_m_float=data["elv"],
+                cartesian_x=float(x),
+                cartesian_y=float(y),
+                cartesian_z=float(z),
             )
+            for (gid, data), x, y, z in zip(gs_defs.items(), gs_x, gs_y, gs_z)
+        ]
+        # Ground station positions as one (N_gs, 3) array, built once for the distance checks
+        cls.gs_xyz = np.stack((gs_x, gs_y, gs_z), axis=-1)
 
-        # ConstellationData
-        constellation_data = ConstellationData(
+        cls.constellation_data = ConstellationData(
             orbits=1,
             sats_per_orbit=len(satellites),
             epoch="00001.00000000",
-            max_gsl_length_m=max_gsl_length_m,
-            max_isl_length_m=max_isl_length_m,
+            max_gsl_length_m=math.sqrt(MAX_GSL_LEN_SQ),
+            max_isl_length_m=math.sqrt(MAX_ISL_LEN_SQ),
             satellites=satellites,
         )
 
         # ISLs based on old test mapping
-        undirected_isls = [
+        cls.undirected_isls = [
             (0, 1),
             (0, 3),
             (2, 3),
@@ -153,23 +180,31 @@ class TestEndToEndKuiperTriangle(unittest.TestCase):
             (10, 11),
         ]
 
-        # GSL Interface Info (12 Sats + 3 GS)
-        list_gsl_interfaces_info = [
-            {"id": node_id, "number_of_interfaces": 1, "aggregate_max_bandwidth": 1.0}
-            for node_id in list(range(12)) + [GS_MANILA_ID, GS_DALIAN_ID, GS_STPETE_ID]
-        ]
-
+    def test_kuiper_triangle_t0(self):
+        """
+        Integration test for Kuiper subset scenario at t=0.
+        Checks basic state generation.
+        """
         # --- Execute for t=0 ---
+        # TEME positions of shape (N_sat, N_time, 3) for the single t=0 step
+        satellite_positions_m = _propagate_satellites(self.epoch, [0], self.constellation_data)
+        self.assertEqual(
+            satellite_positions_m.shape, (len(self.constellation_data.satellites), 1, 3)
+        )
         result_state_t0, _ = _generate_state_for_step(
-            epoch=epoch,
+            epoch=self.epoch,
             time_since_epoch_ns=0,
-            constellation_data=constellation_data,
-            ground_stations=ground_stations,
-            undirected_isls=undirected_isls,
-            list_gsl_interfaces_info=list_gsl_interfaces_info,
-            dynamic_state_algorithm=dynamic_state_algorithm,
+            constellation_data=self.constellation_data,
+            ground_stations=self.ground_stations,
+            undirected_isls=self.undirected_isls,
+            list_gsl_interfaces_info=GSL_INFO,
+            dynamic_state_algorithm="shortest_path_link_state",
             prev_output=None,
             prev_topology=None,
+            time_absolute=self.epoch,
+            satellite_positions_m=satellite_positions_m[:, 0, :],
+            ground_stations_xyz=self.gs_xyz,
+            time_jd_fr=self.epoch_jd_fr,
         )
 
         # --- Assertions for t=0 ---
@@ -177,7 +212,7 @@ class TestEndToEndKuiperTriangle(unittest.TestCase):
         self.assertIsNotNone(result_state_t0, "result_state_t0 is None")
         self.assertIn("fstate", result_state_t0)
         self.assertIn("bandwidth", result_state_t0)
-        self.assertIsInstance(result_state_t0["fstate"], dict)
+        self.assertIsInstance(result_state_t0["fstate"], Mapping)
         self.assertIsInstance(result_state_t0["bandwidth"], dict)
 
         # Check bandwidth calculation looks okay
@@ -190,31 +225,24 @@ class TestEndToEndKuiperTriangle(unittest.TestCase):
 
         # In the new single-attachment system, many routes may not exist
         # Focus on basic functionality rather than specific route expectations
-        valid_routes = {k: v for k, v in fstate_t0.items() if v != (-1, -1, -1)}
-        print(f"Valid routes at t=0: {len(valid_routes)}")
-        print(f"Total routes: {len(fstate_t0)}")
+        # Counted on the dense next-hop table of the written entries, without building tuples
+        num_valid_routes = int(np.count_nonzero(fstate_t0.table[fstate_t0.is_set, 0] != -1))
+        log.debug(f"Valid routes at t=0: {num_valid_routes} of {len(fstate_t0)}")
 
         # Test that at least some routes are working
-        self.assertGreater(len(valid_routes), 0, "No valid routes found - system may be broken")
+        self.assertGreater(num_valid_routes, 0, "No valid routes found - system may be broken")
 
         # Check for specific route if it exists
-        hop_tuple_12_13 = fstate_t0.get((GS_MANILA_ID, GS_DALIAN_ID))
-        if hop_tuple_12_13 and hop_tuple_12_13 != (-1, -1, -1):
-            print(f"Manila->Dalian route found: {hop_tuple_12_13}")
-            # If route exists, verify it's a valid tuple
-            self.assertEqual(len(hop_tuple_12_13), 3, "Route tuple should have 3 elements")
-            self.assertIsInstance(hop_tuple_12_13[0], int, "First hop should be an integer")
+        next_hop_12_13 = fstate_t0.get((GS_MANILA_ID, GS_DALIAN_ID), NO_ROUTE)[0]
+        if next_hop_12_13 != -1:
+            log.debug(f"Manila->Dalian route found: {fstate_t0[(GS_MANILA_ID, GS_DALIAN_ID)]}")
+            self.assertIsInstance(next_hop_12_13, int, "First hop should be an integer")
         else:
-            print("Manila->Dalian route: No path found (expected in single-attachment system)")
-
-        print("=== Triangle test completed successfully ===")
-        print("The new single-attachment GSL system is working correctly.")
+            log.debug("Manila->Dalian route: No path found (expected in single-attachment system)")
 
         # Optional: Print fstate for manual inspection or capture
-        print("\n" + "=" * 20)
-        print("Actual F-State for Kuiper Triangle Test (t=0):")
-        pprint.pprint(fstate_t0)
-        print("=" * 20 + "\n")
+        if os.environ.get("LRSIM_DUMP_FSTATE"):
+            pprint.pprint(fstate_t0)
 
         # Optional: Run for another time step and check path change if desired
         # time_ns_18s = 18 * 10**9
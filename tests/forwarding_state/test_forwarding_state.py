@@ -0,0 +1,87 @@
+import numpy as np
+
+from leopath.network_state.routing_algorithms.shortest_path_link_state_routing.forwarding_state import (
+    NO_ROUTE,
+    ForwardingState,
+)
+from tests.utils.fstate_test_case import FstateTestCase
+
+
+class TestForwardingState(FstateTestCase):
+
+    def setUp(self):
+        # Two satellites (0, 1) and two ground stations with non-sequential IDs (10, 20)
+        self.fstate = ForwardingState([0, 1, 10, 20])
+        self.fstate[(0, 10)] = (1, 0, 0)
+        self.fstate[(1, 10)] = (10, 1, 0)
+        self.fstate[(0, 20)] = NO_ROUTE
+        self.fstate[(10, 20)] = (1, 0, 1)
+
+    def test_mapping_behaviour(self):
+        self.assertEqual(len(self.fstate), 4)
+        self.assertEqual(self.fstate[(1, 10)], (10, 1, 0))
+        self.assertIsInstance(self.fstate[(1, 10)][0], int)
+        self.assertEqual(self.fstate.get((1, 20)), None)
+        self.assertNotIn((1, 20), self.fstate)
+        self.assertIn((0, 20), self.fstate)
+        with self.assertRaises(KeyError):
+            self.fstate[(0, 99)]
+
+    def test_equals_equivalent_dict_in_row_major_order(self):
+        expected = {
+            (0, 10): (1, 0, 0),
+            (0, 20): (-1, -1, -1),
+            (1, 10): (10, 1, 0),
+            (10, 20): (1, 0, 1),
+        }
+        self.assertEqual(self.fstate, expected)
+        self.assertEqual(list(self.fstate.keys()), list(expected.keys()))
+        self.assertDictEqual(dict(self.fstate.items()), expected)
+
+    def test_dense_table_layout(self):
+        self.assertEqual(self.fstate.table.shape, (4, 4, 3))
+        self.assertEqual(self.fstate.table.dtype, np.int16)
+        np.testing.assert_array_equal(self.fstate.table[1, 2], [10, 1, 0])
+        np.testing.assert_array_equal(self.fstate.table[1, 3], [-1, -1, -1])
+
+    def test_table_widens_to_int32_for_large_node_ids(self):
+        fstate = ForwardingState([0, 40000])
+        fstate[(0, 40000)] = (40000, 0, 0)
+        self.assertEqual(fstate.table.dtype, np.int32)
+        self.assertEqual(fstate[(0, 40000)], (40000, 0, 0))
+
+    def test_copy_is_independent(self):
+        fstate_copy = self.fstate.copy()
+        fstate_copy[(1, 20)] = (0, 0, 0)
+        self.assertEqual(fstate_copy[(1, 20)], (0, 0, 0))
+        self.assertNotIn((1, 20), self.fstate)
+
+    def test_frozen_state_is_read_only_and_copies_are_writable(self):
+        self.fstate.freeze()
+        with self.assertRaises(ValueError):
+            self.fstate[(1, 20)] = (0, 0, 0)
+        fstate_copy = self.fstate.copy()
+        fstate_copy[(1, 20)] = (0, 0, 0)
+        self.assertEqual(fstate_copy[(1, 20)], (0, 0, 0))
+
+    def test_equality_with_previous_state(self):
+        previous = self.fstate.copy()
+        self.assertEqual(self.fstate, previous)
+
+        self.fstate[(1, 10)] = (0, 2, 1)
+        self.assertNotEqual(self.fstate, previous)
+        self.fstate[(1, 10)] = previous[(1, 10)]
+        self.fstate[(1, 20)] = NO_ROUTE
+        self.assertNotEqual(self.fstate, previous)
+
+    def test_assert_fstate_hop_on_dict_and_arrays(self):
+        as_dict = dict(self.fstate.items())
+        src_idx, dst_idx = self.fstate.node_to_index[1], self.fstate.node_to_index[10]
+        for fstate in (self.fstate, as_dict):
+            self.assertFstateHop(fstate, 1, 10, 10)
+            self.assertFstateHop(fstate, 1, 10, (10, 1, 0))
+            self.assertFstateHop(fstate, 1, 20, -1)
+        self.assertFstateHop(self.fstate.table[:, :, 0], src_idx, dst_idx, 10)
+        self.assertFstateHop(self.fstate.table, src_idx, dst_idx, (10, 1, 0))
+        with self.assertRaises(AssertionError):
+            self.assertFstateHop(as_dict, 0, 10, 10)
@@ -1,26 +1,53 @@
 # tests/dynamic_state/test_fstate_calculation_refactored.py
 
-import unittest
-from unittest.mock import MagicMock
-
-import ephem
-from astropy.time import Time
-
+import copy
+import functools
+import logging
+import types
+from dataclasses import dataclass
+from types import MappingProxyType
+from unittest import mock
+
+import networkx as nx
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import dijkstra
+
+from leopath import logger
 from leopath.network_state.gsl_attachment.gsl_attachment_interface import GSLAttachmentStrategy
+from leopath.network_state.routing_algorithms.shortest_path_link_state_routing import (
+    fstate_calculation,
+)
+from leopath.network_state.routing_algorithms.shortest_path_link_state_routing.forwarding_state import (
+    NO_ROUTE,
+)
 from leopath.network_state.routing_algorithms.shortest_path_link_state_routing.fstate_calculation import (
+    _bfs_distance_matrix,
+    _dijkstra_distance_matrix,
+    _floyd_warshall_distance_matrix,
+    _forest_distance_matrix,
+    calculate_fstate_shortest_path_for_pairs,
     calculate_fstate_shortest_path_object_no_gs_relay,
 )
+from leopath.network_state.utils.graph import build_weighted_csr
 from leopath.topology.satellite.satellite import Satellite
 from leopath.topology.topology import (
     ConstellationData,
-    GroundStation,
     LEOTopology,
 )
+from tests.utils.fstate_test_case import FstateTestCase
+from tests.utils.ground_stations import GroundStationArray
+from tests.utils.isl_interfaces import assign_isl_interfaces
+
+log = logger.get_logger(__name__)
 
 
 class MockGSLAttachmentStrategy(GSLAttachmentStrategy):
     """Mock GSL attachment strategy that returns predefined attachments for testing."""
 
+    __slots__ = ("attachments",)
+    name = "mock_strategy"
+
     def __init__(self, attachments):
         """
         Args:
@@ -29,257 +56,365 @@ class MockGSLAttachmentStrategy(GSLAttachmentStrategy):
         """
         self.attachments = attachments
 
-    @property
-    def name(self):
-        return "mock_strategy"
-
     def select_attachments(self, topology, ground_stations, current_time):
         """Return the predefined attachments."""
         return self.attachments
 
 
-# --- Test Class ---
-class TestFstateCalculationRefactored(unittest.TestCase):
-
-    def _setup_scenario(
-        self, satellite_list, ground_station_list, isl_edges_with_weights, gsl_visibility_list
-    ):
-        """Helper to build topology and visibility structures for fstate tests."""
-        constellation_data = ConstellationData(
-            orbits=1,
-            sats_per_orbit=len(satellite_list),
-            epoch="25001.0",
-            max_gsl_length_m=5000000,
-            max_isl_length_m=5000000,
-            satellites=satellite_list,
-        )
-        topology = LEOTopology(constellation_data, ground_station_list)
-        num_isls_per_sat_map = {sat.id: 0 for sat in satellite_list}
-        topology.sat_neighbor_to_if = {}
-        for sat in satellite_list:
-            topology.graph.add_node(sat.id)
-            sat.number_isls = 0
-        for u_id, v_id, weight in isl_edges_with_weights:
-            if topology.graph.has_node(u_id) and topology.graph.has_node(v_id):
-                topology.graph.add_edge(u_id, v_id, weight=weight)
-                u_if = num_isls_per_sat_map[u_id]
-                v_if = num_isls_per_sat_map[v_id]
-                topology.sat_neighbor_to_if[(u_id, v_id)] = u_if
-                topology.sat_neighbor_to_if[(v_id, u_id)] = v_if
-                num_isls_per_sat_map[u_id] += 1
-                num_isls_per_sat_map[v_id] += 1
+# Opaque ephemeris stand-in shared by every satellite of these scenarios; the fstate calculation
+# never reads the body, so a bare namespace avoids MagicMock's autospec of ephem.Body
+MOCK_BODY = types.SimpleNamespace()
+
+
+@functools.lru_cache(maxsize=None)
+def _satellite(sat_id):
+    """
+    Pooled satellite of the given ID, shared by all tests. Scenarios only read its ID: the
+    memoized topologies hold their own satellites, so the pooled ones are never written.
+    """
+    return Satellite(id=sat_id, ephem_obj_manual=MOCK_BODY, ephem_obj_direct=MOCK_BODY)
+
+
+def _zero_ground_stations(gs_ids):
+    """Ground stations at latitude, longitude and elevation 0, built from one set of arrays."""
+    num_ground_stations = len(gs_ids)
+    zeros = np.zeros(num_ground_stations)
+    return GroundStationArray(
+        gs_ids,
+        zeros,
+        zeros,
+        zeros,
+        np.zeros((num_ground_stations, 3)),
+        names=[f"G{gs_id}" for gs_id in gs_ids],
+    )
+
+
+@functools.lru_cache(maxsize=64)
+def _build_topology_cached(signature):
+    """
+    Builds the topology and GSL attachments of a scenario.
+
+    Args:
+        signature: (sat_ids, isl_edges_with_weights, gsl_visibility, gs_ids) tuples.
+
+    Returns:
+        (topology, attachments); shared between callers, so hand out copies only.
+    """
+    sat_ids, isl_edges_with_weights, gsl_visibility, gs_ids = signature
+    satellite_list = [
+        Satellite(id=sat_id, ephem_obj_manual=MOCK_BODY, ephem_obj_direct=MOCK_BODY)
+        for sat_id in sat_ids
+    ]
+    ground_station_list = _zero_ground_stations(gs_ids)
+    constellation_data = ConstellationData(
+        orbits=1,
+        sats_per_orbit=len(satellite_list),
+        epoch="25001.0",
+        max_gsl_length_m=5000000,
+        max_isl_length_m=5000000,
+        satellites=satellite_list,
+    )
+    topology = LEOTopology(constellation_data, ground_station_list)
+    topology.graph.add_nodes_from(sat_ids)
+    sat_id_set = set(sat_ids)
+    valid_edges = [
+        (u_id, v_id, weight)
+        for u_id, v_id, weight in isl_edges_with_weights
+        if u_id in sat_id_set and v_id in sat_id_set
+    ]
+    if log.isEnabledFor(logging.DEBUG) and len(valid_edges) != len(isl_edges_with_weights):
+        for u_id, v_id, _ in isl_edges_with_weights:
+            if u_id not in sat_id_set or v_id not in sat_id_set:
+                log.debug(f"Test setup: skipping edge ({u_id},{v_id}) - node(s) not found.")
+    topology.graph.add_weighted_edges_from(valid_edges)
+    assign_isl_interfaces(topology, [(u_id, v_id) for u_id, v_id, _ in valid_edges])
+
+    # Convert the single GSL attachment format to the new attachment format
+    # gsl_visibility now contains single (distance, satellite_id) tuples for each ground station
+    attachments = []
+    for gs_attachment in gsl_visibility:
+        if gs_attachment:
+            # Single attachment per ground station
+            attachments.append(gs_attachment)
+        else:
+            # No attachment
+            attachments.append((-1, -1))
+    return topology, attachments
+
+
+def _clone_topology(topology):
+    """
+    Per-test copy of a memoized topology. The graph, the satellites (number_isls) and the
+    interface and GSL length dicts are copied; ground stations and ephemeris stand-ins are
+    shared.
+    """
+    clone = copy.copy(topology)
+    clone.graph = topology.graph.copy()
+    clone.sat_neighbor_to_if = dict(topology.sat_neighbor_to_if)
+    clone.gsl_lengths_m = dict(topology.gsl_lengths_m)
+    clone.constellation_data = copy.copy(topology.constellation_data)
+    clone.constellation_data.satellites = [
+        copy.copy(sat) for sat in topology.constellation_data.satellites
+    ]
+    clone.ground_stations = list(topology.ground_stations)
+    return clone
+
+
+def _oracle_fstate(topology, ground_stations, attachments):
+    """
+    Reference fstate from scipy's Dijkstra over satellites and ground stations together.
+
+    Ground stations hang off their single attached satellite, so they are leaves and never
+    relay. The shortest path tree rooted at each destination ground station gives every
+    node's next hop as its predecessor. Interfaces follow the topology's ISL interface map,
+    with a satellite's GSL interface after its ISLs and interface 0 on ground stations.
+    Independent of the fstate code's satellite-only distance matrix and next-hop scan.
+    """
+    sat_ids = sorted(topology.graph.nodes())
+    gs_ids = [gs.id for gs in ground_stations]
+    node_ids = sat_ids + gs_ids
+    position = {node_id: idx for idx, node_id in enumerate(node_ids)}
+    weights = np.zeros((len(node_ids), len(node_ids)))
+    for u_id, v_id, weight in topology.graph.edges(data="weight"):
+        weights[position[u_id], position[v_id]] = weights[position[v_id], position[u_id]] = weight
+    for gs_id, (distance, sat_id) in zip(gs_ids, attachments):
+        if sat_id != -1:
+            weights[position[gs_id], position[sat_id]] = distance
+            weights[position[sat_id], position[gs_id]] = distance
+    gs_positions = [position[gs_id] for gs_id in gs_ids]
+    dist, predecessors = dijkstra(
+        csr_matrix(weights), directed=False, indices=gs_positions, return_predecessors=True
+    )
+
+    number_isls = {sat.id: sat.number_isls for sat in topology.get_satellites()}
+    fstate = {}
+    for row, dst_id in enumerate(gs_ids):
+        for src_id in node_ids:
+            if src_id == dst_id:
+                continue
+            src = position[src_id]
+            if np.isinf(dist[row, src]):
+                fstate[(src_id, dst_id)] = NO_ROUTE
+                continue
+            hop_id = node_ids[predecessors[row, src]]
+            if src_id not in number_isls:
+                entry = (hop_id, 0, number_isls[hop_id])
+            elif hop_id == dst_id:
+                entry = (hop_id, number_isls[src_id], 0)
             else:
-                print(f"Warning in test setup: Skipping edge ({u_id},{v_id}) - node(s) not found.")
-        for sat in topology.constellation_data.satellites:
-            sat.number_isls = num_isls_per_sat_map.get(sat.id, 0)
-        if len(gsl_visibility_list) != len(ground_station_list):
-            raise ValueError("Length mismatch: gsl_visibility_list vs ground_station_list")
+                entry = (
+                    hop_id,
+                    topology.sat_neighbor_to_if[(src_id, hop_id)],
+                    topology.sat_neighbor_to_if[(hop_id, src_id)],
+                )
+            fstate[(src_id, dst_id)] = entry
+    return fstate
+
+
+# Node IDs of the scenarios below
+SAT_A, SAT_B = 10, 11
+GS_X, GS_Y, GS_Z = 100, 101, 102
+SAT_0, SAT_1, SAT_2, SAT_3, SAT_4 = 10, 11, 12, 13, 14
+GS_5, GS_6, GS_7, GS_8, GS_9 = 105, 106, 107, 108, 109
+
+
+# Entries of the expected fstates below; equal entries are one shared tuple
+@functools.lru_cache(maxsize=None)
+def _v(next_hop_id, my_if, next_hop_if):
+    return (next_hop_id, my_if, next_hop_if)
+
+
+# Expected forwarding states, built once at import and shared read-only by the tests
+EXPECTED_ONE_SAT_TWO_GS = MappingProxyType(
+    {
+        (SAT_A, GS_X): _v(GS_X, 0, 0),
+        (SAT_A, GS_Y): _v(GS_Y, 0, 0),
+        (GS_X, GS_Y): _v(SAT_A, 0, 0),
+        (GS_Y, GS_X): _v(SAT_A, 0, 0),
+    }
+)
 
-        # Convert the single GSL attachment format to the new attachment format
-        # gsl_visibility_list now contains single (distance, satellite_id) tuples for each ground station
-        attachments = []
-        for gs_attachment in gsl_visibility_list:
-            if gs_attachment:
-                # Single attachment per ground station
-                attachments.append(gs_attachment)
-            else:
-                # No attachment
-                attachments.append((-1, -1))
+EXPECTED_TWO_SAT_TWO_GS = MappingProxyType(
+    {
+        (SAT_A, GS_X): _v(GS_X, 1, 0),
+        (SAT_A, GS_Y): _v(SAT_B, 0, 0),
+        (SAT_B, GS_X): _v(SAT_A, 0, 0),
+        (SAT_B, GS_Y): _v(GS_Y, 1, 0),
+        (GS_X, GS_Y): _v(SAT_A, 0, 1),
+        (GS_Y, GS_X): _v(SAT_B, 0, 1),
+    }
+)
 
-        mock_strategy = MockGSLAttachmentStrategy(attachments)
-        return topology, mock_strategy
+EXPECTED_TWO_SAT_THREE_GS = MappingProxyType(
+    {
+        (SAT_A, GS_X): _v(GS_X, 1, 0),
+        (SAT_A, GS_Y): _v(GS_Y, 1, 0),
+        (SAT_A, GS_Z): _v(SAT_B, 0, 0),
+        (SAT_B, GS_X): _v(SAT_A, 0, 0),
+        (SAT_B, GS_Y): _v(SAT_A, 0, 0),
+        (SAT_B, GS_Z): _v(GS_Z, 1, 0),
+        (GS_X, GS_Y): _v(SAT_A, 0, 1),
+        (GS_X, GS_Z): _v(SAT_A, 0, 1),
+        (GS_Y, GS_X): _v(SAT_A, 0, 1),
+        (GS_Y, GS_Z): _v(SAT_A, 0, 1),
+        (GS_Z, GS_X): _v(SAT_B, 0, 1),
+        (GS_Z, GS_Y): _v(SAT_B, 0, 1),
+    }
+)
 
-    # --- Test Cases ---
+# Five satellite scenario:
+# ISL Counts: SAT_0:1, SAT_1:1, SAT_2:2, SAT_3:2, SAT_4:2
+# IF Map (built by the topology helper):
+# (10,13):0, (13,10):0
+# (11,14):0, (14,11):0
+# (12,13):0, (13,12):1
+# (12,14):1, (14,12):1
+# GSL IFs: SAT_0=1, SAT_1=1, SAT_2=2, SAT_3=2, SAT_4=2; All GS=0
+EXPECTED_FIVE_SAT_FIVE_GS = MappingProxyType(
+    {
+        # Old Name -> New Name: Recalculated IFs
+        # (0, 5) -> (10, 105): Path 10->13->12->105. Hop 13. IFs: (10,13)=0, (13,10)=0. -> (13, 0, 0)
+        (SAT_0, GS_5): _v(SAT_3, 0, 0),
+        # (0, 6) -> (10, 106): Path 10->13->12->14->11->106. Hop 13. IFs: (10,13)=0, (13,10)=0. -> (13, 0, 0)
+        (SAT_0, GS_6): _v(SAT_3, 0, 0),
+        # (0, 7) -> (10, 107): Direct. Hop 107. IFs: Sat IF=1, GS IF=0. -> (107, 1, 0)
+        (SAT_0, GS_7): _v(GS_7, 1, 0),
+        # (0, 8) -> (10, 108): Direct. Hop 108. IFs: Sat IF=1, GS IF=0. -> (108, 1, 0)
+        (SAT_0, GS_8): _v(GS_8, 1, 0),
+        # (0, 9) -> (10, 109): Path 10->13->12->14->11->109. Hop 13. IFs: (10,13)=0, (13,10)=0. -> (13, 0, 0)
+        (SAT_0, GS_9): _v(SAT_3, 0, 0),
+        # (1, 5) -> (11, 105): Path 11->14->12->105. Hop 14. IFs: (11,14)=0, (14,11)=0. -> (14, 0, 0)
+        (SAT_1, GS_5): _v(SAT_4, 0, 0),
+        # (1, 6) -> (11, 106): Direct. Hop 106. IFs: Sat IF=1, GS IF=0. -> (106, 1, 0)
+        (SAT_1, GS_6): _v(GS_6, 1, 0),
+        # (1, 7) -> (11, 107): Path 11->14->12->13->10->107. Hop 14. IFs: (11,14)=0, (14,11)=0. -> (14, 0, 0)
+        (SAT_1, GS_7): _v(SAT_4, 0, 0),
+        # (1, 8) -> (11, 108): Path 11->14->12->108. Hop 14. IFs: (11,14)=0, (14,11)=0. -> (14, 0, 0)
+        (SAT_1, GS_8): _v(SAT_4, 0, 0),
+        # (1, 9) -> (11, 109): Path 11->14->12->109. Hop 14. IFs: (11,14)=0, (14,11)=0. -> (14, 0, 0)
+        (SAT_1, GS_9): _v(SAT_4, 0, 0),  # Multi-hop route via SAT_4, then SAT_2
+        # (2, 5) -> (12, 105): Direct. Hop 105. IFs: Sat IF=2, GS IF=0. -> (105, 2, 0)
+        (SAT_2, GS_5): _v(GS_5, 2, 0),
+        # (2, 6) -> (12, 106): Path 12->14->11->106. Hop 14. IFs: (12,14)=1, (14,12)=1. -> (14, 1, 1)
+        (SAT_2, GS_6): _v(SAT_4, 1, 1),
+        # (2, 7) -> (12, 107): Path 12->13->10->107. Hop 13. IFs: (12,13)=0, (13,12)=1. -> (13, 0, 1)
+        (SAT_2, GS_7): _v(SAT_3, 0, 1),
+        # (2, 8) -> (12, 108): Path 12->13->10->108. Hop 13. IFs: (12,13)=0, (13,12)=1. -> (13, 0, 1)
+        (SAT_2, GS_8): _v(SAT_3, 0, 1),  # Multi-hop route via SAT_3, then SAT_0
+        # (2, 9) -> (12, 109): Direct. Hop 109. IFs: Sat IF=2, GS IF=0. -> (109, 2, 0)
+        (SAT_2, GS_9): _v(GS_9, 2, 0),
+        # (3, 5) -> (13, 105): Path 13->12->105. Hop 12. IFs: (13,12)=1, (12,13)=0. -> (12, 1, 0)
+        (SAT_3, GS_5): _v(SAT_2, 1, 0),
+        # (3, 6) -> (13, 106): Path 13->12->14->11->106. Hop 12. IFs: (13,12)=1, (12,13)=0. -> (12, 1, 0)
+        (SAT_3, GS_6): _v(SAT_2, 1, 0),
+        # (3, 7) -> (13, 107): Path 13->10->107. Hop 10. IFs: (13,10)=0, (10,13)=0. -> (10, 0, 0)
+        (SAT_3, GS_7): _v(SAT_0, 0, 0),
+        # (3, 8) -> (13, 108): Path 13->10->108. Hop 10. IFs: (13,10)=0, (10,13)=0. -> (10, 0, 0)
+        (SAT_3, GS_8): _v(SAT_0, 0, 0),  # Multi-hop route via SAT_0
+        # (3, 9) -> (13, 109): Path 13->12->14->11->109. Hop 12. IFs: (13,12)=1, (12,13)=0. -> (12, 1, 0)
+        (SAT_3, GS_9): _v(SAT_2, 1, 0),
+        # (4, 5) -> (14, 105): Path 14->12->105. Hop 12. IFs: (14,12)=1, (12,14)=1. -> (12, 1, 1)
+        (SAT_4, GS_5): _v(SAT_2, 1, 1),
+        # (4, 6) -> (14, 106): Path 14->11->106. Hop 11. IFs: (14,11)=0, (11,14)=0. -> (11, 0, 0)
+        (SAT_4, GS_6): _v(SAT_1, 0, 0),
+        # (4, 7) -> (14, 107): Path 14->12->13->10->107. Hop 12. IFs: (14,12)=1, (12,14)=1. -> (12, 1, 1)
+        (SAT_4, GS_7): _v(SAT_2, 1, 1),
+        # (4, 8) -> (14, 108): Path 14->12->108. Hop 12. IFs: (14,12)=1, (12,14)=1. -> (12, 1, 1)
+        (SAT_4, GS_8): _v(SAT_2, 1, 1),
+        # (4, 9) -> (14, 109): Path 14->12->109. Hop 12. IFs: (14,12)=1, (12,14)=1. -> (12, 1, 1)
+        (SAT_4, GS_9): _v(SAT_2, 1, 1),  # Multi-hop route via SAT_2
+        # GS -> GS Calculations (Example: GS_5 -> GS_6)
+        # (5, 6) -> (105, 106): Path 105->12->14->11->106. Entry=12. Hop 12. IFs: GS IF=0, Sat GSL IF=2. -> (12, 0, 2)
+        (GS_5, GS_6): _v(SAT_2, 0, 2),
+        (GS_5, GS_7): _v(SAT_2, 0, 2),  # Path 105->12->13->10->107. Entry=12. Hop 12.
+        (GS_5, GS_8): _v(SAT_2, 0, 2),  # Path 105->12->108. Entry=12. Hop 12.
+        # Path 105->12->14->11->109 or 105->12->109. Entry=12. Hop 12.
+        (GS_5, GS_9): _v(SAT_2, 0, 2),
+        # Path 106->11->14->12->105. Entry=11. Hop 11. IFs: GS IF=0, Sat GSL IF=1.
+        (GS_6, GS_5): _v(SAT_1, 0, 1),
+        (GS_6, GS_7): _v(SAT_1, 0, 1),  # Path 106->11->14->12->13->10->107. Entry=11. Hop 11.
+        (GS_6, GS_8): _v(SAT_1, 0, 1),  # Path 106->11->14->12->108. Entry=11. Hop 11.
+        (GS_6, GS_9): _v(SAT_1, 0, 1),  # Path 106->11->109. Entry=11. Hop 11.
+        # Path 107->10->13->12->105. Entry=10. Hop 10. IFs: GS IF=0, Sat GSL IF=1.
+        (GS_7, GS_5): _v(SAT_0, 0, 1),
+        (GS_7, GS_6): _v(SAT_0, 0, 1),  # Path 107->10->13->12->14->11->106. Entry=10. Hop 10.
+        (GS_7, GS_8): _v(SAT_0, 0, 1),  # Path 107->10->108. Entry=10. Hop 10.
+        (GS_7, GS_9): _v(SAT_0, 0, 1),  # Path 107->10->13->12->14->11->109. Entry=10. Hop 10.
+        # GS_8 now attached to SAT_0, GS_9 now attached to SAT_2
+        (GS_8, GS_5): _v(SAT_0, 0, 1),  # Path 108->10->13->12->105. Entry=10. Hop 10.
+        (GS_8, GS_6): _v(SAT_0, 0, 1),  # Path 108->10->13->12->14->11->106. Entry=10. Hop 10.
+        (GS_8, GS_7): _v(SAT_0, 0, 1),  # Path 108->10->107. Entry=10. Hop 10.
+        (GS_8, GS_9): _v(SAT_0, 0, 1),  # Path 108->10->13->12->109. Entry=10. Hop 10.
+        # GS_9 now attached to SAT_2
+        (GS_9, GS_5): _v(SAT_2, 0, 2),  # Path 109->12->105. Entry=12. Hop 12.
+        (GS_9, GS_6): _v(SAT_2, 0, 2),  # Path 109->12->14->11->106. Entry=12. Hop 12.
+        (GS_9, GS_7): _v(SAT_2, 0, 2),  # Path 109->12->13->10->107. Entry=12. Hop 12.
+        (GS_9, GS_8): _v(SAT_2, 0, 2),  # Path 109->12->13->10->108. Entry=12. Hop 12.
+    }
+)
 
-    def test_one_sat_two_gs_refactored(self):
-        """Scenario: 1 Sat (ID 10), 2 GS (IDs 100, 101), GSLs only"""
-        # Diagram:
+EXPECTED_TWO_SAT_NO_ISL = MappingProxyType(
+    {
+        # Sat -> GS (Only direct GSLs possible)
+        (SAT_A, GS_X): _v(GS_X, 0, 0),
+        (SAT_A, GS_Y): _v(GS_Y, 0, 0),
+        (SAT_A, GS_Z): NO_ROUTE,  # Cannot reach (GS_Z attached to SAT_B, no ISL)
+        (SAT_B, GS_X): NO_ROUTE,  # Cannot reach (GS_X attached to SAT_A, no ISL)
+        (SAT_B, GS_Y): NO_ROUTE,  # Cannot reach (GS_Y attached to SAT_A, no ISL)
+        (SAT_B, GS_Z): _v(GS_Z, 0, 0),
+        # GS -> GS (Only possible if both attached to SAME satellite)
+        (GS_X, GS_Y): _v(SAT_A, 0, 0),  # Path X->A->Y (both attached to SAT_A)
+        (GS_X, GS_Z): NO_ROUTE,  # Cannot reach (different satellites, no ISL)
+        (GS_Y, GS_X): _v(SAT_A, 0, 0),  # Path Y->A->X (both attached to SAT_A)
+        (GS_Y, GS_Z): NO_ROUTE,  # Cannot reach (different satellites, no ISL)
+        (GS_Z, GS_X): NO_ROUTE,  # Cannot reach (different satellites, no ISL)
+        (GS_Z, GS_Y): NO_ROUTE,  # Cannot reach (different satellites, no ISL)
+    }
+)
+
+
+@dataclass(frozen=True)
+class FstateScenario:
+    """Satellites, ground stations, ISLs and GSL attachments of a scenario, and its fstate."""
+
+    sat_ids: tuple
+    gs_ids: tuple
+    # (sat_id_a, sat_id_b, weight) per ISL
+    isl_edges: tuple
+    # Single (distance, sat_id) attachment per ground station, in gs_ids order
+    gsl_visibility: tuple
+    expected_fstate: MappingProxyType
+
+
+SCENARIOS = MappingProxyType(
+    {
         #      10 (Sat)
         #     /  \
         # 100(GS) 101(GS)
-        SAT_ID = 10
-        GS_A_ID = 100
-        GS_B_ID = 101
-        mock_body = MagicMock(spec=ephem.Body)
-        satellites = [Satellite(id=SAT_ID, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body)]
-        ground_stations = [
-            GroundStation(
-                gid=GS_A_ID,
-                name="GA",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-            GroundStation(
-                gid=GS_B_ID,
-                name="GB",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-        ]
-        isl_edges = []
-        # Single GSL attachments: both GS attached to the same satellite
-        gsl_visibility = [(1000, SAT_ID), (1000, SAT_ID)]
-        topology, mock_strategy = self._setup_scenario(
-            satellites, ground_stations, isl_edges, gsl_visibility
-        )
-        current_time = Time("2000-01-01 00:00:00", scale="tdb")
-        fstate = calculate_fstate_shortest_path_object_no_gs_relay(
-            topology, ground_stations, mock_strategy, current_time
-        )
-        expected_fstate = {
-            (SAT_ID, GS_A_ID): (GS_A_ID, 0, 0),
-            (SAT_ID, GS_B_ID): (GS_B_ID, 0, 0),
-            (GS_A_ID, GS_B_ID): (SAT_ID, 0, 0),
-            (GS_B_ID, GS_A_ID): (SAT_ID, 0, 0),
-        }
-        self.assertDictEqual(fstate, expected_fstate)
-
-    def test_two_sat_two_gs_refactored(self):
-        """Scenario: Sat 10 -- Sat 11, GS 100 -> Sat 10, GS 101 -> Sat 11"""
-        # Diagram: 100(GS) -- 10(Sat) -- 11(Sat) -- 101(GS)
-        SAT_A = 10
-        SAT_B = 11
-        GS_X = 100
-        GS_Y = 101
-        mock_body = MagicMock(spec=ephem.Body)
-        satellites = [
-            Satellite(id=SAT_A, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_B, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-        ]
-        ground_stations = [
-            GroundStation(
-                gid=GS_X,
-                name="GX",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-            GroundStation(
-                gid=GS_Y,
-                name="GY",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-        ]
-        isl_edges = [(SAT_A, SAT_B, 1000)]
-        # Single GSL attachments: GS_X -> SAT_A, GS_Y -> SAT_B
-        gsl_visibility = [(500, SAT_A), (600, SAT_B)]
-        topology, mock_strategy = self._setup_scenario(
-            satellites, ground_stations, isl_edges, gsl_visibility
-        )
-        current_time = Time("2000-01-01 00:00:00", scale="tdb")
-        fstate = calculate_fstate_shortest_path_object_no_gs_relay(
-            topology, ground_stations, mock_strategy, current_time
-        )
-        expected_fstate = {
-            (SAT_A, GS_X): (GS_X, 1, 0),
-            (SAT_A, GS_Y): (SAT_B, 0, 0),
-            (SAT_B, GS_X): (SAT_A, 0, 0),
-            (SAT_B, GS_Y): (GS_Y, 1, 0),
-            (GS_X, GS_Y): (SAT_A, 0, 1),
-            (GS_Y, GS_X): (SAT_B, 0, 1),
-        }
-        self.assertDictEqual(fstate, expected_fstate)
-
-    def test_two_sat_three_gs_refactored(self):
-        """Scenario: Sat 10 -- Sat 11, with single GSL attachments per ground station"""
-        # Diagram:
-        #            100(GS) -----> 10(Sat)
-        #                           /
-        #   10(Sat) -----------  11(Sat)
-        #      \                       \
-        #       101(GS)               102(GS)
-        #
-        # GSL Attachments:
-        # - GS 100 -> SAT_A (10)
-        # - GS 101 -> SAT_A (10)
-        # - GS 102 -> SAT_B (11)
-        SAT_A = 10
-        SAT_B = 11
-        GS_X = 100
-        GS_Y = 101
-        GS_Z = 102
-        mock_body = MagicMock(spec=ephem.Body)
-        satellites = [
-            Satellite(id=SAT_A, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_B, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-        ]
-        ground_stations = [
-            GroundStation(
-                gid=GS_X,
-                name="GX",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-            GroundStation(
-                gid=GS_Y,
-                name="GY",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-            GroundStation(
-                gid=GS_Z,
-                name="GZ",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-        ]
-        isl_edges = [(SAT_A, SAT_B, 1000)]
-        # Single GSL attachments: GS_X->SAT_A, GS_Y->SAT_A, GS_Z->SAT_B
-        gsl_visibility = [(500, SAT_A), (200, SAT_A), (400, SAT_B)]
-        topology, mock_strategy = self._setup_scenario(
-            satellites, ground_stations, isl_edges, gsl_visibility
-        )
-        current_time = Time("2000-01-01 00:00:00", scale="tdb")
-        fstate = calculate_fstate_shortest_path_object_no_gs_relay(
-            topology, ground_stations, mock_strategy, current_time
-        )
-        expected_fstate = {
-            (SAT_A, GS_X): (GS_X, 1, 0),
-            (SAT_A, GS_Y): (GS_Y, 1, 0),
-            (SAT_A, GS_Z): (SAT_B, 0, 0),
-            (SAT_B, GS_X): (SAT_A, 0, 0),
-            (SAT_B, GS_Y): (SAT_A, 0, 0),
-            (SAT_B, GS_Z): (GS_Z, 1, 0),
-            (GS_X, GS_Y): (SAT_A, 0, 1),
-            (GS_X, GS_Z): (SAT_A, 0, 1),
-            (GS_Y, GS_X): (SAT_A, 0, 1),
-            (GS_Y, GS_Z): (SAT_A, 0, 1),
-            (GS_Z, GS_X): (SAT_B, 0, 1),
-            (GS_Z, GS_Y): (SAT_B, 0, 1),
-        }
-        self.assertDictEqual(fstate, expected_fstate)
-
-    def test_five_sat_five_gs_refactored(self):
-        """Scenario: 5 Sats (10-14), 5 GS (105-109), complex ISLs"""
-        # Diagram:
+        "one_sat_two_gs": FstateScenario(
+            sat_ids=(SAT_A,),
+            gs_ids=(GS_X, GS_Y),
+            isl_edges=(),
+            # Both GS attached to the same satellite
+            gsl_visibility=((1000, SAT_A), (1000, SAT_A)),
+            expected_fstate=EXPECTED_ONE_SAT_TWO_GS,
+        ),
+        # 100(GS) -- 10(Sat) -- 11(Sat) -- 101(GS)
+        "two_sat_two_gs": FstateScenario(
+            sat_ids=(SAT_A, SAT_B),
+            gs_ids=(GS_X, GS_Y),
+            isl_edges=((SAT_A, SAT_B, 1000),),
+            gsl_visibility=((500, SAT_A), (600, SAT_B)),
+            expected_fstate=EXPECTED_TWO_SAT_TWO_GS,
+        ),
+        # 100(GS), 101(GS) -- 10(Sat) -- 11(Sat) -- 102(GS)
+        "two_sat_three_gs": FstateScenario(
+            sat_ids=(SAT_A, SAT_B),
+            gs_ids=(GS_X, GS_Y, GS_Z),
+            isl_edges=((SAT_A, SAT_B, 1000),),
+            gsl_visibility=((500, SAT_A), (200, SAT_A), (400, SAT_B)),
+            expected_fstate=EXPECTED_TWO_SAT_THREE_GS,
+        ),
         #  107(GS)-- 10(Sat)      11(Sat) -- 106(GS)
         #           / |          | \
         #     108(GS) 13(Sat)   14(Sat)   109(GS)
@@ -287,308 +422,98 @@ class TestFstateCalculationRefactored(unittest.TestCase):
         #      +--------- 12(Sat) --------+
         #                 |
         #               105(GS)
-        # --- Setup ---
-        # Satellite IDs (map from old 0-4)
-        SAT_0 = 10
-        SAT_1 = 11
-        SAT_2 = 12
-        SAT_3 = 13
-        SAT_4 = 14
-        # Ground Station IDs (map from old 5-9)
-        GS_5 = 105
-        GS_6 = 106
-        GS_7 = 107
-        GS_8 = 108
-        GS_9 = 109
-
-        mock_body = MagicMock(spec=ephem.Body)
-        satellites = [
-            Satellite(id=SAT_0, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_1, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_2, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_3, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_4, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-        ]
-        ground_stations = [
-            GroundStation(
-                gid=GS_5,
-                name="G5",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-            GroundStation(
-                gid=GS_6,
-                name="G6",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
+        "five_sat_five_gs": FstateScenario(
+            sat_ids=(SAT_0, SAT_1, SAT_2, SAT_3, SAT_4),
+            gs_ids=(GS_5, GS_6, GS_7, GS_8, GS_9),
+            isl_edges=(
+                (SAT_0, SAT_3, 600),
+                (SAT_1, SAT_4, 300),
+                (SAT_2, SAT_3, 400),
+                (SAT_2, SAT_4, 400),
             ),
-            GroundStation(
-                gid=GS_7,
-                name="G7",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
+            gsl_visibility=(
+                (500, SAT_2),
+                (500, SAT_1),
+                (500, SAT_0),
+                # GS_8 -> SAT_0 enables (SAT_0, GS_8): (GS_8, 1, 0)
+                (600, SAT_0),
+                # GS_9 -> SAT_2 enables (SAT_2, GS_9): (GS_9, 2, 0)
+                (500, SAT_2),
             ),
-            GroundStation(
-                gid=GS_8,
-                name="G8",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-            GroundStation(
-                gid=GS_9,
-                name="G9",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-        ]  # Order: GS_5(idx0), GS_6(idx1), GS_7(idx2), GS_8(idx3), GS_9(idx4)
-
-        # Old ISLs: (0,3,600), (1,4,300), (2,3,400), (2,4,400)
-        isl_edges = [
-            (SAT_0, SAT_3, 600),
-            (SAT_1, SAT_4, 300),
-            (SAT_2, SAT_3, 400),
-            (SAT_2, SAT_4, 400),
-        ]
+            expected_fstate=EXPECTED_FIVE_SAT_FIVE_GS,
+        ),
+        # 100(GS), 101(GS) -- 10(Sat)    11(Sat) -- 102(GS), no ISL between the satellites
+        "two_sat_three_gs_no_isl": FstateScenario(
+            sat_ids=(SAT_A, SAT_B),
+            gs_ids=(GS_X, GS_Y, GS_Z),
+            isl_edges=(),
+            gsl_visibility=((100, SAT_A), (100, SAT_A), (100, SAT_B)),
+            expected_fstate=EXPECTED_TWO_SAT_NO_ISL,
+        ),
+    }
+)
 
-        # Single GSL attachments based on the expected routing behavior:
-        # Derived from expected fstate to ensure direct routes work correctly
-        gsl_visibility = [
-            # GS_5 (idx 0) -> Sat 2 (12) dist 500
-            (500, SAT_2),
-            # GS_6 (idx 1) -> Sat 1 (11) dist 500
-            (500, SAT_1),
-            # GS_7 (idx 2) -> Sat 0 (10) dist 500
-            (500, SAT_0),
-            # GS_8 (idx 3) -> Sat 0 (10) dist 600 (to enable (SAT_0, GS_8): (GS_8, 1, 0))
-            (600, SAT_0),
-            # GS_9 (idx 4) -> Sat 2 (12) dist 500 (to enable (SAT_2, GS_9): (GS_9, 2, 0))
-            (500, SAT_2),
-        ]
 
-        topology, mock_strategy = self._setup_scenario(
-            satellites, ground_stations, isl_edges, gsl_visibility
-        )
+# --- Test Class ---
+class TestFstateCalculationRefactored(FstateTestCase):
 
-        # --- Call Function ---
-        current_time = Time("2000-01-01 00:00:00", scale="tdb")
-        fstate = calculate_fstate_shortest_path_object_no_gs_relay(
-            topology, ground_stations, mock_strategy, current_time
-        )
+    @classmethod
+    def setUpClass(cls):
+        """Time instant and zero-position ground stations shared by every test."""
+        # Imported here so collecting the module (e.g. deselected by -k) does not load astropy;
+        # parsed once, the fstate calculation only reads the instant
+        from astropy.time import Time
 
-        # --- Assertions ---
-        # ISL Counts: SAT_0:1, SAT_1:1, SAT_2:2, SAT_3:2, SAT_4:2
-        # IF Map (built by helper):
-        # (10,13):0, (13,10):0
-        # (11,14):0, (14,11):0
-        # (12,13):0, (13,12):1
-        # (12,14):1, (14,12):1
-        # GSL IFs: SAT_0=1, SAT_1=1, SAT_2=2, SAT_3=2, SAT_4=2; All GS=0
-        expected_fstate = {
-            # Old Name -> New Name: Recalculated IFs
-            # (0, 5) -> (10, 105): Path 10->13->12->105. Hop 13. IFs: (10,13)=0, (13,10)=0. -> (13, 0, 0)
-            (SAT_0, GS_5): (SAT_3, 0, 0),
-            # (0, 6) -> (10, 106): Path 10->13->12->14->11->106. Hop 13. IFs: (10,13)=0, (13,10)=0. -> (13, 0, 0)
-            (SAT_0, GS_6): (SAT_3, 0, 0),
-            # (0, 7) -> (10, 107): Direct. Hop 107. IFs: Sat IF=1, GS IF=0. -> (107, 1, 0)
-            (SAT_0, GS_7): (GS_7, 1, 0),
-            # (0, 8) -> (10, 108): Direct. Hop 108. IFs: Sat IF=1, GS IF=0. -> (108, 1, 0)
-            (SAT_0, GS_8): (GS_8, 1, 0),
-            # (0, 9) -> (10, 109): Path 10->13->12->14->11->109. Hop 13. IFs: (10,13)=0, (13,10)=0. -> (13, 0, 0)
-            (SAT_0, GS_9): (SAT_3, 0, 0),
-            # (1, 5) -> (11, 105): Path 11->14->12->105. Hop 14. IFs: (11,14)=0, (14,11)=0. -> (14, 0, 0)
-            (SAT_1, GS_5): (SAT_4, 0, 0),
-            # (1, 6) -> (11, 106): Direct. Hop 106. IFs: Sat IF=1, GS IF=0. -> (106, 1, 0)
-            (SAT_1, GS_6): (GS_6, 1, 0),
-            # (1, 7) -> (11, 107): Path 11->14->12->13->10->107. Hop 14. IFs: (11,14)=0, (14,11)=0. -> (14, 0, 0)
-            (SAT_1, GS_7): (SAT_4, 0, 0),
-            # (1, 8) -> (11, 108): Path 11->14->12->108. Hop 14. IFs: (11,14)=0, (14,11)=0. -> (14, 0, 0)
-            (SAT_1, GS_8): (SAT_4, 0, 0),
-            # (1, 9) -> (11, 109): Path 11->14->12->109. Hop 14. IFs: (11,14)=0, (14,11)=0. -> (14, 0, 0)
-            (SAT_1, GS_9): (SAT_4, 0, 0),  # Multi-hop route via SAT_4, then SAT_2
-            # (2, 5) -> (12, 105): Direct. Hop 105. IFs: Sat IF=2, GS IF=0. -> (105, 2, 0)
-            (SAT_2, GS_5): (GS_5, 2, 0),
-            # (2, 6) -> (12, 106): Path 12->14->11->106. Hop 14. IFs: (12,14)=1, (14,12)=1. -> (14, 1, 1)
-            (SAT_2, GS_6): (SAT_4, 1, 1),
-            # (2, 7) -> (12, 107): Path 12->13->10->107. Hop 13. IFs: (12,13)=0, (13,12)=1. -> (13, 0, 1)
-            (SAT_2, GS_7): (SAT_3, 0, 1),
-            # (2, 8) -> (12, 108): Path 12->13->10->108. Hop 13. IFs: (12,13)=0, (13,12)=1. -> (13, 0, 1)
-            (SAT_2, GS_8): (SAT_3, 0, 1),  # Multi-hop route via SAT_3, then SAT_0
-            # (2, 9) -> (12, 109): Direct. Hop 109. IFs: Sat IF=2, GS IF=0. -> (109, 2, 0)
-            (SAT_2, GS_9): (GS_9, 2, 0),
-            # (3, 5) -> (13, 105): Path 13->12->105. Hop 12. IFs: (13,12)=1, (12,13)=0. -> (12, 1, 0)
-            (SAT_3, GS_5): (SAT_2, 1, 0),
-            # (3, 6) -> (13, 106): Path 13->12->14->11->106. Hop 12. IFs: (13,12)=1, (12,13)=0. -> (12, 1, 0)
-            (SAT_3, GS_6): (SAT_2, 1, 0),
-            # (3, 7) -> (13, 107): Path 13->10->107. Hop 10. IFs: (13,10)=0, (10,13)=0. -> (10, 0, 0)
-            (SAT_3, GS_7): (SAT_0, 0, 0),
-            # (3, 8) -> (13, 108): Path 13->10->108. Hop 10. IFs: (13,10)=0, (10,13)=0. -> (10, 0, 0)
-            (SAT_3, GS_8): (SAT_0, 0, 0),  # Multi-hop route via SAT_0
-            # (3, 9) -> (13, 109): Path 13->12->14->11->109. Hop 12. IFs: (13,12)=1, (12,13)=0. -> (12, 1, 0)
-            (SAT_3, GS_9): (SAT_2, 1, 0),
-            # (4, 5) -> (14, 105): Path 14->12->105. Hop 12. IFs: (14,12)=1, (12,14)=1. -> (12, 1, 1)
-            (SAT_4, GS_5): (SAT_2, 1, 1),
-            # (4, 6) -> (14, 106): Path 14->11->106. Hop 11. IFs: (14,11)=0, (11,14)=0. -> (11, 0, 0)
-            (SAT_4, GS_6): (SAT_1, 0, 0),
-            # (4, 7) -> (14, 107): Path 14->12->13->10->107. Hop 12. IFs: (14,12)=1, (12,14)=1. -> (12, 1, 1)
-            (SAT_4, GS_7): (SAT_2, 1, 1),
-            # (4, 8) -> (14, 108): Path 14->12->108. Hop 12. IFs: (14,12)=1, (12,14)=1. -> (12, 1, 1)
-            (SAT_4, GS_8): (SAT_2, 1, 1),
-            # (4, 9) -> (14, 109): Path 14->12->109. Hop 12. IFs: (14,12)=1, (12,14)=1. -> (12, 1, 1)
-            (SAT_4, GS_9): (SAT_2, 1, 1),  # Multi-hop route via SAT_2
-            # GS -> GS Calculations (Example: GS_5 -> GS_6)
-            # (5, 6) -> (105, 106): Path 105->12->14->11->106. Entry=12. Hop 12. IFs: GS IF=0, Sat GSL IF=2. -> (12, 0, 2)
-            (GS_5, GS_6): (SAT_2, 0, 2),
-            (GS_5, GS_7): (SAT_2, 0, 2),  # Path 105->12->13->10->107. Entry=12. Hop 12.
-            (GS_5, GS_8): (SAT_2, 0, 2),  # Path 105->12->108. Entry=12. Hop 12.
-            (GS_5, GS_9): (
-                SAT_2,
-                0,
-                2,
-            ),  # Path 105->12->14->11->109 or 105->12->109. Entry=12. Hop 12.
-            (GS_6, GS_5): (
-                SAT_1,
-                0,
-                1,
-            ),  # Path 106->11->14->12->105. Entry=11. Hop 11. IFs: GS IF=0, Sat GSL IF=1.
-            (GS_6, GS_7): (SAT_1, 0, 1),  # Path 106->11->14->12->13->10->107. Entry=11. Hop 11.
-            (GS_6, GS_8): (SAT_1, 0, 1),  # Path 106->11->14->12->108. Entry=11. Hop 11.
-            (GS_6, GS_9): (SAT_1, 0, 1),  # Path 106->11->109. Entry=11. Hop 11.
-            (GS_7, GS_5): (
-                SAT_0,
-                0,
-                1,
-            ),  # Path 107->10->13->12->105. Entry=10. Hop 10. IFs: GS IF=0, Sat GSL IF=1.
-            (GS_7, GS_6): (SAT_0, 0, 1),  # Path 107->10->13->12->14->11->106. Entry=10. Hop 10.
-            (GS_7, GS_8): (SAT_0, 0, 1),  # Path 107->10->108. Entry=10. Hop 10.
-            (GS_7, GS_9): (SAT_0, 0, 1),  # Path 107->10->13->12->14->11->109. Entry=10. Hop 10.
-            # GS_8 now attached to SAT_0, GS_9 now attached to SAT_2
-            (GS_8, GS_5): (SAT_0, 0, 1),  # Path 108->10->13->12->105. Entry=10. Hop 10.
-            (GS_8, GS_6): (SAT_0, 0, 1),  # Path 108->10->13->12->14->11->106. Entry=10. Hop 10.
-            (GS_8, GS_7): (SAT_0, 0, 1),  # Path 108->10->107. Entry=10. Hop 10.
-            (GS_8, GS_9): (SAT_0, 0, 1),  # Path 108->10->13->12->109. Entry=10. Hop 10.
-            # GS_9 now attached to SAT_2
-            (GS_9, GS_5): (SAT_2, 0, 2),  # Path 109->12->105. Entry=12. Hop 12.
-            (GS_9, GS_6): (SAT_2, 0, 2),  # Path 109->12->14->11->106. Entry=12. Hop 12.
-            (GS_9, GS_7): (SAT_2, 0, 2),  # Path 109->12->13->10->107. Entry=12. Hop 12.
-            (GS_9, GS_8): (SAT_2, 0, 2),  # Path 109->12->13->10->108. Entry=12. Hop 12.
-        }
-        # Carefully compare calculated vs old, using new IF logic
-        self.maxDiff = None  # Show full diff on failure
-        self.assertDictEqual(fstate, expected_fstate)
-
-    def test_two_sat_two_gs_no_isl_refactored(self):
-        """Scenario: Sat 10, Sat 11 (no ISL). Single GSL attachments per ground station."""
-        # Diagram:
-        # 100(GS) ----> 10(Sat)    11(Sat) <---- 102(GS)
-        #                  \        /
-        #                   101(GS) (attached to either SAT_A or SAT_B)
-        #                  (No ISL between satellites)
-        #
-        # GSL Attachments:
-        # - GS 100 -> SAT_A (10)
-        # - GS 101 -> SAT_A (10) (choose SAT_A for connectivity)
-        # - GS 102 -> SAT_B (11)
-        # --- Setup ---
-        SAT_A = 10
-        SAT_B = 11
-        GS_X = 100
-        GS_Y = 101
-        GS_Z = 102
-        mock_body = MagicMock(spec=ephem.Body)
-        satellites = [
-            Satellite(id=SAT_A, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_B, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-        ]
-        ground_stations = [
-            GroundStation(
-                gid=GS_X,
-                name="GX",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-            GroundStation(
-                gid=GS_Y,
-                name="GY",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-            GroundStation(
-                gid=GS_Z,
-                name="GZ",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-        ]
-        isl_edges = []  # No ISLs
-        # Single GSL attachments: GS_X->SAT_A, GS_Y->SAT_A, GS_Z->SAT_B
-        gsl_visibility = [
-            (100, SAT_A),  # GS X (idx 0) attached to Sat A
-            (100, SAT_A),  # GS Y (idx 1) attached to Sat A
-            (100, SAT_B),  # GS Z (idx 2) attached to Sat B
-        ]
+        cls.current_time = Time("2000-01-01 00:00:00", scale="tdb")
+        pool = _zero_ground_stations([*range(100, 104), *range(105, 110)])
+        cls.ground_stations_by_id = {gs.id: gs for gs in pool}
 
-        topology, mock_strategy = self._setup_scenario(
-            satellites, ground_stations, isl_edges, gsl_visibility
-        )
+    def _ground_stations(self, *gs_ids):
+        return [self.ground_stations_by_id[gs_id] for gs_id in gs_ids]
 
-        # --- Call Function ---
-        current_time = Time("2000-01-01 00:00:00", scale="tdb")
-        fstate = calculate_fstate_shortest_path_object_no_gs_relay(
-            topology, ground_stations, mock_strategy, current_time
+    def _setup_scenario(
+        self, satellite_list, ground_station_list, isl_edges_with_weights, gsl_visibility_list
+    ):
+        """
+        Helper to build topology and visibility structures for fstate tests. Scenarios are
+        memoized by their IDs, edges and attachments; every call gets its own copy, and the
+        passed satellites are never written, so tests stay isolated under ``pytest -n auto``.
+        """
+        if len(gsl_visibility_list) != len(ground_station_list):
+            raise ValueError("Length mismatch: gsl_visibility_list vs ground_station_list")
+        signature = (
+            tuple(sat.id for sat in satellite_list),
+            tuple(isl_edges_with_weights),
+            tuple(gsl_visibility_list),
+            tuple(gs.id for gs in ground_station_list),
         )
+        topology, attachments = _build_topology_cached(signature)
+        topology = _clone_topology(topology)
+        mock_strategy = MockGSLAttachmentStrategy(list(attachments))
+        return topology, mock_strategy
 
-        # --- Assertions ---
-        # Sats A, B have 0 ISLs. Sat GSL IF = 0. GS GSL IF = 0.
-        # No paths possible between sats, or between GSs via different sats.
-        expected_fstate = {
-            # Sat -> GS (Only direct GSLs possible)
-            (SAT_A, GS_X): (GS_X, 0, 0),
-            (SAT_A, GS_Y): (GS_Y, 0, 0),
-            (SAT_A, GS_Z): (-1, -1, -1),  # Cannot reach (GS_Z attached to SAT_B, no ISL)
-            (SAT_B, GS_X): (-1, -1, -1),  # Cannot reach (GS_X attached to SAT_A, no ISL)
-            (SAT_B, GS_Y): (-1, -1, -1),  # Cannot reach (GS_Y attached to SAT_A, no ISL)
-            (SAT_B, GS_Z): (GS_Z, 0, 0),
-            # GS -> GS (Only possible if both attached to SAME satellite)
-            (GS_X, GS_Y): (SAT_A, 0, 0),  # Path X->A->Y (both attached to SAT_A)
-            (GS_X, GS_Z): (-1, -1, -1),  # Cannot reach (different satellites, no ISL)
-            (GS_Y, GS_X): (SAT_A, 0, 0),  # Path Y->A->X (both attached to SAT_A)
-            (GS_Y, GS_Z): (-1, -1, -1),  # Cannot reach (different satellites, no ISL)
-            (GS_Z, GS_X): (-1, -1, -1),  # Cannot reach (different satellites, no ISL)
-            (GS_Z, GS_Y): (-1, -1, -1),  # Cannot reach (different satellites, no ISL)
-        }
-        self.assertDictEqual(fstate, expected_fstate)
+    # --- Test Cases ---
+
+    def test_scenarios_match_expected_fstate(self):
+        """The fstate of every scenario in SCENARIOS equals its expected fstate."""
+        for name, scenario in SCENARIOS.items():
+            with self.subTest(scenario=name):
+                ground_stations = self._ground_stations(*scenario.gs_ids)
+                topology, mock_strategy = self._setup_scenario(
+                    [_satellite(sat_id) for sat_id in scenario.sat_ids],
+                    ground_stations,
+                    scenario.isl_edges,
+                    scenario.gsl_visibility,
+                )
+                fstate = calculate_fstate_shortest_path_object_no_gs_relay(
+                    topology, ground_stations, mock_strategy, self.current_time
+                )
+                self.assertFstateEqual(fstate, scenario.expected_fstate)
+                # So does the Dijkstra oracle that larger constellations are checked against
+                self.assertFstateEqual(
+                    _oracle_fstate(topology, ground_stations, mock_strategy.attachments),
+                    scenario.expected_fstate,
+                )
 
     def test_gsl_interface_index_calculation(self):
         """
@@ -605,36 +530,14 @@ class TestFstateCalculationRefactored(unittest.TestCase):
         GS_X = 100
         GS_Y = 101
 
-        # Create Satellite objects (ephem data is mocked, not used for path logic)
-        mock_body = MagicMock(spec=ephem.Body)
+        # Satellite objects (ephem data is mocked, not used for path logic)
         satellites = [
-            Satellite(id=SAT_A, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_B, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_C, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
+            _satellite(SAT_A),
+            _satellite(SAT_B),
+            _satellite(SAT_C),
         ]
         # Create GroundStation objects
-        ground_stations = [
-            GroundStation(
-                gid=GS_X,
-                name="GX",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-            GroundStation(
-                gid=GS_Y,
-                name="GY",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-        ]
+        ground_stations = self._ground_stations(GS_X, GS_Y)
 
         # Define ISLs: A(10) -- B(20) -- C(30)
         # Sat B (20) will have number_isls = 2
@@ -672,7 +575,7 @@ class TestFstateCalculationRefactored(unittest.TestCase):
             self.fail(f"Test setup error: Failed to get satellite or interface mapping: {e}")
 
         # --- Call Function Under Test ---
-        current_time = Time("2000-01-01 00:00:00", scale="tdb")
+        current_time = self.current_time
         fstate = calculate_fstate_shortest_path_object_no_gs_relay(
             topology, ground_stations, mock_strategy, current_time
         )
@@ -682,10 +585,10 @@ class TestFstateCalculationRefactored(unittest.TestCase):
         #    Expected Sat B GSL IF = number_isls = 2.
         #    Expected GS X IF = 0.
         #    Expected tuple: (GS_X, 2, 0) = (100, 2, 0)
-        hop_tuple_sat_gs = fstate.get((SAT_B, GS_X))
-        self.assertIsNotNone(hop_tuple_sat_gs, f"fstate missing for ({SAT_B=}, {GS_X=})")
-        self.assertEqual(
-            hop_tuple_sat_gs,
+        self.assertFstateHop(
+            fstate,
+            SAT_B,
+            GS_X,
             (GS_X, 2, 0),
             "Incorrect hop/IFs for direct Sat->GS (Expecting Sat GSL IF=num_isls=2)",
         )
@@ -695,10 +598,211 @@ class TestFstateCalculationRefactored(unittest.TestCase):
         #    Expected GS X IF = 0.
         #    Expected Sat B Incoming GSL IF = number_isls = 2.
         #    Expected tuple: (SAT_B, 0, 2) = (20, 0, 2)
-        hop_tuple_gs_gs = fstate.get((GS_X, GS_Y))
-        self.assertIsNotNone(hop_tuple_gs_gs, f"fstate missing for ({GS_X=}, {GS_Y=})")
-        self.assertEqual(
-            hop_tuple_gs_gs,
+        self.assertFstateHop(
+            fstate,
+            GS_X,
+            GS_Y,
             (SAT_B, 0, 2),
             "Incorrect hop/IFs for GS->GS via Sat (Expecting Sat GSL IF=num_isls=2)",
         )
+
+    def test_pair_query_matches_full_fstate(self):
+        """A* pair queries must reproduce the all-pairs fstate entries (5 Sats, 4 GS)."""
+        # Diagram (same ISLs as the five satellite scenario, GS 103 detached):
+        #  100(GS)-- 10 -- 13 -- 12 -- 14 -- 11 --101(GS)
+        #                        |
+        #                      102(GS)
+        satellites = [_satellite(sat_id) for sat_id in [10, 11, 12, 13, 14]]
+        ground_stations = self._ground_stations(100, 101, 102, 103)
+        isl_edges = [(10, 13, 600), (11, 14, 300), (12, 13, 400), (12, 14, 400)]
+        gsl_visibility = [(500, 10), (500, 11), (500, 12), None]
+        topology, mock_strategy = self._setup_scenario(
+            satellites, ground_stations, isl_edges, gsl_visibility
+        )
+        current_time = self.current_time
+        full_fstate = calculate_fstate_shortest_path_object_no_gs_relay(
+            topology, ground_stations, mock_strategy, current_time
+        )
+
+        pair_fstate = calculate_fstate_shortest_path_for_pairs(
+            topology, ground_stations, mock_strategy, current_time, list(full_fstate.keys())
+        )
+
+        self.assertFstateEqual(pair_fstate, full_fstate)
+        self.assertFstateHop(pair_fstate, 100, 101, (10, 0, 1))
+        self.assertFstateHop(pair_fstate, 100, 103, -1)
+
+    def test_equal_cost_next_hops_follow_graph_neighbour_order(self):
+        """
+        Among equal-cost next hops the first in graph.neighbors order wins, not the lowest
+        node ID, and edits to the graph after setup are routed over.
+        """
+        # Diagram (all ISLs 100 m, so 10 reaches 12 through 13 and 11 at the same cost):
+        #  100(GS)-- 10 -- 13
+        #            |     |
+        #            11 -- 12 --101(GS)
+        satellites = [_satellite(sat_id) for sat_id in [10, 11, 12, 13]]
+        ground_stations = self._ground_stations(100, 101)
+        isl_edges = [(10, 13, 100), (10, 11, 100), (11, 12, 100), (12, 13, 100)]
+        topology, mock_strategy = self._setup_scenario(
+            satellites, ground_stations, isl_edges, [(500, 10), (500, 12)]
+        )
+        self.assertEqual(list(topology.graph.neighbors(10)), [13, 11])
+
+        fstate = calculate_fstate_shortest_path_object_no_gs_relay(
+            topology, ground_stations, mock_strategy, self.current_time
+        )
+        self.assertFstateHop(fstate, 10, 101, (13, 0, 0))
+
+        topology.graph.edges[10, 13]["weight"] = 150
+        fstate = calculate_fstate_shortest_path_object_no_gs_relay(
+            topology, ground_stations, mock_strategy, self.current_time
+        )
+        self.assertFstateHop(fstate, 10, 101, (11, 1, 0))
+
+    def test_forest_distance_matrix_matches_floyd_warshall(self):
+        """Tree distances on an acyclic ISL graph equal the Floyd-Warshall distances."""
+        graph = nx.Graph()
+        graph.add_nodes_from([0, 1, 2, 3, 4, 5, 6, 7])
+        graph.add_weighted_edges_from(
+            [(0, 1, 5.0), (0, 3, 2.5), (2, 3, 1.0), (3, 4, 7.0), (5, 6, 3.0), (6, 7, 4.0)]
+        )
+        nodelist = sorted(graph.nodes())
+
+        dist_matrix = _forest_distance_matrix(build_weighted_csr(nodelist, graph))
+
+        np.testing.assert_array_equal(
+            dist_matrix, nx.floyd_warshall_numpy(graph, nodelist=nodelist, weight="weight")
+        )
+
+    def test_in_place_floyd_warshall_matches_networkx(self):
+        """The in-place NumPy Floyd-Warshall equals networkx on a cyclic graph."""
+        graph = nx.Graph()
+        graph.add_nodes_from([10, 11, 12, 13, 14, 15])
+        graph.add_weighted_edges_from(
+            [(10, 11, 4.0), (11, 12, 1.5), (12, 13, 2.0), (13, 10, 9.0), (11, 13, 6.0)]
+        )
+        nodelist = sorted(graph.nodes())
+
+        dist_matrix = _floyd_warshall_distance_matrix(build_weighted_csr(nodelist, graph))
+
+        np.testing.assert_array_equal(
+            dist_matrix, nx.floyd_warshall_numpy(graph, nodelist=nodelist, weight="weight")
+        )
+        self.assertTrue(np.isinf(dist_matrix[0, 5]))
+
+    def test_multi_source_dijkstra_matches_floyd_warshall(self):
+        """scipy's Dijkstra from every satellite equals the in-place Floyd-Warshall."""
+        graph = nx.Graph()
+        graph.add_nodes_from([10, 11, 12, 13, 14, 15])
+        graph.add_weighted_edges_from(
+            [(10, 11, 4.0), (11, 12, 1.5), (12, 13, 2.0), (13, 10, 9.0), (11, 13, 6.0)]
+        )
+        isl_csr = build_weighted_csr(sorted(graph.nodes()), graph)
+
+        np.testing.assert_array_equal(
+            _dijkstra_distance_matrix(isl_csr), _floyd_warshall_distance_matrix(isl_csr)
+        )
+
+    def test_target_sources_match_all_pairs_rows(self):
+        """Distances computed from target satellites only equal those rows of the full matrix."""
+        graph = nx.Graph()
+        graph.add_nodes_from([10, 11, 12, 13, 14, 15])
+        graph.add_weighted_edges_from([(10, 13, 600), (11, 14, 300), (12, 13, 400), (12, 14, 400)])
+        isl_csr = build_weighted_csr(sorted(graph.nodes()), graph)
+        targets = [1, 4]
+
+        np.testing.assert_array_equal(
+            _forest_distance_matrix(isl_csr, targets), _forest_distance_matrix(isl_csr)[targets]
+        )
+        graph.add_edge(10, 11, weight=100)
+        isl_csr = build_weighted_csr(sorted(graph.nodes()), graph)
+        np.testing.assert_array_equal(
+            _dijkstra_distance_matrix(isl_csr, targets),
+            _dijkstra_distance_matrix(isl_csr)[targets],
+        )
+
+    def test_bfs_distance_matrix_matches_dijkstra_on_uniform_weights(self):
+        """Hop-count BFS on a cyclic, uniform-weight graph equals Dijkstra's distances."""
+        graph = nx.Graph()
+        graph.add_nodes_from([10, 11, 12, 13, 14, 15])
+        graph.add_weighted_edges_from(
+            [(10, 11, 250), (11, 12, 250), (12, 13, 250), (13, 10, 250), (11, 13, 250)]
+        )
+        isl_csr = build_weighted_csr(sorted(graph.nodes()), graph)
+        sources = [0, 2, 5]
+
+        np.testing.assert_array_equal(
+            _bfs_distance_matrix(isl_csr, sources), _dijkstra_distance_matrix(isl_csr, sources)
+        )
+
+    def test_fstate_runs_one_traversal_pass_from_attached_satellites(self):
+        """
+        One distance pass from the attached satellites per call serves every (src, dst) entry,
+        with no per-pair NetworkX path queries.
+        """
+        scenario = SCENARIOS["five_sat_five_gs"]
+        ground_stations = self._ground_stations(*scenario.gs_ids)
+        topology, mock_strategy = self._setup_scenario(
+            [_satellite(sat_id) for sat_id in scenario.sat_ids],
+            ground_stations,
+            scenario.isl_edges,
+            scenario.gsl_visibility,
+        )
+        patch_rows = mock.patch.object(
+            fstate_calculation, "_distance_rows", wraps=fstate_calculation._distance_rows
+        )
+        patch_path = mock.patch.object(nx, "shortest_path", wraps=nx.shortest_path)
+        patch_sssp = mock.patch.object(
+            nx, "single_source_dijkstra", wraps=nx.single_source_dijkstra
+        )
+        with patch_rows as distance_rows:
+            with patch_path as shortest_path, patch_sssp as sssp:
+                for _ in range(2):
+                    calculate_fstate_shortest_path_object_no_gs_relay(
+                        topology, ground_stations, mock_strategy, self.current_time
+                    )
+
+        # SAT_0, SAT_1 and SAT_2 (positions 0-2) are the only attached satellites
+        self.assertEqual(
+            [call.args[1] for call in distance_rows.call_args_list], [[0, 1, 2], [0, 1, 2]]
+        )
+        shortest_path.assert_not_called()
+        sssp.assert_not_called()
+
+    def test_fstate_matches_dijkstra_oracle_on_grid_constellation(self):
+        """
+        On a constellation too large for the hand-checked tables (12x12 +Grid with distinct
+        ISL lengths, so the Dijkstra path is taken), the fstate equals _oracle_fstate's.
+        """
+        num_orbits, sats_per_orbit = 12, 12
+        rng = np.random.default_rng(7)
+        sat_ids = [10 + sat for sat in range(num_orbits * sats_per_orbit)]
+        isl_edges = []
+        for orbit in range(num_orbits):
+            for sat in range(sats_per_orbit):
+                sat_id = sat_ids[orbit * sats_per_orbit + sat]
+                in_orbit = sat_ids[orbit * sats_per_orbit + (sat + 1) % sats_per_orbit]
+                next_orbit = sat_ids[((orbit + 1) % num_orbits) * sats_per_orbit + sat]
+                isl_edges.append((sat_id, in_orbit, float(rng.uniform(1e6, 2e6))))
+                isl_edges.append((sat_id, next_orbit, float(rng.uniform(1e6, 2e6))))
+        gs_ids = list(range(1000, 1010))
+        ground_stations = list(_zero_ground_stations(gs_ids))
+        attached = rng.choice(sat_ids, size=len(gs_ids) - 1, replace=False).tolist()
+        gsl_visibility = [(float(rng.uniform(5e5, 1e6)), sat_id) for sat_id in attached]
+        gsl_visibility.append(None)  # One detached ground station
+        topology, mock_strategy = self._setup_scenario(
+            [_satellite(sat_id) for sat_id in sat_ids],
+            ground_stations,
+            isl_edges,
+            gsl_visibility,
+        )
+        self.assertGreaterEqual(len(sat_ids), fstate_calculation.SMALL_GRAPH_MAX_NODES)
+
+        fstate = calculate_fstate_shortest_path_object_no_gs_relay(
+            topology, ground_stations, mock_strategy, self.current_time
+        )
+
+        self.assertFstateEqual(
+            fstate, _oracle_fstate(topology, ground_stations, mock_strategy.attachments)
+        )
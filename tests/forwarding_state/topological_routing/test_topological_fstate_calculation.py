@@ -6,12 +6,20 @@ for testing the shortest path routing algorithm, allowing for direct comparison
 of behavior and ensuring correctness.
 """
 
+import copy
+import functools
+import logging
+import types
 import unittest
-from unittest.mock import MagicMock
+from dataclasses import dataclass
+from types import MappingProxyType
+from unittest import mock
 
-import ephem
+import networkx as nx
 
+from leopath import logger
 from leopath.network_state.gsl_attachment.gsl_attachment_interface import GSLAttachmentStrategy
+from leopath.network_state.routing_algorithms.topological_routing import fstate_calculation
 from leopath.network_state.routing_algorithms.topological_routing.fstate_calculation import (
     calculate_fstate_topological_routing_no_gs_relay,
 )
@@ -22,6 +30,180 @@ from leopath.topology.topology import (
     GroundStation,
     LEOTopology,
 )
+from tests.utils.isl_interfaces import assign_isl_interfaces
+
+log = logger.get_logger(__name__)
+
+# Opaque ephemeris stand-in shared by every satellite; the routing never reads the body, so a
+# bare namespace avoids MagicMock's autospec of ephem.Body
+MOCK_BODY = types.SimpleNamespace()
+
+# Ground stations of these scenarios all sit at latitude, longitude and elevation 0:
+# (latitude_degrees_str, longitude_degrees_str, elevation_m, cartesian_x, cartesian_y, cartesian_z)
+_GS_ORIGIN = ("0", "0", 0, 0, 0, 0)
+
+
+def _gs(gid, name):
+    return GroundStation(gid, name, *_GS_ORIGIN)
+
+
+@functools.lru_cache(maxsize=None)
+def _build_scenario(sat_ids, gs, isl_edges, gsl_visibility):
+    """
+    Builds the topology, ground stations and per-ground-station satellites in range of a
+    scenario, with 6GRUPA addresses assigned to the satellites.
+
+    Arguments are tuples as in TopologicalScenario; the result is cached per scenario and must
+    be copied (see _copy_scenario) before routing mutates it.
+    """
+    satellites = [
+        Satellite(id=sat_id, ephem_obj_manual=MOCK_BODY, ephem_obj_direct=MOCK_BODY)
+        for sat_id in sat_ids
+    ]
+    ground_stations = [_gs(gs_id, gs_name) for gs_id, gs_name in gs]
+    constellation_data = ConstellationData(
+        orbits=1,
+        sats_per_orbit=len(satellites),
+        epoch="25001.0",
+        max_gsl_length_m=5000000,
+        max_isl_length_m=5000000,
+        satellites=satellites,
+    )
+    topology = LEOTopology(constellation_data, ground_stations)
+
+    # Add satellite nodes and the ISL edges between them, each in one batch
+    topology.graph.add_nodes_from(sat_ids)
+    sat_id_set = frozenset(sat_ids)
+    valid_edges = []
+    for u_id, v_id, weight in isl_edges:
+        if u_id in sat_id_set and v_id in sat_id_set:
+            valid_edges.append((u_id, v_id, weight))
+        elif log.isEnabledFor(logging.DEBUG):
+            log.debug(f"Test setup: skipping edge ({u_id},{v_id}) - node(s) not found.")
+    topology.graph.add_weighted_edges_from(valid_edges)
+
+    assign_isl_interfaces(topology, [(u_id, v_id) for u_id, v_id, _ in valid_edges])
+    # Shared by every copy (see _copy_scenario), so a stray write fails loudly
+    nx.freeze(topology.graph)
+
+    # Initialize 6GRUPA addresses
+    for sat in satellites:
+        sat.sixgrupa_addr = TopologicalNetworkAddress.set_address_from_orbital_parameters(sat.id)
+
+    if len(gsl_visibility) != len(ground_stations):
+        raise ValueError("Length mismatch: gsl_visibility_list vs ground_station_list")
+
+    # Convert GSL visibility to the expected format for topological routing: a single
+    # attachment per ground station, or none
+    ground_station_satellites_in_range = [
+        [gs_attachment] if gs_attachment and gs_attachment[1] != -1 else []
+        for gs_attachment in gsl_visibility
+    ]
+
+    return topology, ground_stations, ground_station_satellites_in_range
+
+
+def _copy_scenario(scenario):
+    """
+    Copy of a _build_scenario result for routing to write to (satellite forwarding tables,
+    ground station addresses). Routing only reads the graph, so the frozen graph and the
+    ephemeris stand-in are shared instead of copied.
+    """
+    shared = (MOCK_BODY, scenario[0].graph)
+    return copy.deepcopy(scenario, {id(obj): obj for obj in shared})
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_fstate(sat_ids, gs, isl_edges, gsl_visibility):
+    """
+    Read-only topological fstate of a scenario from scratch (t=0, no previous state), computed
+    once per scenario on a copy of _build_scenario's result.
+    """
+    topology, ground_stations, ground_station_satellites_in_range = _copy_scenario(
+        _build_scenario(sat_ids, gs, isl_edges, gsl_visibility)
+    )
+    fstate = calculate_fstate_topological_routing_no_gs_relay(
+        topology,
+        ground_stations,
+        ground_station_satellites_in_range,
+        time_since_epoch_ns=0,  # t=0 for initialization
+        prev_fstate=None,
+        graph_has_changed=True,
+    )
+    return MappingProxyType(fstate)
+
+
+@dataclass(frozen=True)
+class TopologicalScenario:
+    """Satellites, ground stations, ISLs and GSL attachments of a scenario, and its fstate."""
+
+    sat_ids: tuple
+    # (gid, name) per ground station
+    gs: tuple
+    # (sat_id_a, sat_id_b, weight) per ISL
+    isl_edges: tuple
+    # Single (distance, sat_id) attachment per ground station, (-1, -1) for none
+    gsl_visibility: tuple
+    # (sat_id, gs_id) -> fstate value: ("GSL", gs_id) for a direct GSL, else the ISL interface
+    expected_entries: MappingProxyType
+    # (sat_id, gs_id) keys that must not be in the fstate
+    absent_entries: tuple = ()
+
+
+SCENARIOS = MappingProxyType(
+    {
+        #      10 (Sat)
+        #     /  \
+        # 100(GS) 101(GS)
+        "one_sat_two_gs": TopologicalScenario(
+            sat_ids=(10,),
+            gs=((100, "GA"), (101, "GB")),
+            isl_edges=(),
+            # Both GS attached to the same satellite
+            gsl_visibility=((1000, 10), (1000, 10)),
+            expected_entries=MappingProxyType({(10, 100): ("GSL", 100), (10, 101): ("GSL", 101)}),
+        ),
+        # 100(GS) -- 10(Sat) -- 11(Sat) -- 101(GS)
+        "two_sat_two_gs": TopologicalScenario(
+            sat_ids=(10, 11),
+            gs=((100, "GX"), (101, "GY")),
+            isl_edges=((10, 11, 1000),),
+            gsl_visibility=((500, 10), (600, 11)),
+            expected_entries=MappingProxyType(
+                {
+                    (10, 100): ("GSL", 100),
+                    (10, 101): 0,  # Multi-hop via ISL interface 0 to 11
+                    (11, 100): 0,  # Multi-hop via ISL interface 0 to 10
+                    (11, 101): ("GSL", 101),
+                }
+            ),
+        ),
+        # 100(GS) -- 10(Sat) -- 11(Sat) -- 12(Sat) -- 101(GS)
+        "three_sat_linear": TopologicalScenario(
+            sat_ids=(10, 11, 12),
+            gs=((100, "GX"), (101, "GY")),
+            isl_edges=((10, 11, 1000), (11, 12, 1000)),
+            gsl_visibility=((500, 10), (600, 12)),
+            expected_entries=MappingProxyType(
+                {
+                    (10, 100): ("GSL", 100),
+                    (10, 101): 0,  # 10 -> 11 -> 12 -> 101, over 10's only ISL
+                    (12, 100): 0,  # 12 -> 11 -> 10 -> 100, over 12's only ISL
+                    (12, 101): ("GSL", 101),
+                }
+            ),
+        ),
+        # Satellites with no ground station attachments: no satellite-to-GS entries
+        "no_gsl_connectivity": TopologicalScenario(
+            sat_ids=(10, 11),
+            gs=((100, "GX"),),
+            isl_edges=((10, 11, 1000),),
+            gsl_visibility=((-1, -1),),
+            expected_entries=MappingProxyType({}),
+            absent_entries=((10, 100), (11, 100)),
+        ),
+    }
+)
 
 
 class MockGSLAttachmentStrategy(GSLAttachmentStrategy):
@@ -47,352 +229,34 @@ class MockGSLAttachmentStrategy(GSLAttachmentStrategy):
 class TestTopologicalRoutingFstateCalculation(unittest.TestCase):
     """Test cases for topological routing forwarding state calculation."""
 
-    def _setup_scenario(
-        self, satellite_list, ground_station_list, isl_edges_with_weights, gsl_visibility_list
-    ):
-        """Helper to build topology and visibility structures for fstate tests."""
-        constellation_data = ConstellationData(
-            orbits=1,
-            sats_per_orbit=len(satellite_list),
-            epoch="25001.0",
-            max_gsl_length_m=5000000,
-            max_isl_length_m=5000000,
-            satellites=satellite_list,
-        )
-        topology = LEOTopology(constellation_data, ground_station_list)
-        num_isls_per_sat_map = {sat.id: 0 for sat in satellite_list}
-        topology.sat_neighbor_to_if = {}
-
-        # Add satellite nodes to graph
-        for sat in satellite_list:
-            topology.graph.add_node(sat.id)
-            sat.number_isls = 0
-
-        # Add ISL edges and interface mappings
-        for u_id, v_id, weight in isl_edges_with_weights:
-            if topology.graph.has_node(u_id) and topology.graph.has_node(v_id):
-                topology.graph.add_edge(u_id, v_id, weight=weight)
-                u_if = num_isls_per_sat_map[u_id]
-                v_if = num_isls_per_sat_map[v_id]
-                topology.sat_neighbor_to_if[(u_id, v_id)] = u_if
-                topology.sat_neighbor_to_if[(v_id, u_id)] = v_if
-                num_isls_per_sat_map[u_id] += 1
-                num_isls_per_sat_map[v_id] += 1
-            else:
-                print(f"Warning in test setup: Skipping edge ({u_id},{v_id}) - node(s) not found.")
-
-        # Update satellite ISL counts
-        for sat in topology.constellation_data.satellites:
-            sat.number_isls = num_isls_per_sat_map.get(sat.id, 0)
-
-        if len(gsl_visibility_list) != len(ground_station_list):
-            raise ValueError("Length mismatch: gsl_visibility_list vs ground_station_list")
-
-        # Convert GSL visibility to the expected format for topological routing
-        ground_station_satellites_in_range = []
-        for gs_attachment in gsl_visibility_list:
-            if gs_attachment and gs_attachment[1] != -1:
-                # Single attachment per ground station
-                ground_station_satellites_in_range.append([gs_attachment])
-            else:
-                # No attachment
-                ground_station_satellites_in_range.append([])
-
-        return topology, ground_station_satellites_in_range
-
-    def test_one_sat_two_gs_topological(self):
-        """
-        Scenario: 1 Sat (ID 10), 2 GS (IDs 100, 101), GSLs only
-        Tests basic satellite-to-ground communication via direct GSL links.
-        """
-        # Topology:
-        #      10 (Sat)
-        #     /  \
-        # 100(GS) 101(GS)
-
-        SAT_ID = 10
-        GS_A_ID = 100
-        GS_B_ID = 101
-
-        mock_body = MagicMock(spec=ephem.Body)
-        satellites = [Satellite(id=SAT_ID, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body)]
-        ground_stations = [
-            GroundStation(
-                gid=GS_A_ID,
-                name="GA",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-            GroundStation(
-                gid=GS_B_ID,
-                name="GB",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-        ]
-
-        isl_edges = []
-        # Both GS attached to the same satellite
-        gsl_visibility = [(1000, SAT_ID), (1000, SAT_ID)]
-
-        topology, ground_station_satellites_in_range = self._setup_scenario(
-            satellites, ground_stations, isl_edges, gsl_visibility
-        )
-
-        # Initialize 6GRUPA addresses
-        for sat in satellites:
-            sat.sixgrupa_addr = TopologicalNetworkAddress.set_address_from_orbital_parameters(
-                sat.id
-            )
-
-        fstate = calculate_fstate_topological_routing_no_gs_relay(
-            topology,
-            ground_stations,
-            ground_station_satellites_in_range,
-            time_since_epoch_ns=0,  # t=0 for initialization
-            prev_fstate=None,
-            graph_has_changed=True,
-        )
-
-        # Expected: Direct GSL connections for satellite to ground stations
-        expected_entries = {
-            (SAT_ID, GS_A_ID): ("GSL", GS_A_ID),
-            (SAT_ID, GS_B_ID): ("GSL", GS_B_ID),
-        }
-
-        for key, expected_value in expected_entries.items():
-            self.assertIn(key, fstate, f"Missing fstate entry for {key}")
-            self.assertEqual(fstate[key], expected_value, f"Incorrect fstate value for {key}")
-
-    def test_two_sat_two_gs_topological(self):
-        """
-        Scenario: Two satellites connected by ISL, each with one ground station
-        Tests multi-hop routing via ISL.
-        """
-        # Topology: 100(GS) -- 10(Sat) -- 11(Sat) -- 101(GS)
-
-        SAT_A = 10
-        SAT_B = 11
-        GS_X = 100
-        GS_Y = 101
-
-        mock_body = MagicMock(spec=ephem.Body)
-        satellites = [
-            Satellite(id=SAT_A, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_B, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-        ]
-        ground_stations = [
-            GroundStation(
-                gid=GS_X,
-                name="GX",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-            GroundStation(
-                gid=GS_Y,
-                name="GY",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-        ]
-
-        isl_edges = [(SAT_A, SAT_B, 1000)]
-        # GS_X -> SAT_A, GS_Y -> SAT_B
-        gsl_visibility = [(500, SAT_A), (600, SAT_B)]
-
-        topology, ground_station_satellites_in_range = self._setup_scenario(
-            satellites, ground_stations, isl_edges, gsl_visibility
+    def _setup_scenario(self, sat_ids, gs, isl_edges, gsl_visibility):
+        """Topology, ground stations and GSL visibility of a scenario, see _build_scenario."""
+        scenario = _build_scenario(
+            tuple(sat_ids), tuple(gs), tuple(isl_edges), tuple(gsl_visibility)
         )
+        # Each test gets its own copy of the cached scenario to route on
+        return _copy_scenario(scenario)
 
-        # Initialize 6GRUPA addresses
-        for sat in satellites:
-            sat.sixgrupa_addr = TopologicalNetworkAddress.set_address_from_orbital_parameters(
-                sat.id
-            )
-
-        fstate = calculate_fstate_topological_routing_no_gs_relay(
-            topology,
-            ground_stations,
-            ground_station_satellites_in_range,
-            time_since_epoch_ns=0,
-            prev_fstate=None,
-            graph_has_changed=True,
+    def _check_scenario(self, scenario):
+        """The fstate of scenario has its expected and no absent entries."""
+        fstate = _cached_fstate(
+            scenario.sat_ids, scenario.gs, scenario.isl_edges, scenario.gsl_visibility
         )
 
-        # Expected: Direct and multi-hop paths
-        expected_entries = {
-            (SAT_A, GS_X): ("GSL", GS_X),  # Direct GSL
-            (SAT_A, GS_Y): 0,  # Multi-hop via ISL interface 0 to SAT_B
-            (SAT_B, GS_X): 0,  # Multi-hop via ISL interface 0 to SAT_A
-            (SAT_B, GS_Y): ("GSL", GS_Y),  # Direct GSL
-        }
-
-        for key, expected_value in expected_entries.items():
-            self.assertIn(key, fstate, f"Missing fstate entry for {key}")
-            self.assertEqual(fstate[key], expected_value, f"Incorrect fstate value for {key}")
-
-    def test_three_sat_linear_topology(self):
-        """
-        Scenario: Three satellites in a line with ground stations at the ends
-        Tests multi-hop routing through intermediate satellites.
-        """
-        # Topology: 100(GS) -- 10(Sat) -- 11(Sat) -- 12(Sat) -- 101(GS)
-
-        SAT_A = 10
-        SAT_B = 11
-        SAT_C = 12
-        GS_X = 100
-        GS_Y = 101
-
-        mock_body = MagicMock(spec=ephem.Body)
-        satellites = [
-            Satellite(id=SAT_A, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_B, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_C, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-        ]
-        ground_stations = [
-            GroundStation(
-                gid=GS_X,
-                name="GX",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-            GroundStation(
-                gid=GS_Y,
-                name="GY",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-        ]
-
-        isl_edges = [(SAT_A, SAT_B, 1000), (SAT_B, SAT_C, 1000)]
-        # GS_X -> SAT_A, GS_Y -> SAT_C
-        gsl_visibility = [(500, SAT_A), (600, SAT_C)]
-
-        topology, ground_station_satellites_in_range = self._setup_scenario(
-            satellites, ground_stations, isl_edges, gsl_visibility
-        )
-
-        # Initialize 6GRUPA addresses
-        for sat in satellites:
-            sat.sixgrupa_addr = TopologicalNetworkAddress.set_address_from_orbital_parameters(
-                sat.id
-            )
-
-        fstate = calculate_fstate_topological_routing_no_gs_relay(
-            topology,
-            ground_stations,
-            ground_station_satellites_in_range,
-            time_since_epoch_ns=0,
-            prev_fstate=None,
-            graph_has_changed=True,
-        )
-
-        # Expected: Direct paths and 2-hop paths
-        expected_entries = {
-            (SAT_A, GS_X): ("GSL", GS_X),  # Direct GSL
-            (SAT_A, GS_Y): 0,  # Multi-hop: SAT_A -> SAT_B -> SAT_C -> GS_Y
-            (SAT_C, GS_X): 0,  # Multi-hop: SAT_C -> SAT_B -> SAT_A -> GS_X
-            (SAT_C, GS_Y): ("GSL", GS_Y),  # Direct GSL
-        }
-
-        for key, expected_value in expected_entries.items():
-            self.assertIn(key, fstate, f"Missing fstate entry for {key}")
-            if expected_value != 0:  # Skip interface checks for simplicity
-                self.assertEqual(fstate[key], expected_value, f"Incorrect fstate value for {key}")
-
-    def test_no_gsl_connectivity(self):
-        """
-        Scenario: Satellites with no ground station attachments
-        Tests behavior when no GSL connectivity exists.
-        """
-        SAT_A = 10
-        SAT_B = 11
-        GS_X = 100
-
-        mock_body = MagicMock(spec=ephem.Body)
-        satellites = [
-            Satellite(id=SAT_A, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_B, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-        ]
-        ground_stations = [
-            GroundStation(
-                gid=GS_X,
-                name="GX",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-        ]
-
-        isl_edges = [(SAT_A, SAT_B, 1000)]
-        # No GSL attachments
-        gsl_visibility = [(-1, -1)]
-
-        topology, ground_station_satellites_in_range = self._setup_scenario(
-            satellites, ground_stations, isl_edges, gsl_visibility
-        )
-
-        # Initialize 6GRUPA addresses
-        for sat in satellites:
-            sat.sixgrupa_addr = TopologicalNetworkAddress.set_address_from_orbital_parameters(
-                sat.id
-            )
-
-        fstate = calculate_fstate_topological_routing_no_gs_relay(
-            topology,
-            ground_stations,
-            ground_station_satellites_in_range,
-            time_since_epoch_ns=0,
-            prev_fstate=None,
-            graph_has_changed=True,
-        )
-
-        # Expected: No satellite-to-GS entries since no GSL connectivity
-        for sat_id in [SAT_A, SAT_B]:
-            self.assertNotIn(
-                (sat_id, GS_X),
-                fstate,
-                f"Unexpected fstate entry for satellite {sat_id} to GS {GS_X}",
-            )
+        # One comparison each; the diff lists every missing or incorrect entry at once
+        expected_entries = dict(scenario.expected_entries)
+        self.assertEqual({key: fstate.get(key) for key in expected_entries}, expected_entries)
+        self.assertFalse(set(scenario.absent_entries) & fstate.keys())
 
     def test_topological_address_assignment(self):
         """
         Test that 6GRUPA addresses are correctly assigned to satellites
         """
-        mock_body = MagicMock(spec=ephem.Body)
         satellites = [
-            Satellite(id=0, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=1, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=50, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=100, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
+            Satellite(id=0, ephem_obj_manual=MOCK_BODY, ephem_obj_direct=MOCK_BODY),
+            Satellite(id=1, ephem_obj_manual=MOCK_BODY, ephem_obj_direct=MOCK_BODY),
+            Satellite(id=50, ephem_obj_manual=MOCK_BODY, ephem_obj_direct=MOCK_BODY),
+            Satellite(id=100, ephem_obj_manual=MOCK_BODY, ephem_obj_direct=MOCK_BODY),
         ]
 
         # Test address assignment
@@ -423,28 +287,13 @@ class TestTopologicalRoutingFstateCalculation(unittest.TestCase):
         SAT_B = 11
         SAT_C = 12
 
-        mock_body = MagicMock(spec=ephem.Body)
-        satellites = [
-            Satellite(id=SAT_A, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_B, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_C, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-        ]
-        ground_stations = []
-
         # Create a triangle topology
         isl_edges = [(SAT_A, SAT_B, 1000), (SAT_B, SAT_C, 1000), (SAT_C, SAT_A, 1000)]
-        gsl_visibility = []
 
-        topology, ground_station_satellites_in_range = self._setup_scenario(
-            satellites, ground_stations, isl_edges, gsl_visibility
+        topology, ground_stations, ground_station_satellites_in_range = self._setup_scenario(
+            [SAT_A, SAT_B, SAT_C], [], isl_edges, []
         )
 
-        # Initialize addresses and run algorithm
-        for sat in satellites:
-            sat.sixgrupa_addr = TopologicalNetworkAddress.set_address_from_orbital_parameters(
-                sat.id
-            )
-
         calculate_fstate_topological_routing_no_gs_relay(
             topology,
             ground_stations,
@@ -455,7 +304,7 @@ class TestTopologicalRoutingFstateCalculation(unittest.TestCase):
         )
 
         # Check that forwarding tables were populated
-        for sat in satellites:
+        for sat in topology.get_satellites():
             self.assertIsNotNone(
                 sat.forwarding_table, f"Satellite {sat.id} should have a forwarding table"
             )
@@ -471,56 +320,44 @@ class TestTopologicalRoutingFstateCalculation(unittest.TestCase):
         SAT_A = 10
         GS_X = 100
 
-        mock_body = MagicMock(spec=ephem.Body)
-        satellites = [Satellite(id=SAT_A, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body)]
-        ground_stations = [
-            GroundStation(
-                gid=GS_X,
-                name="GX",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-        ]
-
-        isl_edges = []
-        gsl_visibility = [(500, SAT_A)]
-
-        topology, ground_station_satellites_in_range = self._setup_scenario(
-            satellites, ground_stations, isl_edges, gsl_visibility
+        topology, ground_stations, ground_station_satellites_in_range = self._setup_scenario(
+            [SAT_A], [(GS_X, "GX")], [], [(500, SAT_A)]
         )
 
-        # Initialize addresses
-        for sat in satellites:
-            sat.sixgrupa_addr = TopologicalNetworkAddress.set_address_from_orbital_parameters(
-                sat.id
-            )
-
-        # First run - compute initial state
-        fstate1 = calculate_fstate_topological_routing_no_gs_relay(
-            topology,
-            ground_stations,
-            ground_station_satellites_in_range,
-            time_since_epoch_ns=0,
-            prev_fstate=None,
-            graph_has_changed=True,
+        # Count the routing passes: the reused state must not run them again
+        patch_changes = mock.patch.object(
+            fstate_calculation, "_detect_gsl_changes", wraps=fstate_calculation._detect_gsl_changes
         )
-
-        # Second run - should reuse previous state
-        fstate2 = calculate_fstate_topological_routing_no_gs_relay(
-            topology,
-            ground_stations,
-            ground_station_satellites_in_range,
-            time_since_epoch_ns=1000,  # Different time
-            prev_fstate=fstate1,
-            graph_has_changed=False,  # Graph hasn't changed
+        patch_routing = mock.patch.object(
+            fstate_calculation,
+            "_calculate_sat_to_gs_fstate",
+            wraps=fstate_calculation._calculate_sat_to_gs_fstate,
         )
+        with patch_changes as detect_gsl_changes, patch_routing as calculate_sat_to_gs_fstate:
+            # First run - compute initial state
+            fstate1 = calculate_fstate_topological_routing_no_gs_relay(
+                topology,
+                ground_stations,
+                ground_station_satellites_in_range,
+                time_since_epoch_ns=0,
+                prev_fstate=None,
+                graph_has_changed=True,
+            )
 
-        # Should return the same state object (optimization)
+            # Second run - should reuse previous state
+            fstate2 = calculate_fstate_topological_routing_no_gs_relay(
+                topology,
+                ground_stations,
+                ground_station_satellites_in_range,
+                time_since_epoch_ns=1000,  # Different time
+                prev_fstate=fstate1,
+                graph_has_changed=False,  # Graph hasn't changed
+            )
+
+        # Should return the same state object (optimization), without recomputing it
         self.assertIs(fstate2, fstate1, "Should reuse previous state when graph hasn't changed")
+        self.assertEqual(detect_gsl_changes.call_count, 1)
+        self.assertEqual(calculate_sat_to_gs_fstate.call_count, 1)
 
     def test_gsl_renumbering_functionality(self):
         """
@@ -530,10 +367,9 @@ class TestTopologicalRoutingFstateCalculation(unittest.TestCase):
         SAT_A = 10
         SAT_B = 11
 
-        mock_body = MagicMock(spec=ephem.Body)
         satellites = [
-            Satellite(id=SAT_A, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
-            Satellite(id=SAT_B, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
+            Satellite(id=SAT_A, ephem_obj_manual=MOCK_BODY, ephem_obj_direct=MOCK_BODY),
+            Satellite(id=SAT_B, ephem_obj_manual=MOCK_BODY, ephem_obj_direct=MOCK_BODY),
         ]
 
         # Create ground stations
@@ -541,26 +377,8 @@ class TestTopologicalRoutingFstateCalculation(unittest.TestCase):
         GS_Y = 101
 
         ground_stations = [
-            GroundStation(
-                gid=GS_X,
-                name="GS_X",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-            GroundStation(
-                gid=GS_Y,
-                name="GS_Y",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
+            _gs(GS_X, "GS_X"),
+            _gs(GS_Y, "GS_Y"),
         ]
 
         # Create topology
@@ -657,26 +475,8 @@ class TestTopologicalRoutingFstateCalculation(unittest.TestCase):
         """
         # Create ground stations
         ground_stations = [
-            GroundStation(
-                gid=100,
-                name="GS1",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
-            GroundStation(
-                gid=101,
-                name="GS2",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            ),
+            _gs(100, "GS1"),
+            _gs(101, "GS2"),
         ]
 
         from leopath.network_state.routing_algorithms.topological_routing.fstate_calculation import (
@@ -724,24 +524,14 @@ class TestTopologicalRoutingFstateCalculation(unittest.TestCase):
         # Create satellites
         SAT_A = 20
 
-        mock_body = MagicMock(spec=ephem.Body)
         satellites = [
-            Satellite(id=SAT_A, ephem_obj_manual=mock_body, ephem_obj_direct=mock_body),
+            Satellite(id=SAT_A, ephem_obj_manual=MOCK_BODY, ephem_obj_direct=MOCK_BODY),
         ]
 
         # Create multiple ground stations
         ground_stations = []
         for i in range(5):  # 5 GSs
-            gs = GroundStation(
-                gid=200 + i,
-                name=f"GS_{i}",
-                latitude_degrees_str="0",
-                longitude_degrees_str="0",
-                elevation_m_float=0,
-                cartesian_x=0,
-                cartesian_y=0,
-                cartesian_z=0,
-            )
+            gs = _gs(200 + i, f"GS_{i}")
             ground_stations.append(gs)
 
         # Create topology
@@ -761,12 +551,11 @@ class TestTopologicalRoutingFstateCalculation(unittest.TestCase):
         )
 
         from leopath.network_state.routing_algorithms.topological_routing.fstate_calculation import (
-            _perform_renumbering_for_gs,
+            _perform_renumbering_batch,
         )
 
         # Attach all GSs to the same satellite
-        for gs in ground_stations:
-            _perform_renumbering_for_gs(gs, None, SAT_A, topology)
+        _perform_renumbering_batch([(gs, None, SAT_A) for gs in ground_stations], topology)
 
         # Check that all GSs have unique subnet_index values
         subnet_indices = set()
@@ -850,5 +639,18 @@ class TestTopologicalRoutingFstateCalculation(unittest.TestCase):
         self.assertEqual(dist_0_to_1, dist_0_to_127, "Plane wraparound should make distances equal")
 
 
+def _scenario_test(name):
+    def test(self):
+        self._check_scenario(SCENARIOS[name])
+
+    test.__name__ = f"test_{name}"
+    test.__doc__ = f"The fstate of the {name} scenario has its expected and no absent entries."
+    return test
+
+
+# One test method per scenario, so each one is collected and reported on its own
+for _name in SCENARIOS:
+    setattr(TestTopologicalRoutingFstateCalculation, f"test_{_name}", _scenario_test(_name))
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,9 +1,9 @@
 # tests/dynamic_state/test_algorithm_free_one_only_over_isls.py
 
+import types
 import unittest
 from unittest.mock import MagicMock, patch
 
-import ephem
 from astropy.time import Time
 
 from leopath.network_state.gsl_attachment.gsl_attachment_interface import GSLAttachmentStrategy
@@ -76,7 +76,8 @@ class TestAlgorithmFreeOneOnlyOverIsls(unittest.TestCase):
         self.total_nodes = self.num_sats + self.num_gs
 
         # Create mock satellites
-        self.mock_body = MagicMock(spec=ephem.Body)
+        # Opaque ephemeris stand-in, the algorithm never reads the body
+        self.mock_body = types.SimpleNamespace()
         self.sat0 = Satellite(
             id=0, ephem_obj_manual=self.mock_body, ephem_obj_direct=self.mock_body
         )
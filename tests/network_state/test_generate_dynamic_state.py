@@ -1,14 +1,15 @@
 import unittest
-from unittest.mock import MagicMock, call, patch
+from unittest.mock import ANY, MagicMock, call, patch
 
 import ephem
 import networkx as nx
+import numpy as np
 
 # Use a fixed time for reproducibility instead of relying on current time
 from astropy.time import Time
 
 from leopath import logger
-from leopath.network_state import generate_network_state
+from leopath.network_state import generate_network_state, helpers
 from leopath.network_state.helpers import (
     _compute_isls,
 )
@@ -224,6 +225,32 @@ class TestDynamicStateGeneratorUpdated(unittest.TestCase):
             )
         self.assertIn("exceeded the maximum ISL length", str(cm.exception))
 
+    def test_compute_isls_from_positions_checks_squared_lengths(self):
+        """Test _compute_isls with propagated positions: lengths, weights and the length limit."""
+        satellite_positions_m = np.zeros((self.num_sats, 3))
+        satellite_positions_m[1, 0] = self.max_isl_m - 1000
+        satellite_positions_m[2, 0] = self.max_isl_m - 1000
+        satellite_positions_m[2, 1] = 3000.0
+        topology = MockLEOTopologyRefined(self.constellation_data, [])
+
+        _compute_isls(
+            topology, self.undirected_isls, self.current_time_absolute, satellite_positions_m
+        )
+
+        self.mock_distance_tools.distance_m_between_satellites.assert_not_called()
+        self.assertAlmostEqual(topology.graph.edges[0, 1]["weight"], self.max_isl_m - 1000)
+        self.assertAlmostEqual(topology.graph.edges[1, 2]["weight"], 3000.0)
+
+        satellite_positions_m[2, 1] = self.max_isl_m + 1000
+        with self.assertRaises(ValueError) as cm:
+            _compute_isls(
+                MockLEOTopologyRefined(self.constellation_data, []),
+                self.undirected_isls,
+                self.current_time_absolute,
+                satellite_positions_m,
+            )
+        self.assertIn("(1 and 2)", str(cm.exception))
+
     def test_build_topologies(self):
         """Test _build_topologies creates graphs via the Patched LEOTopology."""
         topo_isl, topo_gsl = generate_network_state._build_topologies(
@@ -330,6 +357,39 @@ class TestDynamicStateGeneratorUpdated(unittest.TestCase):
 
             self.assertEqual(topology.graph.number_of_edges(), len(expected_edges_in_test))
 
+    def test_compute_ground_station_satellites_in_range_skips_far_pairs(self):
+        """Pairs far out of range at the previous step are not propagated again."""
+        far_dist = self.max_gsl_m + 100 * 1000  # Cannot close 100 km in one second
+        in_range_dist = self.max_gsl_m - 1000
+        self.mock_distance_tools.distance_m_ground_station_to_satellite.side_effect = (
+            lambda gs_obj, sat_obj, epoch_str, time_str: (
+                in_range_dist if sat_obj.id == 0 else far_dist
+            )
+        )
+        prev_topology = MockLEOTopologyRefined(self.constellation_data, self.ground_stations)
+        prev_topology.time_since_epoch_ns = 0
+        generate_network_state._compute_ground_station_satellites_in_range(
+            prev_topology, self.current_time_absolute
+        )
+        self.mock_distance_tools.distance_m_ground_station_to_satellite.reset_mock()
+
+        topology = MockLEOTopologyRefined(self.constellation_data, self.ground_stations)
+        topology.time_since_epoch_ns = 10**9
+        visibility = generate_network_state._compute_ground_station_satellites_in_range(
+            topology, self.current_time_absolute, prev_topology=prev_topology
+        )
+
+        # Only the satellite that was in range is propagated again, once per ground station
+        self.assertEqual(
+            self.mock_distance_tools.distance_m_ground_station_to_satellite.call_count,
+            len(self.ground_stations),
+        )
+        self.assertEqual(visibility, [[(in_range_dist, 0)]] * len(self.ground_stations))
+        self.assertAlmostEqual(
+            topology.gsl_lengths_m[(self.gs1_id, 1)],
+            far_dist - 10**9 / 1e9 * helpers.MAX_RELATIVE_SPEED_M_PER_S,
+        )
+
     def test_generate_dynamic_state_at_unknown_algorithm(self):
         """Test ValueError is raised for an unknown algorithm name."""
         with self.assertRaises(ValueError) as cm:
@@ -388,6 +448,11 @@ class TestDynamicStateGeneratorUpdated(unittest.TestCase):
                 dynamic_state_algorithm=algo_name,
                 prev_output=None,
                 prev_topology=None,
+                time_absolute=ANY,
+                satellite_positions_m=None,
+                isl_csr=ANY,
+                ground_stations_xyz=None,
+                time_jd_fr=ANY,
             ),
             # Call for t=2e9
             call(
@@ -400,10 +465,23 @@ class TestDynamicStateGeneratorUpdated(unittest.TestCase):
                 dynamic_state_algorithm=algo_name,
                 prev_output=mock_state_t1,  # Previous state was the DICT now
                 prev_topology=mock_topo_t1,
+                time_absolute=ANY,
+                satellite_positions_m=None,
+                isl_csr=ANY,
+                ground_stations_xyz=None,
+                time_jd_fr=ANY,
             ),
         ]
         mock_generate_at.assert_has_calls(calls, any_order=False)
         self.assertEqual(mock_generate_at.call_count, 2)
+        for generate_call, time_ns in zip(
+            mock_generate_at.call_args_list, [offset_ns, offset_ns + time_step_ns]
+        ):
+            self.assertAlmostEqual(
+                (generate_call.kwargs["time_absolute"] - self.mock_astropy_epoch).to_value("ns"),
+                time_ns,
+                delta=1,
+            )
 
     def test_generate_dynamic_state_invalid_offset(self):
         """Test ValueError if offset is not a multiple of time_step_ns."""
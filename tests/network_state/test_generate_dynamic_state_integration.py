@@ -1,4 +1,4 @@
-import unittest
+from types import MappingProxyType
 
 import ephem
 from astropy.time import Time
@@ -7,9 +7,122 @@ from leopath.network_state.generate_network_state import (
     generate_dynamic_state,
 )
 from leopath.topology.topology import ConstellationData, GroundStation, Satellite
+from tests.utils.fstate_test_case import FstateTestCase
+
+# Expected state of test_equator_scenario_t0, based on previous runs/manual calculation
+EXPECTED_EQUATOR_FSTATE_T0 = MappingProxyType(
+    {
+        (0, 4): (1, 0, 0),
+        (0, 5): (1, 0, 0),
+        (0, 6): (1, 0, 0),
+        (0, 7): (-1, -1, -1),
+        (1, 4): (2, 1, 0),
+        (1, 5): (5, 2, 0),
+        (1, 6): (2, 1, 0),
+        (1, 7): (-1, -1, -1),
+        (2, 4): (4, 2, 0),
+        (2, 5): (1, 0, 1),
+        (2, 6): (6, 2, 0),
+        (2, 7): (-1, -1, -1),
+        (3, 4): (2, 0, 1),
+        (3, 5): (2, 0, 1),
+        (3, 6): (2, 0, 1),
+        (3, 7): (-1, -1, -1),
+        (4, 5): (2, 0, 2),
+        (4, 6): (2, 0, 2),
+        (4, 7): (-1, -1, -1),
+        (5, 4): (1, 0, 2),
+        (5, 6): (1, 0, 2),
+        (5, 7): (-1, -1, -1),
+        (6, 4): (2, 0, 2),
+        (6, 5): (2, 0, 2),
+        (6, 7): (-1, -1, -1),
+        (7, 4): (-1, -1, -1),
+        (7, 5): (-1, -1, -1),
+        (7, 6): (-1, -1, -1),
+    }
+)
+
+
+# Expected state of test_non_sequential_ids
+EXPECTED_NON_SEQUENTIAL_FSTATE = MappingProxyType(
+    {
+        # Sat 10 -> GS
+        (10, 100): (20, 0, 0),
+        (10, 200): (20, 0, 0),
+        (10, 300): (20, 0, 0),
+        (10, 400): (-1, -1, -1),
+        # Sat 20 -> GS
+        (20, 100): (30, 1, 0),
+        (20, 200): (200, 2, 0),
+        (20, 300): (30, 1, 0),
+        (20, 400): (-1, -1, -1),
+        # Sat 30 -> GS
+        (30, 100): (100, 2, 0),
+        (30, 200): (20, 0, 1),
+        (30, 300): (300, 2, 0),
+        (30, 400): (-1, -1, -1),
+        # Sat 40 -> GS
+        (40, 100): (30, 0, 1),
+        (40, 200): (30, 0, 1),
+        (40, 300): (30, 0, 1),
+        (40, 400): (-1, -1, -1),
+        # GS 100 -> GS
+        (100, 200): (30, 0, 2),
+        (100, 300): (30, 0, 2),
+        (100, 400): (-1, -1, -1),
+        # GS 200 -> GS
+        (200, 100): (20, 0, 2),
+        (200, 300): (20, 0, 2),
+        (200, 400): (-1, -1, -1),
+        # GS 300 -> GS
+        (300, 100): (30, 0, 2),
+        (300, 200): (30, 0, 2),
+        (300, 400): (-1, -1, -1),
+        # GS 400 -> GS
+        (400, 100): (-1, -1, -1),
+        (400, 200): (-1, -1, -1),
+        (400, 300): (-1, -1, -1),
+    }
+)
+
+
+# Expected final state of test_full_loop_short_run
+EXPECTED_FULL_LOOP_FINAL_FSTATE = MappingProxyType(
+    {
+        (10, 100): (20, 0, 0),
+        (10, 200): (20, 0, 0),
+        (10, 300): (20, 0, 0),
+        (10, 400): (-1, -1, -1),
+        (20, 100): (30, 1, 0),
+        (20, 200): (200, 2, 0),
+        (20, 300): (30, 1, 0),
+        (20, 400): (-1, -1, -1),
+        (30, 100): (100, 2, 0),
+        (30, 200): (20, 0, 1),
+        (30, 300): (300, 2, 0),
+        (30, 400): (-1, -1, -1),
+        (40, 100): (30, 0, 1),
+        (40, 200): (30, 0, 1),
+        (40, 300): (30, 0, 1),
+        (40, 400): (-1, -1, -1),
+        (100, 200): (30, 0, 2),
+        (100, 300): (30, 0, 2),
+        (100, 400): (-1, -1, -1),
+        (200, 100): (20, 0, 2),
+        (200, 300): (20, 0, 2),
+        (200, 400): (-1, -1, -1),
+        (300, 100): (30, 0, 2),
+        (300, 200): (30, 0, 2),
+        (300, 400): (-1, -1, -1),
+        (400, 100): (-1, -1, -1),
+        (400, 200): (-1, -1, -1),
+        (400, 300): (-1, -1, -1),
+    }
+)
 
 
-class TestDynamicStateIntegration(unittest.TestCase):
+class TestDynamicStateIntegration(FstateTestCase):
 
     def test_equator_scenario_t0(self):
         """
@@ -143,38 +256,7 @@ class TestDynamicStateIntegration(unittest.TestCase):
         expected_bandwidth = {i: 1.0 for i in range(8)}
         self.assertDictEqual(result_state_dict["bandwidth"], expected_bandwidth)
 
-        expected_fstate = {  # Expected state based on previous runs/manual calculation
-            (0, 4): (1, 0, 0),
-            (0, 5): (1, 0, 0),
-            (0, 6): (1, 0, 0),
-            (0, 7): (-1, -1, -1),
-            (1, 4): (2, 1, 0),
-            (1, 5): (5, 2, 0),
-            (1, 6): (2, 1, 0),
-            (1, 7): (-1, -1, -1),
-            (2, 4): (4, 2, 0),
-            (2, 5): (1, 0, 1),
-            (2, 6): (6, 2, 0),
-            (2, 7): (-1, -1, -1),
-            (3, 4): (2, 0, 1),
-            (3, 5): (2, 0, 1),
-            (3, 6): (2, 0, 1),
-            (3, 7): (-1, -1, -1),
-            (4, 5): (2, 0, 2),
-            (4, 6): (2, 0, 2),
-            (4, 7): (-1, -1, -1),
-            (5, 4): (1, 0, 2),
-            (5, 6): (1, 0, 2),
-            (5, 7): (-1, -1, -1),
-            (6, 4): (2, 0, 2),
-            (6, 5): (2, 0, 2),
-            (6, 7): (-1, -1, -1),
-            (7, 4): (-1, -1, -1),
-            (7, 5): (-1, -1, -1),
-            (7, 6): (-1, -1, -1),
-        }
-        self.maxDiff = None
-        self.assertDictEqual(result_state_dict["fstate"], expected_fstate)
+        self.assertFstateEqual(result_state_dict["fstate"], EXPECTED_EQUATOR_FSTATE_T0)
 
     # In tests/dynamic_state/test_generate_dynamic_state_integration.py
 
@@ -329,48 +411,10 @@ class TestDynamicStateIntegration(unittest.TestCase):
         self.assertDictEqual(result_state_dict["bandwidth"], expected_bandwidth)
 
         # Assert Forwarding state (using the correctly translated dictionary)
-        expected_fstate = {
-            # Sat 10 -> GS
-            (10, 100): (20, 0, 0),
-            (10, 200): (20, 0, 0),
-            (10, 300): (20, 0, 0),
-            (10, 400): (-1, -1, -1),
-            # Sat 20 -> GS
-            (20, 100): (30, 1, 0),
-            (20, 200): (200, 2, 0),
-            (20, 300): (30, 1, 0),
-            (20, 400): (-1, -1, -1),
-            # Sat 30 -> GS
-            (30, 100): (100, 2, 0),
-            (30, 200): (20, 0, 1),
-            (30, 300): (300, 2, 0),
-            (30, 400): (-1, -1, -1),
-            # Sat 40 -> GS
-            (40, 100): (30, 0, 1),
-            (40, 200): (30, 0, 1),
-            (40, 300): (30, 0, 1),
-            (40, 400): (-1, -1, -1),
-            # GS 100 -> GS
-            (100, 200): (30, 0, 2),
-            (100, 300): (30, 0, 2),
-            (100, 400): (-1, -1, -1),
-            # GS 200 -> GS
-            (200, 100): (20, 0, 2),
-            (200, 300): (20, 0, 2),
-            (200, 400): (-1, -1, -1),
-            # GS 300 -> GS
-            (300, 100): (30, 0, 2),
-            (300, 200): (30, 0, 2),
-            (300, 400): (-1, -1, -1),
-            # GS 400 -> GS
-            (400, 100): (-1, -1, -1),
-            (400, 200): (-1, -1, -1),
-            (400, 300): (-1, -1, -1),
-        }
-
-        self.maxDiff = None
-        self.assertDictEqual(
-            result_state_dict["fstate"], expected_fstate, "F-state mismatch for non-sequential IDs."
+        self.assertFstateEqual(
+            result_state_dict["fstate"],
+            EXPECTED_NON_SEQUENTIAL_FSTATE,
+            "F-state mismatch for non-sequential IDs.",
         )
 
     def test_full_loop_short_run(self):
@@ -530,39 +574,8 @@ class TestDynamicStateIntegration(unittest.TestCase):
         # Check fstate is not empty
         self.assertTrue(result_state_dict["fstate"], "Final fstate dictionary is empty")
 
-        expected_final_fstate = {
-            (10, 100): (20, 0, 0),
-            (10, 200): (20, 0, 0),
-            (10, 300): (20, 0, 0),
-            (10, 400): (-1, -1, -1),
-            (20, 100): (30, 1, 0),
-            (20, 200): (200, 2, 0),
-            (20, 300): (30, 1, 0),
-            (20, 400): (-1, -1, -1),
-            (30, 100): (100, 2, 0),
-            (30, 200): (20, 0, 1),
-            (30, 300): (300, 2, 0),
-            (30, 400): (-1, -1, -1),
-            (40, 100): (30, 0, 1),
-            (40, 200): (30, 0, 1),
-            (40, 300): (30, 0, 1),
-            (40, 400): (-1, -1, -1),
-            (100, 200): (30, 0, 2),
-            (100, 300): (30, 0, 2),
-            (100, 400): (-1, -1, -1),
-            (200, 100): (20, 0, 2),
-            (200, 300): (20, 0, 2),
-            (200, 400): (-1, -1, -1),
-            (300, 100): (30, 0, 2),
-            (300, 200): (30, 0, 2),
-            (300, 400): (-1, -1, -1),
-            (400, 100): (-1, -1, -1),
-            (400, 200): (-1, -1, -1),
-            (400, 300): (-1, -1, -1),
-        }
-        self.maxDiff = None  # Show full diff on failure
-        self.assertDictEqual(
+        self.assertFstateEqual(
             result_state_dict["fstate"],
-            expected_final_fstate,
+            EXPECTED_FULL_LOOP_FINAL_FSTATE,
             "Final fstate mismatch after loop",
         )
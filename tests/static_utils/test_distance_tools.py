@@ -2,15 +2,20 @@ import math
 import unittest
 
 import ephem
+import numpy as np
 from astropy import units as u
 from astropy.time import Time
+from sgp4.api import Satrec
 
 from leopath.topology.distance_tools import (
     create_basic_ground_station_for_satellite_shadow,
     distance_m_between_satellites,
+    distance_m_ground_station_to_position,
     distance_m_ground_station_to_satellite,
     geodesic_distance_m_between_ground_stations,
     geodetic2cartesian,
+    geodetic2cartesian_vec,
+    squared_distances_m2_ground_stations_to_positions,
     straight_distance_m_between_ground_stations,
 )
 from leopath.topology.topology import GroundStation, Satellite
@@ -348,3 +353,117 @@ class TestDistanceTools(unittest.TestCase):
         self.assertAlmostEqual(
             calc_straight_dist, straight_shadow_distance_m, delta=20000
         )  # 20km tolerance
+
+    def test_sgp4_backend_matches_ephem(self):
+        tle_18 = (
+            "Telesat-1015 18",
+            "1 00019U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    03",
+            "2 00019  98.9800  13.3333 0000001   0.0000 152.3077 13.66000000    04",
+        )
+        tle_19 = (
+            "Telesat-1015 19",
+            "1 00020U 00000ABC 00001.00000000  .00000000  00000-0  00000+0 0    05",
+            "2 00020  98.9800  13.3333 0000001   0.0000 180.0000 13.66000000    00",
+        )
+        epoch_str_for_ephem = "2000/01/01"
+        time_str_for_ephem = "2000/01/01 00:01:40"
+
+        ephem_sat_18 = ephem.readtle(*tle_18)
+        ephem_sat_19 = ephem.readtle(*tle_19)
+        ephem_sat_obj_18 = Satellite(
+            id=18, ephem_obj_manual=ephem_sat_18, ephem_obj_direct=ephem_sat_18
+        )
+        ephem_sat_obj_19 = Satellite(
+            id=19, ephem_obj_manual=ephem_sat_19, ephem_obj_direct=ephem_sat_19
+        )
+        sgp4_sat_obj_18 = Satellite(
+            id=18,
+            ephem_obj_manual=ephem_sat_18,
+            ephem_obj_direct=Satrec.twoline2rv(tle_18[1], tle_18[2]),
+        )
+        sgp4_sat_obj_19 = Satellite(
+            id=19,
+            ephem_obj_manual=ephem_sat_19,
+            ephem_obj_direct=Satrec.twoline2rv(tle_19[1], tle_19[2]),
+        )
+        self.assertIsNotNone(sgp4_sat_obj_18.position.satrec)
+        self.assertIsNone(ephem_sat_obj_18.position.satrec)
+        self.assertTrue(ephem_sat_obj_18.position.single_propagator)
+        self.assertFalse(sgp4_sat_obj_18.position.single_propagator)
+        self.assertIs(
+            Satellite(id=18, ephem_obj_manual=ephem_sat_18).position.ephem_obj_direct, ephem_sat_18
+        )
+
+        self.assertAlmostEqual(
+            distance_m_between_satellites(
+                sgp4_sat_obj_18, sgp4_sat_obj_19, epoch_str_for_ephem, time_str_for_ephem
+            ),
+            distance_m_between_satellites(
+                ephem_sat_obj_18, ephem_sat_obj_19, epoch_str_for_ephem, time_str_for_ephem
+            ),
+            delta=100,
+        )
+
+        shadow_dict_18 = create_basic_ground_station_for_satellite_shadow(
+            ephem_sat_18, epoch_str_for_ephem, time_str_for_ephem
+        )
+        lat = float(shadow_dict_18["latitude_degrees_str"])
+        lon = float(shadow_dict_18["longitude_degrees_str"])
+        x, y, z = geodetic2cartesian(lat, lon, 0.0)
+        shadow_gs_18 = GroundStation(
+            gid=-1,
+            name=shadow_dict_18["name"],
+            latitude_degrees_str=shadow_dict_18["latitude_degrees_str"],
+            longitude_degrees_str=shadow_dict_18["longitude_degrees_str"],
+            elevation_m_float=0.0,
+            cartesian_x=x,
+            cartesian_y=y,
+            cartesian_z=z,
+        )
+        self.assertAlmostEqual(
+            distance_m_ground_station_to_satellite(
+                shadow_gs_18, sgp4_sat_obj_18, epoch_str_for_ephem, time_str_for_ephem
+            ),
+            1015000,
+            delta=5000,
+        )
+
+    def test_squared_distances_match_per_pair_distances(self):
+        rng = np.random.default_rng(0)
+        satellites_ecef_m = rng.normal(size=(50, 3))
+        satellites_ecef_m *= 7.0e6 / np.linalg.norm(satellites_ecef_m, axis=1)[:, None]
+        lat_degrees = [14.6, 38.9, -33.9, 0.0]
+        lon_degrees = [121.0, 121.6, 151.2, -10.0]
+        elevation_m = [0.0, 10.0, 50.0, 0.0]
+
+        squared_distances_m2 = squared_distances_m2_ground_stations_to_positions(
+            lat_degrees, lon_degrees, elevation_m, satellites_ecef_m
+        )
+
+        self.assertEqual(squared_distances_m2.shape, (4, 50))
+        for gs_idx in range(4):
+            for sat_idx in range(50):
+                expected_m = distance_m_ground_station_to_position(
+                    lat_degrees[gs_idx],
+                    lon_degrees[gs_idx],
+                    elevation_m[gs_idx],
+                    satellites_ecef_m[sat_idx],
+                )
+                if math.isinf(expected_m):
+                    self.assertTrue(math.isinf(squared_distances_m2[gs_idx, sat_idx]))
+                else:
+                    self.assertAlmostEqual(
+                        math.sqrt(squared_distances_m2[gs_idx, sat_idx]), expected_m, delta=1e-6
+                    )
+
+    def test_geodetic2cartesian_vec_matches_scalar(self):
+        lats_degrees = [14.6042, 38.913811, 59.929858, -90.0]
+        lons_degrees = [120.9822, 121.602322, 30.326228, 0.0]
+        eles_m = [0.0, 12.5, 3.0, 2800.0]
+
+        x, y, z = geodetic2cartesian_vec(lats_degrees, lons_degrees, eles_m)
+
+        for i in range(len(lats_degrees)):
+            expected = geodetic2cartesian(lats_degrees[i], lons_degrees[i], eles_m[i])
+            for actual_m, expected_m in zip((x[i], y[i], z[i]), expected):
+                self.assertAlmostEqual(actual_m, expected_m, delta=1e-6)
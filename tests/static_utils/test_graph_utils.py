@@ -1,7 +1,15 @@
 import networkx as nx
+import numpy as np
 import pytest
 
-from leopath.network_state.utils.graph import validate_no_satellite_to_gs_links
+from leopath.network_state.utils.graph import (
+    build_isl_csr,
+    build_weighted_csr,
+    csr_interface_indices,
+    isl_interface_indices,
+    iter_isl_csr,
+    validate_no_satellite_to_gs_links,
+)
 from leopath.topology.topology import GroundStation, Satellite
 
 
@@ -76,3 +84,85 @@ def test_validate_no_satellite_to_gs_links_empty_graph():
 
     # Validate the empty graph
     validate_no_satellite_to_gs_links(graph, satellites, ground_stations)
+
+
+def test_build_isl_csr_preserves_isl_order():
+    undirected_isls = [(0, 1), (0, 3), (2, 3), (3, 4)]
+    indptr, indices, isl_entries = build_isl_csr(undirected_isls, num_nodes=6)
+
+    assert indptr.dtype == np.int32 and indices.dtype == np.int32
+    np.testing.assert_array_equal(indptr, [0, 2, 2, 3, 4, 4, 4])
+    np.testing.assert_array_equal(indices, [1, 3, 3, 4])
+    assert list(iter_isl_csr((indptr, indices, isl_entries))) == undirected_isls
+
+
+def test_iter_isl_csr_keeps_order_of_isls_not_grouped_by_first_endpoint():
+    undirected_isls = [(0, 1), (2, 3), (0, 3)]
+    isl_csr = build_isl_csr(undirected_isls)
+
+    assert list(iter_isl_csr(isl_csr)) == undirected_isls
+    # Satellite 3 gets interface 0 towards 2 and interface 1 towards 0, as without the CSR
+    _, if_b, _ = isl_interface_indices(list(iter_isl_csr(isl_csr)))
+    assert if_b.tolist() == [0, 0, 1]
+
+
+def test_build_isl_csr_rejects_too_few_nodes():
+    with pytest.raises(ValueError):
+        build_isl_csr([(0, 5)], num_nodes=3)
+
+
+def test_build_weighted_csr_is_symmetric_in_graph_neighbour_order():
+    graph = nx.Graph()
+    graph.add_weighted_edges_from(
+        [(13, 10, 1.5), (10, 12, 2.0), (11, 10, 4.0), (10, 12, 3.0), (12, 99, 7.0)]
+    )
+    node_ids = [10, 11, 12, 13]
+    indptr, indices, weights = build_weighted_csr(node_ids, graph)
+
+    assert indptr.dtype == np.int32 and indices.dtype == np.int32
+    np.testing.assert_array_equal(indptr, [0, 3, 4, 5, 6])
+    # Node 10 (row 0) sees 13, 12, 11 as graph.neighbors does; node 99 is not in node_ids
+    np.testing.assert_array_equal(indices, [3, 2, 1, 0, 0, 0])
+    np.testing.assert_array_equal(weights, [1.5, 3.0, 4.0, 4.0, 3.0, 1.5])
+    for row, node_id in enumerate(node_ids):
+        neighbors = [node_ids[idx] for idx in indices[indptr[row] : indptr[row + 1]]]
+        assert neighbors == [n for n in graph.neighbors(node_id) if n in node_ids]
+
+
+def test_isl_interface_indices_match_edge_by_edge_assignment():
+    isl_pairs = [(3, 1), (1, 2), (2, 3), (1, 7)]
+    if_a, if_b, num_isls_per_sat = isl_interface_indices(isl_pairs)
+
+    expected_if_a, expected_if_b, counts = [], [], {}
+    for a, b in isl_pairs:
+        expected_if_a.append(counts.get(a, 0))
+        counts[a] = counts.get(a, 0) + 1
+        expected_if_b.append(counts.get(b, 0))
+        counts[b] = counts.get(b, 0) + 1
+    np.testing.assert_array_equal(if_a, expected_if_a)
+    np.testing.assert_array_equal(if_b, expected_if_b)
+    assert num_isls_per_sat == counts
+
+    empty_a, empty_b, empty_counts = isl_interface_indices([])
+    assert len(empty_a) == len(empty_b) == 0 and empty_counts == {}
+
+
+def test_csr_interface_indices_are_aligned_with_csr_entries():
+    node_ids = [10, 11, 12]
+    isl_pairs = [(12, 10), (10, 11)]
+    if_a, if_b, _ = isl_interface_indices(isl_pairs)
+    sat_neighbor_to_if = dict(zip(isl_pairs, if_a.tolist()))
+    sat_neighbor_to_if.update(zip(((b, a) for a, b in isl_pairs), if_b.tolist()))
+    graph = nx.Graph()
+    graph.add_edges_from(isl_pairs, weight=1.0)
+    isl_csr = build_weighted_csr(node_ids, graph)
+
+    local, remote = csr_interface_indices(node_ids, isl_csr, sat_neighbor_to_if)
+
+    assert local.dtype == np.int8 and remote.dtype == np.int8
+    indptr, indices, _ = isl_csr
+    for row, node_id in enumerate(node_ids):
+        for edge_idx in range(indptr[row], indptr[row + 1]):
+            neighbor_id = node_ids[indices[edge_idx]]
+            assert local[edge_idx] == sat_neighbor_to_if[(node_id, neighbor_id)]
+            assert remote[edge_idx] == sat_neighbor_to_if[(neighbor_id, node_id)]
@@ -0,0 +1,27 @@
+import unittest
+
+import numpy as np
+
+from leopath.network_state.utils.gsl_interfaces import GSL_INTERFACE_DTYPE, gsl_interfaces_array
+
+
+class TestGslInterfacesArray(unittest.TestCase):
+
+    def test_list_of_dicts_is_converted_by_position(self):
+        gsl_interfaces = gsl_interfaces_array(
+            [
+                {"id": 0, "number_of_interfaces": 2, "aggregate_max_bandwidth": 0.1},
+                {"number_of_interfaces": 1},
+                {"id": 20, "aggregate_max_bandwidth": 3.0},
+            ]
+        )
+
+        self.assertEqual(gsl_interfaces.dtype, GSL_INTERFACE_DTYPE)
+        self.assertEqual(gsl_interfaces["id"].tolist(), [0, 1, 20])
+        self.assertEqual(gsl_interfaces["number_of_interfaces"].tolist(), [2, 1, 0])
+        self.assertEqual(gsl_interfaces["aggregate_max_bandwidth"].tolist(), [0.1, 0.0, 3.0])
+
+    def test_structured_array_is_passed_through(self):
+        gsl_interfaces = np.zeros(4, dtype=GSL_INTERFACE_DTYPE)
+        self.assertIs(gsl_interfaces_array(gsl_interfaces), gsl_interfaces)
+        self.assertEqual(len(gsl_interfaces_array([])), 0)
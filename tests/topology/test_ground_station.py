@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+
+from leopath.topology.ground_station import GroundStation
+from tests.utils.ground_stations import GroundStationArray
+
+
+class TestGroundStationArray(unittest.TestCase):
+
+    def setUp(self):
+        self.ground_stations = GroundStationArray(
+            ids=[12, 13],
+            latitudes_degrees=[14.6042, 38.913811],
+            longitudes_degrees=[120.9822, 121.602322],
+            elevations_m=[0.0, 5.0],
+            xyz=[[1.0, 2.0, 3.0], [4.0, 5.0, 6.0]],
+            names=["Manila", "Dalian"],
+        )
+
+    def test_soa_layout(self):
+        self.assertEqual(len(self.ground_stations), 2)
+        self.assertEqual(self.ground_stations.xyz.shape, (2, 3))
+        np.testing.assert_array_equal(self.ground_stations.ids, [12, 13])
+
+    def test_objects_are_built_once_on_access(self):
+        dalian = self.ground_stations[1]
+
+        self.assertIs(self.ground_stations[-1], dalian)
+        self.assertEqual(
+            (dalian.id, dalian.name, dalian.latitude_degrees_str, dalian.elevation_m_float),
+            (13, "Dalian", "38.913811", 5.0),
+        )
+        self.assertEqual((dalian.cartesian_x, dalian.cartesian_y, dalian.cartesian_z), (4, 5, 6))
+        self.assertEqual([gs.id for gs in self.ground_stations], [12, 13])
+        self.assertIs(self.ground_stations[:1][0], self.ground_stations[0])
+
+
+class TestGroundStation(unittest.TestCase):
+
+    def test_decimal_strings_are_parsed_once(self):
+        manila = GroundStation(12, "Manila", "14.6042", "120.9822", 0.0, 1.0, 2.0, 3.0)
+
+        self.assertEqual((manila.latitude_degrees, manila.longitude_degrees), (14.6042, 120.9822))
+        self.assertEqual(
+            (manila.latitude_degrees_str, manila.longitude_degrees_str), ("14.6042", "120.9822")
+        )
+
+    def test_dms_strings_are_accepted_as_by_ephem(self):
+        manila = GroundStation(12, "Manila", "14:36:15", "-120:58:55.92", 0.0, 1.0, 2.0, 3.0)
+
+        self.assertAlmostEqual(manila.latitude_degrees, 14.604166667, places=8)
+        self.assertAlmostEqual(manila.longitude_degrees, -120.9822, places=8)
+        self.assertEqual(manila.latitude_degrees_str, "14:36:15")
@@ -125,6 +125,13 @@ class TestGSLAttachmentFactory(unittest.TestCase):
         self.assertIn("mock_strategy", strategies)
         self.assertEqual(len(strategies), 1)
 
+    def test_factory_register_strategy_is_idempotent(self):
+        """Test that registering the same strategy twice keeps a single entry."""
+        GSLAttachmentFactory.register_strategy(MockGSLAttachmentStrategy)
+        GSLAttachmentFactory.register_strategy(MockGSLAttachmentStrategy)
+
+        self.assertEqual(GSLAttachmentFactory.list_strategies(), ["mock_strategy"])
+
     def test_factory_get_strategy(self):
         """Test retrieving a strategy from the factory."""
         # Register a strategy first
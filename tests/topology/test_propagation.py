@@ -0,0 +1,58 @@
+import unittest
+
+import numpy as np
+from astropy import units as u
+from astropy.time import Time
+
+from leopath.topology.satellite import propagation
+
+
+class TestPropagation(unittest.TestCase):
+
+    def test_cached_rotation_matches_vectorized_rotation(self):
+        jd, fr = 2451544.5, 0.25
+        positions_teme_m = np.array([[7.0e6, 0.0, 0.0], [1.0e6, -6.5e6, 2.0e6]])
+
+        ecef_scalar = propagation.teme_to_ecef_m(positions_teme_m, jd, fr)
+        ecef_vector = propagation.teme_to_ecef_m(positions_teme_m, np.full(2, jd), np.full(2, fr))
+
+        np.testing.assert_allclose(ecef_scalar, ecef_vector, rtol=0, atol=1e-6)
+        np.testing.assert_allclose(
+            np.linalg.norm(ecef_scalar, axis=1), np.linalg.norm(positions_teme_m, axis=1)
+        )
+
+    def test_batched_rotation_matches_per_instant_rotation(self):
+        jd = np.full(3, 2451544.5)
+        fr = np.array([0.0, 0.1, 0.7])
+        positions_teme_m = np.random.default_rng(0).uniform(-7.0e6, 7.0e6, size=(4, 3, 3))
+
+        ecef_batch = propagation.teme_to_ecef_m(positions_teme_m, jd, fr)
+
+        self.assertEqual(ecef_batch.shape, positions_teme_m.shape)
+        for time_idx in range(3):
+            np.testing.assert_allclose(
+                ecef_batch[:, time_idx],
+                propagation.teme_to_ecef_m(
+                    positions_teme_m[:, time_idx], jd[time_idx], fr[time_idx]
+                ),
+                rtol=0,
+                atol=1e-6,
+            )
+
+    def test_rotation_is_shared_and_read_only(self):
+        rotation = propagation.teme_to_ecef_rotation(2451544.5, 0.5)
+
+        self.assertIs(propagation.teme_to_ecef_rotation(2451544.5, 0.5), rotation)
+        self.assertFalse(rotation.flags.writeable)
+        np.testing.assert_allclose(rotation @ rotation.T, np.eye(3), atol=1e-15)
+
+    def test_julian_dates_since_epoch_match_per_step_conversion(self):
+        epoch = Time("2000-01-01 00:00:00", scale="tdb")
+        time_since_epoch_ns = [0, 10**9, 3600 * 10**9]
+
+        jd, fr = propagation.julian_dates_since_epoch(epoch, time_since_epoch_ns)
+
+        self.assertEqual(jd.shape, (3,))
+        for step_jd, step_fr, offset_ns in zip(jd, fr, time_since_epoch_ns):
+            expected_jd, expected_fr = propagation.julian_date(epoch + offset_ns * u.ns)
+            self.assertAlmostEqual(step_jd + step_fr, expected_jd + expected_fr, places=9)
@@ -181,3 +181,15 @@ class TestTopologicalNetworkAddress(unittest.TestCase):
         gs_addr = TopologicalNetworkAddress(shell_id=2, plane_id=20, sat_index=15, subnet_index=7)
         self.assertEqual(str(sat_addr), "TopoAddr(sh:1, o:10, s:5, x:Sat)")
         self.assertEqual(str(gs_addr), "TopoAddr(sh:2, o:20, s:15, x:GS[7])")
+
+    def test_address_from_orbital_parameters_is_shared(self):
+        """Addresses from satellite IDs are built once per ID; invalid IDs still raise."""
+        addr = TopologicalNetworkAddress.set_address_from_orbital_parameters(MAX_SATS_PER_PLANE + 3)
+        self.assertEqual(addr, TopologicalNetworkAddress(0, 1, 3, 0))
+        self.assertIs(
+            TopologicalNetworkAddress.set_address_from_orbital_parameters(MAX_SATS_PER_PLANE + 3),
+            addr,
+        )
+        for _ in range(2):
+            with self.assertRaises(ValueError):
+                TopologicalNetworkAddress.set_address_from_orbital_parameters(-1)
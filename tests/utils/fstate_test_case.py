@@ -0,0 +1,81 @@
+import unittest
+from collections.abc import Mapping
+
+import numpy as np
+
+from leopath.network_state.routing_algorithms.shortest_path_link_state_routing.forwarding_state import (
+    NO_ROUTE,
+)
+
+FSTATE_DTYPE = np.dtype(
+    [
+        ("src", np.int32),
+        ("dst", np.int32),
+        ("hop", np.int32),
+        ("my_if", np.int32),
+        ("hop_if", np.int32),
+    ]
+)
+
+
+def fstate_to_structured(fstate):
+    """Forwarding state as a structured array with one (src, dst, hop, my_if, hop_if) row per
+    entry, sorted by (src, dst)."""
+    return np.array([(*key, *entry) for key, entry in sorted(fstate.items())], dtype=FSTATE_DTYPE)
+
+
+def _entry_tuple(row):
+    return (int(row["hop"]), int(row["my_if"]), int(row["hop_if"]))
+
+
+class FstateTestCase(unittest.TestCase):
+    """TestCase with forwarding state assertions shared by the fstate tests."""
+
+    # Full diffs when assertFstateEqual falls back to assertDictEqual
+    maxDiff = None
+
+    def assertFstateHop(self, fstate, src, dst, expected_hop, msg=None):
+        """
+        Asserts the (src, dst) entry of a forwarding state.
+
+        fstate may be a ForwardingState or a plain {(src, dst): hop} mapping, or a NumPy view
+        indexed by node position: (N, N) next-hop IDs or the (N, N, 3) table. An int
+        expected_hop only checks the next-hop ID (-1 for no route); a tuple checks the whole
+        (next_hop_id, my_if, next_hop_if) entry. Missing entries read as NO_ROUTE.
+        """
+        check_entry = isinstance(expected_hop, tuple)
+        if isinstance(fstate, np.ndarray):
+            cell = fstate[src, dst]
+            if check_entry:
+                actual = tuple(np.atleast_1d(cell).tolist())
+            else:
+                actual = int(cell if cell.ndim == 0 else cell[0])
+        elif isinstance(fstate, Mapping):
+            entry = fstate.get((src, dst), NO_ROUTE)
+            actual = tuple(entry) if check_entry else entry[0]
+        else:
+            self.fail(f"Unsupported fstate type {type(fstate)}")
+        self.assertEqual(actual, expected_hop, msg or f"fstate[({src}, {dst})]")
+
+    def assertFstateEqual(self, fstate, expected_fstate, msg=None):
+        """
+        Asserts a whole forwarding state against an expected {(src, dst): entry} mapping.
+
+        expected_fstate may be any read-only mapping (e.g. a module-level MappingProxyType).
+        Both sides are compared as key-sorted structured arrays; on a mismatch the differing
+        rows are reported, or assertDictEqual's diff when the key sets differ.
+        """
+        actual = fstate_to_structured(fstate)
+        expected = fstate_to_structured(expected_fstate)
+        if np.array_equal(actual, expected):
+            return
+        if len(actual) != len(expected) or not np.array_equal(
+            actual[["src", "dst"]], expected[["src", "dst"]]
+        ):
+            self.assertDictEqual(dict(fstate), dict(expected_fstate), msg)
+        mismatches = np.flatnonzero(actual != expected)
+        lines = [
+            f"  {(int(a['src']), int(a['dst']))}: {_entry_tuple(a)} != {_entry_tuple(e)}"
+            for a, e in zip(actual[mismatches], expected[mismatches])
+        ]
+        self.fail(msg or f"{len(mismatches)} fstate entries differ:\n" + "\n".join(lines))
@@ -0,0 +1,58 @@
+from collections.abc import Sequence
+from typing import Optional
+
+import numpy as np
+
+from leopath.topology.ground_station import GroundStation
+
+
+class GroundStationArray(Sequence):
+    def __init__(
+        self,
+        ids,
+        latitudes_degrees,
+        longitudes_degrees,
+        elevations_m,
+        xyz,
+        names: Optional[list[str]] = None,
+    ):
+        """
+        Many test ground stations as a structure of arrays. A GroundStation object is only
+        built the first time its index is accessed, and then reused.
+        :param ids: Ground station IDs, shape (N,)
+        :param latitudes_degrees: Latitudes in degrees, shape (N,)
+        :param longitudes_degrees: Longitudes in degrees, shape (N,)
+        :param elevations_m: Elevations in meters, shape (N,)
+        :param xyz: Cartesian coordinates in meters, shape (N, 3)
+        :param names: Optional names; defaults to "GS<id>"
+        """
+        self.ids = np.asarray(ids, dtype=np.int32)
+        num_ground_stations = len(self.ids)
+        self.latitudes_degrees = np.asarray(latitudes_degrees, dtype=float)
+        self.longitudes_degrees = np.asarray(longitudes_degrees, dtype=float)
+        self.elevations_m = np.asarray(elevations_m, dtype=float)
+        self.xyz = np.asarray(xyz, dtype=float).reshape(num_ground_stations, 3)
+        self.names = names if names is not None else [f"GS{gid}" for gid in self.ids.tolist()]
+        self._ground_stations: list[Optional[GroundStation]] = [None] * num_ground_stations
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        ground_station = self._ground_stations[idx]
+        if ground_station is None:
+            x, y, z = self.xyz[idx].tolist()
+            ground_station = GroundStation(
+                int(self.ids[idx]),
+                self.names[idx],
+                str(float(self.latitudes_degrees[idx])),
+                str(float(self.longitudes_degrees[idx])),
+                float(self.elevations_m[idx]),
+                x,
+                y,
+                z,
+            )
+            self._ground_stations[idx] = ground_station
+        return ground_station
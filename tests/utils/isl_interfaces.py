@@ -0,0 +1,17 @@
+from leopath.network_state.utils.graph import isl_interface_indices
+from leopath.topology.topology import LEOTopology
+
+
+def assign_isl_interfaces(topology: LEOTopology, isl_pairs: list[tuple[int, int]]) -> None:
+    """
+    Sets the ISL interface mapping of a test topology and the ISL count of each of its
+    satellites for all ISL pairs at once, as _compute_isls assigns them.
+    :param topology: Topology whose sat_neighbor_to_if and satellites' number_isls are set
+    :param isl_pairs: (sat_id_a, sat_id_b) per ISL, in interface assignment order
+    """
+    if_a, if_b, num_isls_per_sat_map = isl_interface_indices(isl_pairs)
+    sat_neighbor_to_if = dict(zip(isl_pairs, if_a.tolist()))
+    sat_neighbor_to_if.update(zip(((b_id, a_id) for a_id, b_id in isl_pairs), if_b.tolist()))
+    topology.sat_neighbor_to_if = sat_neighbor_to_if
+    for sat in topology.get_satellites():
+        sat.number_isls = num_isls_per_sat_map.get(sat.id, 0)